@@ -0,0 +1,150 @@
+"""
+Compare contact write paths: SELECT + mutate + commit + refresh against the
+single ``UPDATE/DELETE ... RETURNING`` statements used by ContactRepository.
+
+Usage::
+
+    python -m benchmarks.bench_contact_writes --iterations 500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import count_statements, create_database, print_table, summarize
+from src.database.models import Contact, User
+from src.database.seed import seed_database
+from src.repository.contacts import ContactRepository
+from src.schemas import ContactUpdate
+
+
+class LegacyContactWrites:
+    """
+    The write paths as they were implemented before the RETURNING rewrite.
+    """
+
+    def __init__(self, session):
+        self.db = session
+
+    async def _get(self, contact_id, user):
+        query = select(Contact).where(
+            Contact.id == contact_id, Contact.user_id == user.id
+        )
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def update_contact(self, contact_id, body, user):
+        contact = await self._get(contact_id, user)
+        if contact:
+            for field, value in body.model_dump(exclude_unset=True).items():
+                setattr(contact, field, value)
+            self.db.add(contact)
+            await self.db.commit()
+            await self.db.refresh(contact)
+        return contact
+
+    async def update_phone(self, contact_id, phone, user):
+        contact = await self._get(contact_id, user)
+        if contact:
+            contact.phone = phone
+            self.db.add(contact)
+            await self.db.commit()
+            await self.db.refresh(contact)
+        return contact
+
+    async def remove_contact(self, contact_id, user):
+        contact = await self._get(contact_id, user)
+        if contact:
+            await self.db.delete(contact)
+            await self.db.commit()
+        return contact
+
+
+async def seed(engine, session_maker, contacts: int) -> User:
+    await seed_database(engine, 1, contacts, prefix="bench")
+    async with session_maker() as session:
+        return await session.scalar(select(User).filter_by(username="bench0"))
+
+
+async def run_case(engine, session_maker, name, writer_cls, operation, ids):
+    samples = []
+    with count_statements(engine) as statements:
+        for contact_id in ids:
+            async with session_maker() as session:
+                writer = writer_cls(session)
+                started = time.perf_counter()
+                await operation(writer, contact_id)
+                samples.append(time.perf_counter() - started)
+    return {
+        "case": name,
+        "statements_per_op": len(statements) / len(ids),
+        **summarize(samples),
+    }
+
+
+async def bench_writes(url: str, iterations: int) -> list[dict]:
+    engine, session_maker = await create_database(url)
+    # The legacy paths ran with the default expire_on_commit=True.
+    legacy_maker = async_sessionmaker(autoflush=False, bind=engine)
+    user = await seed(engine, session_maker, iterations * 2)
+    body = ContactUpdate(
+        first_name="Updated",
+        last_name="Contact",
+        email="updated@example.com",
+        phone="+380000000000",
+        birthday=date(1991, 2, 3),
+        additional_info="benchmark",
+    )
+
+    cases = [
+        ("update_contact", lambda w, i: w.update_contact(i, body, user)),
+        ("update_phone", lambda w, i: w.update_phone(i, "+380111111111", user)),
+        ("remove_contact", lambda w, i: w.remove_contact(i, user)),
+    ]
+    results = []
+    for name, operation in cases:
+        legacy_ids = range(1, iterations + 1)
+        current_ids = range(iterations + 1, iterations * 2 + 1)
+        results.append(
+            await run_case(
+                engine,
+                legacy_maker,
+                f"{name} (select+commit+refresh)",
+                LegacyContactWrites,
+                operation,
+                legacy_ids,
+            )
+        )
+        results.append(
+            await run_case(
+                engine,
+                session_maker,
+                f"{name} (returning)",
+                ContactRepository,
+                operation,
+                current_ids,
+            )
+        )
+
+    await engine.dispose()
+    return results
+
+
+async def main(url: str | None, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = url or f"sqlite+aiosqlite:///{directory}/writes.db"
+        results = await bench_writes(url, iterations)
+    print_table(f"Contact writes, {iterations} operations per case", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", help="Scratch database (default: temp SQLite)")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.db_url, args.iterations))
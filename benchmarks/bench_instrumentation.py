@@ -0,0 +1,126 @@
+"""
+Measure the overhead of the Prometheus instrumentation: the request middleware,
+the cursor-execute hooks and the repository query labels.
+
+Usage::
+
+    python -m benchmarks.bench_instrumentation --iterations 2000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.bench_contact_writes import seed
+from benchmarks.common import create_database, print_table, summarize
+from src.database.instrumentation import instrument_engine, label_queries
+from src.repository.contacts import ContactRepository
+from src.services.metrics import PrometheusMiddleware
+
+
+class PlainRepository:
+    async def get(self):
+        return None
+
+
+@label_queries
+class LabelledRepository:
+    async def get(self):
+        return None
+
+
+async def time_calls(name: str, call, iterations: int) -> dict:
+    for _ in range(max(iterations // 10, 1)):
+        await call()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return {"case": name, **summarize(samples)}
+
+
+def create_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def bench_requests(iterations: int) -> list[dict]:
+    results = []
+    for instrumented in (False, True):
+        transport = httpx.ASGITransport(app=create_app(instrumented))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            results.append(
+                await time_calls(
+                    f"request ({'middleware' if instrumented else 'plain'})",
+                    lambda: client.get("/items/1"),
+                    iterations,
+                )
+            )
+    return results
+
+
+async def bench_queries(url: str, iterations: int) -> list[dict]:
+    engine, session_maker = await create_database(url)
+    user = await seed(engine, session_maker, 10)
+    await engine.dispose()
+
+    results = []
+    for instrumented in (False, True):
+        engine = create_async_engine(url)
+        if instrumented:
+            instrument_engine(engine)
+        session_maker = async_sessionmaker(
+            autoflush=False, expire_on_commit=False, bind=engine
+        )
+        async with session_maker() as session:
+            repository = ContactRepository(session)
+            results.append(
+                await time_calls(
+                    f"get_contact_by_id ({'hooks' if instrumented else 'plain'})",
+                    lambda: repository.get_contact_by_id(1, user),
+                    iterations,
+                )
+            )
+        await engine.dispose()
+    return results
+
+
+async def bench_labels(iterations: int) -> list[dict]:
+    return [
+        await time_calls("method call (plain)", PlainRepository().get, iterations),
+        await time_calls(
+            "method call (labelled)", LabelledRepository().get, iterations
+        ),
+    ]
+
+
+async def main(url: str | None, iterations: int) -> None:
+    results = await bench_requests(iterations)
+    with tempfile.TemporaryDirectory() as directory:
+        url = url or f"sqlite+aiosqlite:///{directory}/metrics.db"
+        results += await bench_queries(url, iterations)
+    results += await bench_labels(iterations)
+    print_table(f"Instrumentation overhead, {iterations} calls per case", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", help="Scratch database (default: temp SQLite)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.db_url, args.iterations))
@@ -0,0 +1,103 @@
+"""
+Compare the regular and the fast JSON response paths of ``GET /api/contacts/``.
+
+The regular path loads Contact objects, validates them into the response model
+and encodes them with ``jsonable_encoder`` and ``json.dumps``; the fast path
+(``CONTACT_FAST_JSON``) loads plain rows and validates and encodes them once
+with a precompiled TypeAdapter. Requests go through the application in process,
+so the CPU time per page includes routing, the queries and the middleware.
+
+Usage::
+
+    python -m benchmarks.bench_json --iterations 500 --limits 20,100,1000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks.common import create_database, print_table, summarize
+from main import app
+from src.conf.config import settings
+from src.database.db import get_read_db
+from src.database.models import User
+from src.database.seed import seed_database
+from src.services.auth import get_current_user
+
+
+async def time_requests(client: httpx.AsyncClient, params: dict, iterations: int):
+    for _ in range(max(iterations // 10, 1)):
+        response = await client.get("/api/contacts/", params=params)
+        response.raise_for_status()
+    wall, cpu = [], []
+    for _ in range(iterations):
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        response = await client.get("/api/contacts/", params=params)
+        cpu.append(time.process_time() - cpu_started)
+        wall.append(time.perf_counter() - wall_started)
+    return len(response.content), summarize(wall), sum(cpu) / iterations
+
+
+async def bench_paths(url: str, iterations: int, limits: list[int]) -> list[dict]:
+    engine, session_maker = await create_database(url)
+    await seed_database(engine, 1, max(limits))
+    async with session_maker() as session:
+        user = await session.scalar(select(User).filter_by(username="user0"))
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for limit in limits:
+            cpu_by_path = {}
+            for fast_json in (False, True):
+                settings.CONTACT_FAST_JSON = fast_json
+                size, wall, cpu = await time_requests(
+                    client, {"limit": limit}, iterations
+                )
+                cpu_by_path[fast_json] = cpu
+                results.append(
+                    {
+                        "case": f"limit={limit} {'fast' if fast_json else 'regular'}",
+                        "bytes": size,
+                        "cpu_ms": cpu * 1000,
+                        "cpu_saved_ms": (cpu_by_path[False] - cpu) * 1000,
+                        **wall,
+                    }
+                )
+    await engine.dispose()
+    return results
+
+
+async def main(url: str | None, iterations: int, limits: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = url or f"sqlite+aiosqlite:///{directory}/json.db"
+        results = await bench_paths(url, iterations, limits)
+    print_table(f"GET /api/contacts/, {iterations} requests per case", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", help="Scratch database (default: temp SQLite)")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--limits", default="20,100,1000", help="Comma-separated")
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.db_url,
+            args.iterations,
+            [int(limit) for limit in args.limits.split(",")],
+        )
+    )
@@ -0,0 +1,404 @@
+"""
+Load-test the HTTP API: boot ``main:app`` with uvicorn against a seeded scratch
+database and drive a mix of requests from concurrent clients.
+
+Reports requests per second and p50/p95/p99 latency per endpoint, writes them
+to JSON and, given a baseline, fails when throughput drops or latency grows by
+more than the tolerance. Latency under concurrent writes is noisy, SQLite's in
+particular; record baselines with ``--runs 3`` or more, which reports the median
+of each value, on the machine that checks against them.
+
+Usage::
+
+    python -m benchmarks.bench_load --duration 30 --clients 20
+    python -m benchmarks.bench_load --baseline benchmarks/baselines/load_sqlite.json
+    python -m benchmarks.bench_load --runs 3 \
+        --write-baseline benchmarks/baselines/load_sqlite.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import create_database, print_table, summarize
+from src.database.seed import FIRST_NAMES, seed_database
+from src.services.auth import Hash
+
+PASSWORD = "load-test-password"
+ROOT = Path(__file__).resolve().parent.parent
+MIN_SAMPLES = 50
+
+# (endpoint, weight): a read-heavy mix of a contacts client.
+MIX = [
+    ("GET /api/contacts/", 35),
+    ("GET /api/contacts/?first_name=", 20),
+    ("GET /api/contacts/birthdays", 15),
+    ("GET /api/contacts/{id}", 10),
+    ("POST /api/contacts/", 8),
+    ("PATCH /api/contacts/{id}/phone", 8),
+    ("POST /api/auth/login", 4),
+]
+
+
+async def seed(url: str, users: int, contacts_per_user: int, seed: int) -> None:
+    engine, _ = await create_database(url)
+    hashed_password = Hash().get_password_hash(PASSWORD)
+    await seed_database(
+        engine,
+        users,
+        contacts_per_user,
+        seed=seed,
+        hashed_password=hashed_password,
+        prefix="load",
+    )
+    await engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(url: str, workers: int) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "DB_URL": url,
+        "RATE_LIMIT_ENABLED": "false",
+        "STORAGE_BACKEND": "local",
+        "STORAGE_LOCAL_DIR": tempfile.mkdtemp(prefix="bench-media-"),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(200):
+            if process.poll() is not None:
+                raise RuntimeError("The server exited during startup")
+            try:
+                await client.get("/api/healthchecker")
+                return process, base_url
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("The server did not start")
+
+
+class VirtualUser:
+    """
+    A client logged in as one seeded user, sending requests from ``MIX``.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, username: str, rng: random.Random):
+        self.client = client
+        self.username = username
+        self.rng = rng
+        self.contact_ids: list[int] = []
+        self.headers: dict = {}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/auth/login",
+            data={"username": self.username, "password": PASSWORD},
+        )
+        if response.status_code == 200:
+            token = response.json()["access_token"]
+            self.headers = {"Authorization": f"Bearer {token}"}
+        return response
+
+    async def request(self, endpoint: str) -> httpx.Response:
+        contact_id = self.rng.choice(self.contact_ids)
+        if endpoint == "GET /api/contacts/":
+            return await self.client.get(
+                "/api/contacts/",
+                params={"limit": 50, "skip": self.rng.randrange(0, 200)},
+                headers=self.headers,
+            )
+        if endpoint == "GET /api/contacts/?first_name=":
+            return await self.client.get(
+                "/api/contacts/",
+                params={"first_name": self.rng.choice(FIRST_NAMES), "limit": 20},
+                headers=self.headers,
+            )
+        if endpoint == "GET /api/contacts/birthdays":
+            return await self.client.get(
+                "/api/contacts/birthdays", params={"days": 30}, headers=self.headers
+            )
+        if endpoint == "GET /api/contacts/{id}":
+            return await self.client.get(
+                f"/api/contacts/{contact_id}", headers=self.headers
+            )
+        if endpoint == "POST /api/contacts/":
+            n = self.rng.randrange(10**9)
+            return await self.client.post(
+                "/api/contacts/",
+                json={
+                    "first_name": f"New{n}",
+                    "last_name": "Contact",
+                    "email": f"new{n}@example.com",
+                    "phone": f"+1{n:09d}",
+                    "birthday": "1990-05-17",
+                    "additional_info": "load test",
+                },
+                headers=self.headers,
+            )
+        if endpoint == "PATCH /api/contacts/{id}/phone":
+            return await self.client.patch(
+                f"/api/contacts/{contact_id}/phone",
+                json={"phone": f"+2{self.rng.randrange(10**9):09d}"},
+                headers=self.headers,
+            )
+        if endpoint == "POST /api/auth/login":
+            return await self.login()
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def prepare_user(user: VirtualUser) -> None:
+    await user.login()
+    response = await user.client.get(
+        "/api/contacts/", params={"limit": 1000}, headers=user.headers
+    )
+    response.raise_for_status()
+    user.contact_ids = [contact["id"] for contact in response.json()]
+
+
+async def run_user(
+    user: VirtualUser, deadline: float, samples: dict, errors: dict
+) -> None:
+    endpoints, weights = zip(*MIX)
+    while time.perf_counter() < deadline:
+        endpoint = user.rng.choices(endpoints, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await user.request(endpoint)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        samples[endpoint].append(time.perf_counter() - started)
+        if failed:
+            errors[endpoint] += 1
+
+
+async def drive(
+    base_url: str, clients: int, users: int, duration: float, seed_value: int
+) -> dict:
+    samples = {endpoint: [] for endpoint, _ in MIX}
+    errors = {endpoint: 0 for endpoint, _ in MIX}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        virtual_users = [
+            VirtualUser(client, f"load{i % users}", random.Random(seed_value + i))
+            for i in range(clients)
+        ]
+        # Log in before the clock starts, so the bcrypt burst is not measured.
+        await asyncio.gather(*(prepare_user(user) for user in virtual_users))
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(run_user(user, deadline, samples, errors) for user in virtual_users)
+        )
+        elapsed = time.perf_counter() - started
+
+    endpoints = {
+        endpoint: {
+            "rps": len(samples[endpoint]) / elapsed,
+            "errors": errors[endpoint],
+            **summarize(samples[endpoint]),
+        }
+        for endpoint, _ in MIX
+        if samples[endpoint]
+    }
+    total = sum(len(s) for s in samples.values())
+    return {
+        "total": {
+            "rps": total / elapsed,
+            "requests": total,
+            "errors": sum(errors.values()),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float, metric: str = "p95_ms"
+) -> list[str]:
+    """
+    Compare results with a baseline.
+
+    Endpoints with fewer than ``MIN_SAMPLES`` requests in the baseline are too
+    noisy to compare and only need to be present.
+
+    Args:
+        results: The results of this run.
+        baseline: The results of a baseline run.
+        tolerance: Allowed relative drop in throughput and growth in latency.
+        metric: The latency column compared per endpoint.
+
+    Returns:
+        list[str]: One message per regression.
+    """
+    regressions = []
+    expected_rps = baseline["total"]["rps"] * (1 - tolerance)
+    if results["total"]["rps"] < expected_rps:
+        regressions.append(
+            f"total: {results['total']['rps']:.1f} rps, "
+            f"baseline {baseline['total']['rps']:.1f} rps"
+        )
+    if results["total"]["errors"] > baseline["total"]["errors"]:
+        regressions.append(
+            f"total: {results['total']['errors']} errors, "
+            f"baseline {baseline['total']['errors']}"
+        )
+    for endpoint, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: no requests")
+            continue
+        if base["count"] < MIN_SAMPLES:
+            continue
+        if current[metric] > base[metric] * (1 + tolerance):
+            regressions.append(
+                f"{endpoint}: {metric} {current[metric]:.1f}, "
+                f"baseline {base[metric]:.1f}"
+            )
+    return regressions
+
+
+def median_results(runs: list[dict]) -> dict:
+    """
+    Combine runs into one result holding the median of every value.
+
+    Endpoints missing from some runs are combined from the runs that have them.
+    """
+    if len(runs) == 1:
+        return runs[0]
+
+    def median(values: list[dict]) -> dict:
+        return {key: statistics.median(v[key] for v in values) for key in values[0]}
+
+    endpoints = {}
+    for endpoint, _ in MIX:
+        values = [
+            run["endpoints"][endpoint] for run in runs if endpoint in run["endpoints"]
+        ]
+        if values:
+            endpoints[endpoint] = median(values)
+    return {"total": median([run["total"] for run in runs]), "endpoints": endpoints}
+
+
+async def run_once(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.db_url or f"sqlite+aiosqlite:///{directory}/load.db"
+        await seed(url, args.users, args.contacts, args.seed)
+        process, base_url = await start_server(url, args.workers)
+        try:
+            return await drive(
+                base_url, args.clients, args.users, args.duration, args.seed
+            )
+        finally:
+            process.terminate()
+            process.wait()
+
+
+async def main(args) -> int:
+    runs = []
+    for run in range(args.runs):
+        runs.append(await run_once(args))
+        if args.runs > 1:
+            print(
+                f"run {run + 1}/{args.runs}: {runs[-1]['total']['rps']:.1f} requests/s"
+            )
+    results = median_results(runs)
+
+    results["config"] = {
+        "database": (args.db_url or "sqlite+aiosqlite").split(":", 1)[0],
+        "runs": args.runs,
+        "workers": args.workers,
+        "clients": args.clients,
+        "users": args.users,
+        "contacts_per_user": args.contacts,
+        "duration": args.duration,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    rows = [
+        {"endpoint": endpoint, **values}
+        for endpoint, values in results["endpoints"].items()
+    ]
+    print_table(f"{results['total']['rps']:.1f} requests/s in total", rows)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    if args.write_baseline:
+        Path(args.write_baseline).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nBaseline written to {args.write_baseline}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance, args.latency_metric)
+        if regressions:
+            print(f"\nRegressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=20, help="Seconds")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--contacts", type=int, default=500, help="Per user")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--runs", type=int, default=1, help="Report the median of this many runs"
+    )
+    parser.add_argument("--db-url", help="Scratch database (default: temp SQLite)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Fail on regressions against this JSON")
+    parser.add_argument("--write-baseline", help="Store the results as a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed relative regression against the baseline",
+    )
+    parser.add_argument(
+        "--latency-metric",
+        default="p95_ms",
+        choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms"],
+        help="Latency compared per endpoint",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
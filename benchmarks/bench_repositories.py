@@ -0,0 +1,274 @@
+"""
+Time every ContactRepository and UserRepository method on synthetic datasets of
+growing size, to show how each query scales.
+
+Contacts are spread over ``size / --contacts-per-user`` users; the queries run as
+one user in the middle of the table, so per-user indexes matter and full scans
+show up as latency growing with the dataset.
+
+Usage::
+
+    python -m benchmarks.bench_repositories --sizes 10000,100000 --iterations 200
+    python -m benchmarks.bench_repositories --sizes 10000,100000,1000000 --output r.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import select
+
+from benchmarks.common import create_database, print_table, summarize
+from src.database.models import Contact, User, UserRole
+from src.database.seed import seed_database
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.schemas import ContactBase, ContactUpdate, UserCreate
+
+
+async def consume(rows) -> int:
+    return len([row async for row in rows])
+
+
+class Context:
+    """
+    The user the queries run as and deterministic arguments for them.
+    """
+
+    def __init__(self, user: User, contact_ids: list[int], users: int, seed: int):
+        self.user = user
+        self.contact_ids = contact_ids
+        self.users = users
+        self.rng = random.Random(seed)
+        self.counter = itertools.count()
+        # Deleting cases take IDs from the end, reading cases from the start.
+        self.deletable = contact_ids[len(contact_ids) // 2 :]
+        self.readable = contact_ids[: len(contact_ids) // 2]
+
+    def contact_id(self) -> int:
+        return self.rng.choice(self.readable)
+
+    def username(self) -> str:
+        return f"user{self.rng.randrange(self.users)}"
+
+    def new_contact(self) -> ContactBase:
+        n = next(self.counter)
+        return ContactBase(
+            first_name="Bench",
+            last_name=f"Contact{n}",
+            email=f"bench{n}@example.com",
+            phone=f"+1{n:09d}",
+            birthday=date(1990, 1 + n % 12, 1 + n % 28),
+            additional_info="",
+        )
+
+
+def contact_cases(ctx: Context) -> list[tuple[str, callable]]:
+    user = ctx.user
+    middle = ctx.readable[len(ctx.readable) // 2]
+    no_filters = {"first_name": None, "last_name": None, "email": None}
+    update = ContactUpdate(
+        first_name="Updated",
+        last_name="Contact",
+        email="updated@example.com",
+        phone="+380000000000",
+        birthday=date(1991, 2, 3),
+        additional_info="benchmark",
+    )
+    return [
+        ("get_contacts(first page)", lambda r: r.get_contacts(0, 50, no_filters, user)),
+        (
+            "get_contacts(offset=500)",
+            lambda r: r.get_contacts(500, 50, no_filters, user),
+        ),
+        (
+            "get_contacts(after_id)",
+            lambda r: r.get_contacts(0, 50, no_filters, user, after_id=middle),
+        ),
+        (
+            "get_contacts(first_name)",
+            lambda r: r.get_contacts(
+                0,
+                50,
+                {**no_filters, "first_name": ctx.rng.choice(["Ol", "Iv", "Ta"])},
+                user,
+            ),
+        ),
+        ("search_contacts", lambda r: r.search_contacts("shev", user, 20)),
+        (
+            "search_contacts(email)",
+            lambda r: r.search_contacts("olena.boyko", user, 20),
+        ),
+        ("stream_contacts", lambda r: consume(r.stream_contacts(user, 500))),
+        ("get_contact_by_id", lambda r: r.get_contact_by_id(ctx.contact_id(), user)),
+        ("get_contacts_version", lambda r: r.get_contacts_version(user)),
+        ("get_upcoming_birthdays", lambda r: r.get_upcoming_birthdays(user, 7)),
+        ("create_contact", lambda r: r.create_contact(ctx.new_contact(), user)),
+        (
+            "bulk_create_contacts(100)",
+            lambda r: r.bulk_create_contacts(
+                [ctx.new_contact().model_dump() for _ in range(100)], user
+            ),
+        ),
+        (
+            "update_contact",
+            lambda r: r.update_contact(ctx.contact_id(), update, user),
+        ),
+        (
+            "update_phone",
+            lambda r: r.update_phone(ctx.contact_id(), "+380111111111", user),
+        ),
+        (
+            "update_email",
+            lambda r: r.update_email(ctx.contact_id(), "new@example.com", user),
+        ),
+        (
+            "bulk_update_contacts(ids)",
+            lambda r: r.bulk_update_contacts(
+                user,
+                {"additional_info": "bulk"},
+                100,
+                ids=[ctx.contact_id() for _ in range(20)],
+            ),
+        ),
+        (
+            "bulk_update_contacts(filter)",
+            lambda r: r.bulk_update_contacts(
+                user, {"additional_info": "bulk"}, 100, filters={"first_name": "Taras"}
+            ),
+        ),
+        (
+            "remove_contact",
+            lambda r: r.remove_contact(ctx.deletable.pop(), user),
+        ),
+        (
+            "bulk_delete_contacts(ids)",
+            lambda r: r.bulk_delete_contacts(
+                user, 100, ids=[ctx.deletable.pop() for _ in range(5)]
+            ),
+        ),
+    ]
+
+
+def user_cases(ctx: Context) -> list[tuple[str, callable]]:
+    def new_user() -> UserCreate:
+        n = next(ctx.counter)
+        return UserCreate(
+            username=f"bench{n}",
+            email=f"bench{n}@example.org",
+            password="x",
+            role=UserRole.USER,
+        )
+
+    return [
+        ("get_user_by_id", lambda r: r.get_user_by_id(ctx.rng.randrange(1, ctx.users))),
+        ("get_user_by_username", lambda r: r.get_user_by_username(ctx.username())),
+        (
+            "get_user_by_email",
+            lambda r: r.get_user_by_email(f"{ctx.username().upper()}@example.com"),
+        ),
+        ("create_user", lambda r: r.create_user(new_user())),
+        (
+            "confirmed_email",
+            lambda r: r.confirmed_email(f"{ctx.username()}@example.com"),
+        ),
+        (
+            "update_avatar_url",
+            lambda r: r.update_avatar_url(ctx.user.id, "https://example.com/a.png"),
+        ),
+        (
+            "update_password",
+            lambda r: r.update_password(f"{ctx.username()}@example.com", "y"),
+        ),
+    ]
+
+
+async def time_case(session_maker, repository_cls, operation, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        async with session_maker() as session:
+            repository = repository_cls(session)
+            started = time.perf_counter()
+            await operation(repository)
+            samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def bench_size(
+    url: str, size: int, contacts_per_user: int, iterations: int, seed: int
+) -> dict:
+    users = max(size // contacts_per_user, 1)
+    engine, session_maker = await create_database(url)
+    started = time.perf_counter()
+    await seed_database(engine, users, size // users, seed=seed)
+    print(
+        f"seeded {size} contacts for {users} users in {time.perf_counter() - started:.1f}s"
+    )
+
+    async with session_maker() as session:
+        user = await session.scalar(
+            select(User).filter_by(username=f"user{users // 2}")
+        )
+        contact_ids = list(
+            await session.scalars(
+                select(Contact.id).filter_by(user_id=user.id).order_by(Contact.id)
+            )
+        )
+    ctx = Context(user, contact_ids, users, seed)
+
+    results = {}
+    for repository_cls, cases in (
+        (ContactRepository, contact_cases(ctx)),
+        (UserRepository, user_cases(ctx)),
+    ):
+        for name, operation in cases:
+            case = f"{repository_cls.__name__}.{name}"
+            results[case] = await time_case(
+                session_maker, repository_cls, operation, iterations
+            )
+    await engine.dispose()
+    return results
+
+
+async def main(args) -> None:
+    sizes = [int(size) for size in args.sizes.split(",")]
+    by_size = {}
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.db_url or f"sqlite+aiosqlite:///{directory}/repositories.db"
+        for size in sizes:
+            by_size[size] = await bench_size(
+                url, size, args.contacts_per_user, args.iterations, args.seed
+            )
+
+    cases = list(by_size[sizes[0]])
+    for metric in ("p50_ms", "p95_ms"):
+        rows = [
+            {
+                "case": case,
+                **{f"{size:,}": by_size[size][case][metric] for size in sizes},
+                "growth": by_size[sizes[-1]][case][metric]
+                / by_size[sizes[0]][case][metric],
+            }
+            for case in cases
+        ]
+        print_table(f"{metric} by number of contacts", rows)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(by_size, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated")
+    parser.add_argument("--contacts-per-user", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db-url", help="Scratch database (default: temp SQLite)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Compare email throughput of ``FastMail``, which opens an SMTP connection per
+email, with ``PooledFastMail``, against a local aiosmtpd server.
+
+Usage::
+
+    python -m benchmarks.bench_smtp --emails 500 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+
+from benchmarks.common import print_table, summarize
+from src.services.email import conf
+from src.services.smtp_pool import PooledFastMail
+
+
+class DiscardHandler:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def mail_config(port: int) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="bench@example.com",
+        MAIL_PASSWORD="secret",
+        MAIL_FROM="bench@example.com",
+        MAIL_PORT=port,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False,
+        TEMPLATE_FOLDER=conf.TEMPLATE_FOLDER,
+    )
+
+
+async def send_all(mailer: FastMail, emails: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def send(i: int) -> None:
+        async with semaphore:
+            message = MessageSchema(
+                subject="Confirm your email",
+                recipients=[f"user{i}@example.com"],
+                template_body={"host": "http://bench/", "username": "u", "token": "t"},
+                subtype=MessageType.html,
+            )
+            started = time.perf_counter()
+            await mailer.send_message(message, template_name="verify_email.html")
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(emails)))
+    elapsed = time.perf_counter() - started
+    return {"emails_per_s": emails / elapsed, **summarize(samples)}
+
+
+async def main(emails: int, concurrency: int, pool_size: int) -> None:
+    port = free_port()
+    controller = Controller(DiscardHandler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        config = mail_config(port)
+        rows = [
+            {
+                "mailer": "FastMail",
+                **await send_all(FastMail(config), emails, concurrency),
+            }
+        ]
+        pooled = PooledFastMail(config, size=pool_size)
+        rows.append(
+            {
+                "mailer": f"PooledFastMail(size={pool_size})",
+                **await send_all(pooled, emails, concurrency),
+            }
+        )
+        await pooled.close()
+    finally:
+        controller.stop()
+    print_table(f"{emails} emails, concurrency {concurrency}", rows)
+    print(f"\npool: {pooled.pool.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.emails, args.concurrency, args.pool_size))
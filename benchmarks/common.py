@@ -0,0 +1,89 @@
+import contextlib
+import statistics
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.database.models import Base
+
+
+async def create_database(url: str) -> tuple[AsyncEngine, async_sessionmaker]:
+    """
+    Create an engine for ``url`` and recreate the schema from the models.
+
+    Args:
+        url: Database URL of a scratch database; all tables are dropped.
+
+    Returns:
+        The engine and a session maker with the application session settings.
+    """
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(
+        autoflush=False, expire_on_commit=False, bind=engine
+    )
+    return engine, session_maker
+
+
+@contextlib.contextmanager
+def count_statements(engine: AsyncEngine):
+    """
+    Count SQL statements executed on ``engine`` inside the block.
+
+    Yields:
+        list[str]: The executed statements, filled in while the block runs.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def summarize(samples: list[float]) -> dict:
+    """
+    Summarize latency samples given in seconds.
+
+    Returns:
+        dict: Count, mean and p50/p95/p99 in milliseconds.
+    """
+    ordered = sorted(samples)
+    quantiles = (
+        statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+    )
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+def print_table(title: str, rows: list[dict]) -> None:
+    """
+    Print benchmark results as an aligned text table.
+
+    Args:
+        title: Heading printed above the table.
+        rows: One dict per table row; all rows share the same keys.
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [
+        [f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns]
+        for row in rows
+    ]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print(f"\n{title}")
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
@@ -1,10 +1,26 @@
+import math
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
-from slowapi.errors import RateLimitExceeded
-from src.api import contacts, utils, auth, users, admin_panel
+from src.api import contacts, utils, auth, users, admin_panel, metrics
+from src.conf.config import settings
+from src.services.metrics import PrometheusMiddleware
+from src.services.query_budget import QueryBudgetMiddleware
+from src.services.rate_limit import RateLimitExceeded
+from src.services.storage import ImmutableStaticFiles
+from src.services.thumbnails import thumbnail_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    thumbnail_pool.shutdown()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 origins = ["*"]
 app.add_middleware(
     CORSMiddleware,
@@ -13,6 +29,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryBudgetMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
 
 
 @app.exception_handler(RateLimitExceeded)
@@ -20,6 +39,11 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={"error": "Перевищено ліміт запитів. Спробуйте пізніше."},
+        headers={
+            "Retry-After": str(math.ceil(exc.result.retry_after)),
+            "X-RateLimit-Limit": str(exc.result.limit),
+            "X-RateLimit-Remaining": "0",
+        },
     )
 
 
@@ -28,6 +52,15 @@ app.include_router(utils.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 app.include_router(admin_panel.router, prefix="/api")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+if settings.STORAGE_BACKEND == "local" and settings.STORAGE_LOCAL_URL.startswith("/"):
+    Path(settings.STORAGE_LOCAL_DIR).mkdir(parents=True, exist_ok=True)
+    app.mount(
+        settings.STORAGE_LOCAL_URL.rstrip("/"),
+        ImmutableStaticFiles(directory=settings.STORAGE_LOCAL_DIR),
+        name="media",
+    )
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,72 @@
+"""Add contact search indexes
+
+Revision ID: 5b7c1d2e9f40
+Revises: 3da2ecba51ba
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7c1d2e9f40"
+down_revision: Union[str, None] = "3da2ecba51ba"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_FIELDS = ("first_name", "last_name", "email", "phone")
+FTS_COLUMNS = ", ".join(SEARCH_FIELDS)
+FTS_NEW = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+FTS_OLD = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for field in SEARCH_FIELDS:
+            op.create_index(
+                f"ix_contacts_{field}_trgm",
+                "contacts",
+                [field],
+                postgresql_using="gin",
+                postgresql_ops={field: "gin_trgm_ops"},
+            )
+    elif dialect == "sqlite":
+        op.execute(
+            f"CREATE VIRTUAL TABLE contacts_fts USING fts5({FTS_COLUMNS}, "
+            "content='contacts', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER contacts_fts_ai AFTER INSERT ON contacts BEGIN "
+            f"INSERT INTO contacts_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER contacts_fts_ad AFTER DELETE ON contacts BEGIN "
+            f"INSERT INTO contacts_fts(contacts_fts, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, {FTS_OLD}); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER contacts_fts_au AFTER UPDATE ON contacts BEGIN "
+            f"INSERT INTO contacts_fts(contacts_fts, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, {FTS_OLD}); "
+            f"INSERT INTO contacts_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); "
+            "END"
+        )
+        op.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for field in SEARCH_FIELDS:
+            op.drop_index(f"ix_contacts_{field}_trgm", table_name="contacts")
+    elif dialect == "sqlite":
+        for trigger in ("contacts_fts_ai", "contacts_fts_ad", "contacts_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS contacts_fts")
@@ -0,0 +1,45 @@
+"""Add contacts.birthday_mmdd
+
+Revision ID: 8e2f4a6b1c93
+Revises: 5b7c1d2e9f40
+Create Date: 2026-10-18 11:03:47.915264
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2f4a6b1c93"
+down_revision: Union[str, None] = "5b7c1d2e9f40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("contacts", sa.Column("birthday_mmdd", sa.Integer(), nullable=True))
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "UPDATE contacts SET birthday_mmdd = "
+            "CAST(strftime('%m', birthday) AS INTEGER) * 100 "
+            "+ CAST(strftime('%d', birthday) AS INTEGER)"
+        )
+    else:
+        op.execute(
+            "UPDATE contacts SET birthday_mmdd = "
+            "CAST(EXTRACT(MONTH FROM birthday) AS INTEGER) * 100 "
+            "+ CAST(EXTRACT(DAY FROM birthday) AS INTEGER)"
+        )
+    op.create_index(
+        "ix_contacts_user_id_birthday_mmdd",
+        "contacts",
+        ["user_id", "birthday_mmdd"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contacts_user_id_birthday_mmdd", table_name="contacts")
+    op.drop_column("contacts", "birthday_mmdd")
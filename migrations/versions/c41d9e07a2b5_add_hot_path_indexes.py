@@ -0,0 +1,39 @@
+"""Add indexes for hot query paths
+
+Revision ID: c41d9e07a2b5
+Revises: 8e2f4a6b1c93
+Create Date: 2026-10-18 12:26:05.730418
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d9e07a2b5"
+down_revision: Union[str, None] = "8e2f4a6b1c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_contacts_user_id_id", "contacts", ["user_id", "id"])
+    op.create_index(
+        "ix_contacts_user_id_last_name_first_name",
+        "contacts",
+        ["user_id", "last_name", "first_name"],
+    )
+    op.create_index(
+        "ix_contacts_user_id_updated_at", "contacts", ["user_id", "updated_at"]
+    )
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.drop_index("ix_contacts_user_id_updated_at", table_name="contacts")
+    op.drop_index("ix_contacts_user_id_last_name_first_name", table_name="contacts")
+    op.drop_index("ix_contacts_user_id_id", table_name="contacts")
@@ -0,0 +1,70 @@
+"""Make the lower(email) index of users unique
+
+Revision ID: f3b8c6d2a417
+Revises: d7a3f5e1b820
+Create Date: 2026-10-19 09:14:52.402817
+
+"""
+
+import logging
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8c6d2a417"
+down_revision: Union[str, None] = "d7a3f5e1b820"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def resolve_case_duplicates(conn) -> None:
+    """
+    Give every user but one of each case-insensitive email a unique address.
+
+    The confirmed account, or else the oldest one, keeps the email; the others
+    become ``dup<id>+<email>`` and are logged so they can be sorted out by hand.
+    """
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, email FROM users WHERE lower(email) IN ("
+            "SELECT lower(email) FROM users GROUP BY lower(email) "
+            "HAVING count(*) > 1) "
+            "ORDER BY lower(email), confirmed DESC, id"
+        )
+    ).all()
+    for _, group in groupby(rows, key=lambda row: row.email.lower()):
+        keeper, *duplicates = group
+        for row in duplicates:
+            email = f"dup{row.id}+{row.email}"
+            conn.execute(
+                sa.text("UPDATE users SET email = :email WHERE id = :id"),
+                {"email": email, "id": row.id},
+            )
+            logger.warning(
+                "User %d shared email %s with user %d (case-insensitive); "
+                "renamed to %s",
+                row.id,
+                row.email,
+                keeper.id,
+                email,
+            )
+
+
+def upgrade() -> None:
+    resolve_case_duplicates(op.get_bind())
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_index(
+        "ix_users_email_lower", "users", [sa.text("lower(email)")], unique=True
+    )
+
+
+def downgrade() -> None:
+    # Renamed duplicate emails are not restored.
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")])
@@ -1,10 +1,29 @@
 from fastapi import APIRouter, Depends
-from src.services.auth import get_current_admin_user
+from src.services.auth import get_current_admin_user, Hash
+from src.services.cache import user_cache
+from src.database.db import sessionmanager
 from src.database.models import User
+from src.services.query_budget import query_budget
+from src.services.rate_limit import rate_limiter
+from src.services.thumbnails import thumbnail_pool
 
 router = APIRouter(prefix="/admin_panel", tags=["admin_panel"])
 
 
 @router.get("/admin")
+@query_budget(1)
 def read_admin(current_user: User = Depends(get_current_admin_user)):
     return {"message": f"Вітаємо, {current_user.username}! Це адміністративний маршрут"}
+
+
+@router.get("/stats")
+@query_budget(1)
+async def read_stats(current_user: User = Depends(get_current_admin_user)):
+    return {
+        "user_cache": user_cache.stats(),
+        "password_hashing": Hash.pool.stats(),
+        "thumbnails": thumbnail_pool.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "db_pool": sessionmanager.pool_stats.snapshot(),
+        "db_read_pools": [stats.snapshot() for stats in sessionmanager.read_pool_stats],
+    }
@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.schemas import UserCreate, Token, User, RequestEmail
 from src.services.auth import create_access_token, Hash, get_email_from_token
 from src.services.users import UserService
-from src.services.email import send_email
+from src.services.outbox import OutboxService
 from src.database.db import get_db
+from src.services.query_budget import query_budget
+from src.services.rate_limit import rate_limit
+from src.conf.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=User,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register", settings.RATE_LIMIT_REGISTER))],
+)
+@query_budget(5)
 async def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
@@ -33,21 +41,29 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail="Користувач з таким іменем вже існує",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
-    new_user = await user_service.create_user(user_data)
-    background_tasks.add_task(
-        send_email, new_user.email, new_user.username, request.base_url
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
+    # Queued first, so the email is committed in the same transaction as the user.
+    OutboxService(db).queue_verification_email(
+        user_data.email, user_data.username, request.base_url
     )
+    new_user = await user_service.create_user(user_data)
     return new_user
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(rate_limit("login", settings.RATE_LIMIT_LOGIN))],
+)
+@query_budget(1)
 async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    if not user or not await Hash().verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильний логін або пароль",
@@ -63,43 +79,55 @@ async def login_user(
 
 
 @router.get("/confirmed_email/{token}")
+@query_budget(2)
 async def confirmed_email(token: str, db: Session = Depends(get_db)):
     email = await get_email_from_token(token)
     user_service = UserService(db)
+    if await user_service.confirmed_email(email):
+        return {"message": "Електронну пошту підтверджено"}
     user = await user_service.get_user_by_email(email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Verification error"
         )
-    if user.confirmed:
-        return {"message": "Ваша електронна пошта вже підтверджена"}
-    await user_service.confirmed_email(email)
-    return {"message": "Електронну пошту підтверджено"}
+    return {"message": "Ваша електронна пошта вже підтверджена"}
 
 
-@router.post("/request_email")
+@router.post(
+    "/request_email",
+    dependencies=[
+        Depends(rate_limit("request_email", settings.RATE_LIMIT_REQUEST_EMAIL))
+    ],
+)
+@query_budget(2)
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
     user_service = UserService(db)
     user = await user_service.get_user_by_email(body.email)
 
-    if user.confirmed:
+    if user and user.confirmed:
         return {"message": "Ваша електронна пошта вже підтверджена"}
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
+        outbox_service = OutboxService(db)
+        outbox_service.queue_verification_email(
+            user.email, user.username, request.base_url
         )
+        await outbox_service.commit()
     return {"message": "Перевірте свою електронну пошту для підтвердження"}
 
 
-@router.post("/request_password_reset")
+@router.post(
+    "/request_password_reset",
+    dependencies=[
+        Depends(rate_limit("password_reset", settings.RATE_LIMIT_PASSWORD_RESET))
+    ],
+)
+@query_budget(2)
 async def request_password_reset(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
@@ -114,23 +142,22 @@ async def request_password_reset(
             status_code=status.HTTP_404_NOT_FOUND, detail="Користувач не знайдений"
         )
 
-    reset_token = await create_access_token(data={"sub": user.email})
-
-    reset_url = f"{request.base_url}auth/reset-password-confirm?token={reset_token}"
-
-    background_tasks.add_task(
-        send_email,
-        to_email=user.email,
-        subject="Запит на скидання пароля",
-        body=f"Вітаємо, {user.username}!\n\n"
-        f"Перейдіть за цим посиланням, щоб скинути пароль: {reset_url}\n\n"
-        f"Якщо ви не запитували зміну пароля, просто проігноруйте цей лист.",
+    outbox_service = OutboxService(db)
+    outbox_service.queue_password_reset_email(
+        user.email, user.username, request.base_url
     )
+    await outbox_service.commit()
 
     return {"message": "Лист для скидання пароля надіслано на вашу електронну адресу"}
 
 
-@router.post("/reset-password-confirm")
+@router.post(
+    "/reset-password-confirm",
+    dependencies=[
+        Depends(rate_limit("password_reset", settings.RATE_LIMIT_PASSWORD_RESET))
+    ],
+)
+@query_budget(1)
 async def reset_password_confirm(
     token: str,
     new_password: str,
@@ -147,15 +174,13 @@ async def reset_password_confirm(
             detail="Токен недійсний або прострочений",
         )
 
+    hashed_password = await Hash().get_password_hash_async(new_password)
     user_service = UserService(db)
-    user = await user_service.get_user_by_email(email)
+    user = await user_service.update_password(email, hashed_password)
 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Користувач не знайдений"
         )
 
-    hashed_password = Hash().get_password_hash(new_password)
-    await user_service.update_password(user.id, hashed_password)
-
     return {"message": "Пароль успішно оновлено"}
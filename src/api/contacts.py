@@ -1,56 +1,182 @@
+import csv
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query, Depends, status
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    Depends,
+    File,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
+from src.conf.config import settings
+from src.database.db import get_db, get_read_db
 from src.schemas import (
     ContactBase,
     ContactUpdate,
     ContactResponse,
     ContactPhoneUpdate,
     ContactEmailUpdate,
+    ContactImportReport,
+    ContactBulkSelection,
+    ContactBulkUpdate,
+    ContactBulkResult,
 )
 from src.services.contacts import ContactService
+from src.services.pagination import encode_cursor
+from src.services.etag import (
+    contact_etag,
+    contacts_list_etag,
+    etag_matches,
+    if_match_versions,
+)
+from src.services.contacts_io import (
+    EXPORT_MEDIA_TYPES,
+    IMPORT_FORMATS,
+    detect_import_format,
+    dump_contact_list,
+)
 from src.database.models import User
 from src.services.auth import get_current_user
+from src.services.query_budget import query_budget
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
 
 @router.get("/", response_model=List[ContactResponse])
+@query_budget(3)
 async def read_contacts(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
     first_name: Optional[str] = Query(None, description="Filter by name"),
     last_name: Optional[str] = Query(None, description="Filter by last name"),
     email: Optional[str] = Query(None, description="Filter by email"),
-    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either skip or cursor, not both",
+        )
     contact_service = ContactService(db)
+    count, last_updated_at = await contact_service.get_contacts_version(user)
+    etag = contacts_list_etag(
+        user.id, count, last_updated_at, request.query_params.multi_items()
+    )
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
     filters = {
         "first_name": first_name,
         "last_name": last_name,
         "email": email,
     }
-    contacts = await contact_service.get_contacts(
-        user=user, skip=skip, limit=limit, filters=filters
-    )
+    fast_json = settings.CONTACT_FAST_JSON
+    try:
+        contacts = await contact_service.get_contacts(
+            user=user,
+            skip=skip,
+            limit=limit,
+            filters=filters,
+            cursor=cursor,
+            as_rows=fast_json,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if contacts and len(contacts) == limit:
+        last = contacts[-1]
+        next_cursor = encode_cursor(last["id"] if fast_json else last.id)
+        next_url = request.url.remove_query_params("skip").include_query_params(
+            cursor=next_cursor
+        )
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    if fast_json:
+        # A returned Response bypasses response_model and the headers set above.
+        return Response(
+            dump_contact_list(contacts),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
     return contacts
 
 
+@router.get("/search", response_model=List[ContactResponse])
+@query_budget(2)
+async def search_contacts(
+    q: str = Query(..., min_length=1, max_length=128, description="Search string"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    contact_service = ContactService(db)
+    return await contact_service.search_contacts(q, user, limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+@query_budget(2)
+async def export_contacts(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    contact_service = ContactService(db)
+
+    async def body():
+        # The session dependency is closed before a streaming body is sent; the
+        # session checks out a new connection for the stream, released here.
+        try:
+            async for chunk in contact_service.export_contacts(
+                user, format, settings.CONTACT_EXPORT_BATCH_SIZE
+            ):
+                yield chunk
+        finally:
+            await db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'},
+    )
+
+
 @router.get("/birthdays", response_model=List[ContactResponse])
-async def get_upcoming_birthdays(db: AsyncSession = Depends(get_db)):
+@query_budget(2)
+async def get_upcoming_birthdays(
+    days: int = Query(7, ge=0, le=366, description="Window size in days"),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
     contact_service = ContactService(db)
-    contacts = await contact_service.get_upcoming_birthdays()
+    contacts = await contact_service.get_upcoming_birthdays(user, days)
     return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
+@query_budget(2)
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     contact_service = ContactService(db)
@@ -59,10 +185,17 @@ async def read_contact(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
+    etag = contact_etag(contact)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
     return contact
 
 
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(2)
 async def create_contact(
     body: ContactBase,
     db: AsyncSession = Depends(get_db),
@@ -72,55 +205,171 @@ async def create_contact(
     return await contact_service.create_contact(body, user)
 
 
-@router.put("/{contact_id}", response_model=ContactResponse)
-async def update_contact(
-    body: ContactUpdate,
-    contact_id: int,
+@router.post("/import", response_model=ContactImportReport)
+@query_budget(None, check_repeats=False)
+async def import_contacts(
+    file: UploadFile = File(),
+    format: Optional[str] = Query(
+        None, description="csv or ndjson; detected from the file when omitted"
+    ),
+    batch_size: int = Query(settings.CONTACT_IMPORT_BATCH_SIZE, ge=1, le=5000),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    fmt = format or detect_import_format(file.filename, file.content_type)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload a CSV or NDJSON file",
+        )
     contact_service = ContactService(db)
-    contact = await contact_service.update_contact(contact_id, body, user)
+    try:
+        return await contact_service.import_contacts(
+            file.file, fmt, user, batch_size, settings.CONTACT_IMPORT_MAX_ERRORS
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded",
+        )
+    except csv.Error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed CSV file"
+        )
+
+
+def check_bulk_size(selection: ContactBulkSelection) -> None:
+    if selection.ids is not None and len(selection.ids) > settings.CONTACT_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CONTACT_BULK_MAX} contacts per request",
+        )
+
+
+def bulk_result(ids: List[int], selection: ContactBulkSelection) -> ContactBulkResult:
+    # Filtered selections are capped; a full batch may leave more matches behind.
+    has_more = selection.filter is not None and len(ids) == settings.CONTACT_BULK_MAX
+    return ContactBulkResult(ids=ids, count=len(ids), has_more=has_more)
+
+
+@router.post("/bulk-delete", response_model=ContactBulkResult)
+@query_budget(2)
+async def bulk_delete_contacts(
+    body: ContactBulkSelection,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    check_bulk_size(body)
+    contact_service = ContactService(db)
+    ids = await contact_service.bulk_delete_contacts(
+        user,
+        settings.CONTACT_BULK_MAX,
+        ids=body.ids,
+        filters=body.filter.model_dump() if body.filter else None,
+    )
+    return bulk_result(ids, body)
+
+
+@router.patch("/bulk", response_model=ContactBulkResult)
+@query_budget(2)
+async def bulk_update_contacts(
+    body: ContactBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    check_bulk_size(body)
+    contact_service = ContactService(db)
+    ids = await contact_service.bulk_update_contacts(
+        user,
+        body.values.model_dump(exclude_unset=True),
+        settings.CONTACT_BULK_MAX,
+        ids=body.ids,
+        filters=body.filter.model_dump() if body.filter else None,
+    )
+    return bulk_result(ids, body)
+
+
+async def updated_contact_or_error(
+    contact_service: ContactService,
+    contact,
+    contact_id: int,
+    user: User,
+    versions,
+    response: Response,
+):
+    """
+    Return the updated contact with its new ETag, or raise 404 if the contact does
+    not exist and 412 if it exists but did not match the ``If-Match`` header.
+    """
     if contact is None:
+        if versions is not None and await contact_service.get_contact(contact_id, user):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Contact was modified",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
+    response.headers["ETag"] = contact_etag(contact)
     return contact
 
 
+@router.put("/{contact_id}", response_model=ContactResponse)
+@query_budget(3)
+async def update_contact(
+    body: ContactUpdate,
+    contact_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    contact_service = ContactService(db)
+    versions = if_match_versions(if_match, contact_id)
+    contact = await contact_service.update_contact(contact_id, body, user, versions)
+    return await updated_contact_or_error(
+        contact_service, contact, contact_id, user, versions, response
+    )
+
+
 @router.patch("/{contact_id}/phone", response_model=ContactResponse)
+@query_budget(3)
 async def patch_phone(
     contact_id: int,
     body: ContactPhoneUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     contact_service = ContactService(db)
-    contact = await contact_service.update_phone(contact_id, body.phone, user)
-    if not contact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
-        )
-    return contact
+    versions = if_match_versions(if_match, contact_id)
+    contact = await contact_service.update_phone(contact_id, body.phone, user, versions)
+    return await updated_contact_or_error(
+        contact_service, contact, contact_id, user, versions, response
+    )
 
 
 @router.patch("/{contact_id}/email", response_model=ContactResponse)
+@query_budget(3)
 async def patch_email(
     contact_id: int,
     body: ContactEmailUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     contact_service = ContactService(db)
-    contact = await contact_service.update_email(contact_id, body.email, user)
-    if not contact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
-        )
-    return contact
+    versions = if_match_versions(if_match, contact_id)
+    contact = await contact_service.update_email(contact_id, body.email, user, versions)
+    return await updated_contact_or_error(
+        contact_service, contact, contact_id, user, versions, response
+    )
 
 
 @router.delete("/{contact_id}", response_model=ContactResponse)
+@query_budget(2)
 async def remove_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
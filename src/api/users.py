@@ -1,40 +1,161 @@
-from fastapi import APIRouter, Depends, Request, UploadFile, File
+import asyncio
+import io
+import logging
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
+
+from starlette.concurrency import run_in_threadpool
 
-from src.database.db import get_db
+from src.database.db import get_session_factory
 from src.schemas import User
 from src.conf.config import settings
 from src.services.auth import get_current_user
 from src.services.users import UserService
-from src.services.upload_file import UploadFileService
+from src.services.storage import StorageBackend, get_storage, receive_upload
+from src.services.query_budget import query_budget
+from src.services.rate_limit import rate_limit
+from src.services.thumbnails import (
+    FORMATS,
+    content_digest,
+    identify_image,
+    thumbnail_key,
+    thumbnail_pool,
+)
 
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
+logger = logging.getLogger(__name__)
+
+AVATAR_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
 
 
 @router.get(
-    "/me", response_model=User, description="No more than 10 requests per minute"
+    "/me",
+    response_model=User,
+    description=f"No more than {settings.RATE_LIMIT_ME} requests",
+    dependencies=[Depends(rate_limit("me", settings.RATE_LIMIT_ME))],
 )
-@limiter.limit("10/minute")
-async def me(request: Request, user: User = Depends(get_current_user)):
+@query_budget(1)
+async def me(user: User = Depends(get_current_user)):
     return user
 
 
-@router.patch("/avatar", response_model=User)
-async def update_avatar_user(
-    file: UploadFile = File(),
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+async def store_thumbnails(storage: StorageBackend, data: bytes) -> str:
+    """
+    Render and store the thumbnails of an avatar, unless the same image has been
+    stored before.
+
+    Thumbnails are keyed by the SHA-256 of the image. The thumbnail used as the
+    avatar is written last, so finding it means the whole set is stored.
+
+    Args:
+        storage: The storage backend.
+        data: The uploaded image.
+
+    Returns:
+        str: The URL of the ``AVATAR_SIZE`` thumbnail in the first format.
+    """
+    digest = await run_in_threadpool(content_digest, data)
+    formats = settings.AVATAR_THUMBNAIL_FORMATS
+    sizes = set(settings.AVATAR_THUMBNAIL_SIZES) | {settings.AVATAR_SIZE}
+    avatar_key = thumbnail_key(digest, settings.AVATAR_SIZE, formats[0])
+    avatar_url = await storage.lookup(avatar_key)
+    if avatar_url:
+        return avatar_url
+
+    thumbnails = await thumbnail_pool.render(data, sizes, formats)
+    avatar = thumbnails.pop((settings.AVATAR_SIZE, formats[0]))
+    await asyncio.gather(
+        *(
+            storage.save(
+                io.BytesIO(content), thumbnail_key(digest, size, fmt), FORMATS[fmt][1]
+            )
+            for (size, fmt), content in thumbnails.items()
+        )
+    )
+    return await storage.save(io.BytesIO(avatar), avatar_key, FORMATS[formats[0]][1])
+
+
+async def store_avatar(
+    storage: StorageBackend,
+    upload: UploadFile,
+    user_id: int,
+    session_factory,
 ):
-    avatar_url = UploadFileService(
-        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    ).upload_file(file, user.username)
+    """
+    Store the thumbnails of an uploaded avatar and point the user at them.
+
+    Runs after the response has been sent; a failure leaves the previous avatar in
+    place.
+
+    Args:
+        storage: The storage backend.
+        upload: The uploaded image; it is closed afterwards.
+        user_id: ID of the user.
+        session_factory: Factory of database sessions.
+    """
+    try:
+        data = await upload.read()
+        avatar_url = await store_thumbnails(storage, data)
+    except Exception:
+        logger.exception("Storing the avatar of user %d failed", user_id)
+        return
+    finally:
+        await upload.close()
+
+    async with session_factory() as db:
+        await UserService(db).update_avatar_url(user_id, avatar_url)
 
-    user_service = UserService(db)
-    user = await user_service.update_avatar_url(user.email, avatar_url)
 
+@router.patch(
+    "/avatar",
+    response_model=User,
+    status_code=status.HTTP_202_ACCEPTED,
+    description=(
+        "Upload a new avatar. Thumbnails are rendered and stored after the "
+        "response is sent; files larger than "
+        f"{settings.AVATAR_MAX_BYTES} bytes are rejected with 413 and files that "
+        "are not images with 415."
+    ),
+    openapi_extra=AVATAR_UPLOAD_BODY,
+)
+@query_budget(2)
+async def update_avatar_user(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    user: User = Depends(get_current_user),
+    storage: StorageBackend = Depends(get_storage),
+    session_factory=Depends(get_session_factory),
+):
+    upload = await receive_upload(request, "file", settings.AVATAR_MAX_BYTES)
+    try:
+        await run_in_threadpool(identify_image, upload.file)
+    except ValueError:
+        await upload.close()
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="The file is not a supported image",
+        )
+    background_tasks.add_task(store_avatar, storage, upload, user.id, session_factory)
     return user
@@ -3,11 +3,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from src.database.db import get_db
+from src.services.query_budget import query_budget
 
 router = APIRouter(tags=["utils"])
 
 
 @router.get("/healthchecker")
+@query_budget(1)
 async def healthchecker(db: AsyncSession = Depends(get_db)):
     try:
         result = await db.execute(text("SELECT 1"))
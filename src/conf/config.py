@@ -1,12 +1,24 @@
+from typing import List, Literal, Optional
+
 from pydantic import ConfigDict, EmailStr
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DB_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_READ_URLS: List[str] = []
+    DB_READ_STRATEGY: Literal["round_robin", "least_connections"] = "round_robin"
+    DB_READ_YOUR_WRITES_SECONDS: float = 5
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_SECONDS: int = 3600
+    PASSWORD_HASH_WORKERS: int = 4
 
     MAIL_USERNAME: EmailStr = "example@meta.ua"
     MAIL_PASSWORD: str = "secretPassword"
@@ -18,11 +30,49 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = True
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    MAIL_POOL_SIZE: int = 4
+    MAIL_POOL_IDLE_TIMEOUT: float = 60
+    MAIL_POOL_HEALTH_CHECK_SECONDS: float = 10
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_CONCURRENCY: int = 10
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 30
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 300
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2
 
     CLD_NAME: str
     CLD_API_KEY: int = 326488457974591
     CLD_API_SECRET: str = "secret"
 
+    STORAGE_BACKEND: Literal["cloudinary", "local"] = "cloudinary"
+    STORAGE_LOCAL_DIR: str = "media"
+    STORAGE_LOCAL_URL: str = "/media/"
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_THUMBNAIL_SIZES: List[int] = [64, 128, 250]
+    AVATAR_THUMBNAIL_FORMATS: List[Literal["webp", "jpeg"]] = ["webp", "jpeg"]
+    AVATAR_SIZE: int = 250
+    THUMBNAIL_WORKERS: int = 2
+
+    CONTACT_IMPORT_BATCH_SIZE: int = 500
+    CONTACT_IMPORT_MAX_ERRORS: int = 1000
+    CONTACT_EXPORT_BATCH_SIZE: int = 1000
+    CONTACT_BULK_MAX: int = 1000
+    CONTACT_FAST_JSON: bool = False
+
+    REDIS_URL: Optional[str] = None
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN: str = "5/minute"
+    RATE_LIMIT_REGISTER: str = "5/minute"
+    RATE_LIMIT_REQUEST_EMAIL: str = "3/minute"
+    RATE_LIMIT_PASSWORD_RESET: str = "3/minute"
+    RATE_LIMIT_ME: str = "10/minute"
+    USER_CACHE_TTL: int = 300
+    USER_CACHE_MAXSIZE: int = 1024
+
+    METRICS_ENABLED: bool = True
+    QUERY_BUDGET_DEFAULT: int = 10
+    QUERY_REPEAT_THRESHOLD: int = 5
+
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
@@ -1,27 +1,238 @@
 import contextlib
+import hashlib
+import itertools
+import logging
+import time
+from typing import Sequence
 
+from fastapi import Request
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
 
 from src.conf.config import settings
+from src.database.instrumentation import instrument_engine
+from src.database.pool import InstrumentedAsyncQueuePool, PoolStats
+
+logger = logging.getLogger(__name__)
+
+READ_STRATEGIES = ("round_robin", "least_connections")
+
+
+def engine_options(url: str) -> dict:
+    """
+    Build ``create_async_engine`` keyword arguments from the pool settings.
+
+    SQLite keeps the dialect's default pool, as it does not use a queue pool. For
+    asyncpg the statement cache size is passed to the driver; SQLAlchemy's own
+    prepared statement cache is set in the URL by ``engine_url``.
+
+    Args:
+        url: The database URL.
+
+    Returns:
+        dict: Keyword arguments for ``create_async_engine``.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def engine_url(url: str) -> URL:
+    """
+    Add the dialect settings that asyncpg only accepts in the query string.
+
+    Args:
+        url: The database URL.
+
+    Returns:
+        URL: The URL to pass to ``create_async_engine``.
+    """
+    url = make_url(url)
+    if url.get_driver_name() == "asyncpg":
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+    return url
+
+
+class WriterSession(Session):
+    """
+    Session bound to the primary engine.
+    """
+
+
+@event.listens_for(WriterSession, "after_commit")
+def _mark_committed(session):
+    session.info["committed"] = True
 
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
+    """
+    Sessions for a primary engine and optional read replicas.
+
+    Reads are spread over the replicas either round-robin or to the replica with
+    the fewest checked-out connections. A client that committed a transaction on
+    the primary reads from the primary for ``read_your_writes_seconds`` afterwards,
+    so it does not see data older than its own writes while replicas catch up.
+    Pins are shared between workers through Redis when a Redis URL is given, and
+    kept in process memory otherwise or while Redis fails.
+
+    Args:
+        url: URL of the primary database.
+        read_urls: URLs of the read replicas. Without them reads use the primary.
+        read_strategy: ``"round_robin"`` or ``"least_connections"``.
+        read_your_writes_seconds: How long a client stays pinned to the primary.
+        instrument: Whether statements are recorded for metrics and query budgets.
+        redis_url: Optional Redis URL for pins shared between workers.
+        pin_prefix: Prefix of the Redis keys of the pins.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        read_urls: Sequence[str] = (),
+        read_strategy: str = "round_robin",
+        read_your_writes_seconds: float = 0.0,
+        instrument: bool = True,
+        redis_url: str | None = None,
+        pin_prefix: str = "ryw:",
+    ):
+        if read_strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unknown read strategy: {read_strategy}")
+
+        self._engine: AsyncEngine | None = create_async_engine(
+            engine_url(url), **engine_options(url)
+        )
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            bind=self._engine,
+            sync_session_class=WriterSession,
         )
+        self.pool_stats = PoolStats(self._engine)
+
+        self._read_engines = [
+            create_async_engine(engine_url(read_url), **engine_options(read_url))
+            for read_url in read_urls
+        ]
+        self._read_session_makers = [
+            async_sessionmaker(
+                autoflush=False, autocommit=False, expire_on_commit=False, bind=engine
+            )
+            for engine in self._read_engines
+        ]
+        self.read_pool_stats = [PoolStats(engine) for engine in self._read_engines]
+        self.read_strategy = read_strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._next_reader = itertools.count()
+        self._pinned: dict[str, float] = {}
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
+        self.pin_prefix = pin_prefix
+        self.redis_errors = 0
+        if read_urls and read_your_writes_seconds > 0 and redis_url is None:
+            logger.warning(
+                "Read replicas are configured without REDIS_URL: read-your-writes "
+                "pins are per process, so a client whose next request reaches "
+                "another worker may read from a replica that is behind its writes"
+            )
+        if instrument:
+            for engine in (self._engine, *self._read_engines):
+                instrument_engine(engine)
+
+    def _pin_key(self, key: str) -> str:
+        # Client keys may be bearer tokens, so only their digest is stored.
+        return self.pin_prefix + hashlib.sha256(key.encode()).hexdigest()
+
+    async def pin(self, key: str) -> None:
+        """
+        Route reads of a client to the primary for the read-your-writes window.
+
+        Args:
+            key: The client key.
+        """
+        if not self._read_session_makers or self.read_your_writes_seconds <= 0:
+            return
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self._pin_key(key),
+                    1,
+                    px=max(int(self.read_your_writes_seconds * 1000), 1),
+                )
+            except RedisError as e:
+                self.redis_errors += 1
+                logger.warning("Read-your-writes pin falls back to memory: %r", e)
+        now = time.monotonic()
+        self._pinned.pop(key, None)
+        self._pinned[key] = now + self.read_your_writes_seconds
+        # Every pin has the same lifetime, so the oldest entries expire first.
+        while self._pinned:
+            oldest = next(iter(self._pinned))
+            if self._pinned[oldest] > now:
+                break
+            del self._pinned[oldest]
+
+    async def is_pinned(self, key: str | None) -> bool:
+        """
+        Check whether a client is inside its read-your-writes window.
+
+        Args:
+            key: The client key.
+
+        Returns:
+            bool: True if reads of the client must use the primary.
+        """
+        if key is None:
+            return False
+        deadline = self._pinned.get(key)
+        if deadline is not None:
+            if deadline > time.monotonic():
+                return True
+            del self._pinned[key]
+        if self._redis is not None:
+            try:
+                return bool(await self._redis.exists(self._pin_key(key)))
+            except RedisError as e:
+                self.redis_errors += 1
+                logger.warning("Read-your-writes pin check falls back to memory: %r", e)
+        return False
+
+    def _choose_reader(self) -> async_sessionmaker:
+        count = len(self._read_session_makers)
+        start = next(self._next_reader) % count
+        if self.read_strategy == "least_connections":
+            # Start from the round-robin position so that ties are spread out.
+            order = [(start + offset) % count for offset in range(count)]
+            start = min(order, key=lambda i: self.read_pool_stats[i].checked_out)
+        return self._read_session_makers[start]
 
     @contextlib.asynccontextmanager
-    async def session(self):
-        if self._session_maker is None:
-            raise Exception("Database session is not initialized")
-        session = self._session_maker()
+    async def _open(self, session_maker: async_sessionmaker):
+        session = session_maker()
         try:
             yield session
         except SQLAlchemyError as e:
@@ -30,10 +241,78 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def session(self, key: str | None = None):
+        """
+        Open a session on the primary.
 
-sessionmanager = DatabaseSessionManager(settings.DB_URL)
+        Args:
+            key: Optional client key; a commit pins the client to the primary.
+        """
+        if self._session_maker is None:
+            raise Exception("Database session is not initialized")
+        async with self._open(self._session_maker) as session:
+            try:
+                yield session
+            finally:
+                if key is not None and session.info.get("committed"):
+                    await self.pin(key)
+
+    @contextlib.asynccontextmanager
+    async def read_session(self, key: str | None = None):
+        """
+        Open a session for reads on a replica, or on the primary if there are no
+        replicas or the client is pinned.
+
+        Args:
+            key: Optional client key used for read-your-writes pinning.
+        """
+        if not self._read_session_makers or await self.is_pinned(key):
+            session_maker = self._session_maker
+        else:
+            session_maker = self._choose_reader()
+        async with self._open(session_maker) as session:
+            yield session
 
 
-async def get_db():
-    async with sessionmanager.session() as session:
+def client_key(request: Request) -> str | None:
+    """
+    Identify the client of a request for read-your-writes pinning.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        The Authorization header, the client address, or None.
+    """
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        return authorization
+    return request.client.host if request.client else None
+
+
+sessionmanager = DatabaseSessionManager(
+    settings.DB_URL,
+    read_urls=settings.DB_READ_URLS,
+    read_strategy=settings.DB_READ_STRATEGY,
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    redis_url=settings.REDIS_URL,
+)
+
+
+async def get_db(request: Request):
+    async with sessionmanager.session(client_key(request)) as session:
+        yield session
+
+
+async def get_read_db(request: Request):
+    async with sessionmanager.read_session(client_key(request)) as session:
         yield session
+
+
+def get_session_factory():
+    """
+    Return a factory of primary sessions for work that outlives the request,
+    such as background tasks.
+    """
+    return sessionmanager.session
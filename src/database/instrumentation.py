@@ -0,0 +1,141 @@
+import functools
+import inspect
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+QUERY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of SQL statements by repository method and statement type.",
+    ["operation", "statement"],
+    buckets=QUERY_BUCKETS,
+)
+
+current_operation: ContextVar[str] = ContextVar("current_operation", default="other")
+
+
+class RequestQueries:
+    """
+    Statements executed while handling one request.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+
+request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+def label_queries(cls):
+    """
+    Class decorator that labels the queries of public repository methods.
+
+    While a public coroutine or async generator method runs, statements executed by
+    it are attributed to ``"<Class>.<method>"`` in the query metrics.
+
+    Args:
+        cls: The repository class.
+
+    Returns:
+        The same class with wrapped methods.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        operation = f"{cls.__name__}.{name}"
+        if inspect.iscoroutinefunction(method):
+            setattr(cls, name, _label_coroutine(method, operation))
+        elif inspect.isasyncgenfunction(method):
+            setattr(cls, name, _label_async_generator(method, operation))
+    return cls
+
+
+def _label_coroutine(method, operation: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_operation.set(operation)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+
+    return wrapper
+
+
+def _label_async_generator(method, operation: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        # The label is only set while the generator runs, never across a yield,
+        # as the consumer shares the context of the generator.
+        generator = method(*args, **kwargs)
+        try:
+            while True:
+                token = current_operation.set(operation)
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_operation.reset(token)
+                yield item
+        finally:
+            await generator.aclose()
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a failed statement leaves nothing behind.
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    DB_QUERY_DURATION.labels(current_operation.get(), keyword).observe(elapsed)
+    queries = request_queries.get()
+    if queries is not None:
+        queries.record(statement, elapsed)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Record the duration of every statement executed on an engine, in the query
+    metrics and in the statements of the current request.
+
+    Args:
+        engine: The engine to instrument.
+    """
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
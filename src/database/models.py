@@ -2,8 +2,28 @@ from enum import Enum
 
 from datetime import datetime, date
 
-from sqlalchemy import Column, Boolean, Integer, String, func, Enum as SqlEnum
-from sqlalchemy.orm import relationship, mapped_column, Mapped, DeclarativeBase
+from sqlalchemy import (
+    DDL,
+    Column,
+    Boolean,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    event,
+    func,
+    Enum as SqlEnum,
+)
+from sqlalchemy.orm import (
+    relationship,
+    mapped_column,
+    validates,
+    Mapped,
+    DeclarativeBase,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import functions
 from sqlalchemy.sql.sqltypes import DateTime, Date
 from sqlalchemy.sql.schema import ForeignKey
 
@@ -17,14 +37,41 @@ class UserRole(str, Enum):
     ADMIN = "admin"
 
 
+def birthday_mmdd(value: date | None) -> int | None:
+    """
+    Encode the month and day of a date as an MMDD integer, e.g. 1231 for Dec 31.
+
+    Args:
+        value: The date to encode.
+
+    Returns:
+        The MMDD integer, or None if no date is given.
+    """
+    if value is None:
+        return None
+    return value.month * 100 + value.day
+
+
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index(
+            "ix_contacts_user_id_last_name_first_name",
+            "user_id",
+            "last_name",
+            "first_name",
+        ),
+        Index("ix_contacts_user_id_updated_at", "user_id", "updated_at"),
+        Index("ix_contacts_user_id_birthday_mmdd", "user_id", "birthday_mmdd"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     first_name: Mapped[str] = mapped_column(String(128))
     last_name: Mapped[str] = mapped_column(String(128), nullable=False)
     email: Mapped[str] = mapped_column(String(128), nullable=False)
     phone: Mapped[str] = mapped_column(String(128), nullable=False)
     birthday: Mapped[date] = mapped_column(Date)
+    birthday_mmdd: Mapped[int | None] = mapped_column(Integer, nullable=True)
     additional_info: Mapped[str] = mapped_column(String(256))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -38,6 +85,11 @@ class Contact(Base):
     )
     user = relationship("User", backref="contacts")
 
+    @validates("birthday")
+    def _sync_birthday_mmdd(self, key, value):
+        self.birthday_mmdd = birthday_mmdd(value)
+        return value
+
 
 class User(Base):
     __tablename__ = "users"
@@ -49,3 +101,96 @@ class User(Base):
     avatar = Column(String(255), nullable=True)
     confirmed = Column(Boolean, default=False)
     role = Column(SqlEnum(UserRole), default=UserRole.USER, nullable=False)
+
+
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    """
+    An email waiting to be sent by the outbox worker.
+
+    Rows are written in the same transaction as the change that triggers the email.
+    A pending row is due when ``next_attempt_at`` has passed; claiming a row moves
+    ``next_attempt_at`` forward by a lease, so rows of a crashed worker become due
+    again once the lease expires.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32))
+    recipient: Mapped[str] = mapped_column(String(255))
+    payload: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[OutboxStatus] = mapped_column(
+        SqlEnum(OutboxStatus), default=OutboxStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+CONTACT_SEARCH_FIELDS = ("first_name", "last_name", "email", "phone")
+
+# SQLite keeps an FTS5 trigram index over the searchable fields in sync with
+# ``contacts`` through triggers; Postgres uses pg_trgm GIN indexes instead.
+_fts_columns = ", ".join(CONTACT_SEARCH_FIELDS)
+_fts_new = ", ".join(f"new.{field}" for field in CONTACT_SEARCH_FIELDS)
+_fts_old = ", ".join(f"old.{field}" for field in CONTACT_SEARCH_FIELDS)
+
+SQLITE_CONTACT_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5({_fts_columns}, "
+    "content='contacts', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN "
+    f"INSERT INTO contacts_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN "
+    f"INSERT INTO contacts_fts(contacts_fts, rowid, {_fts_columns}) "
+    f"VALUES ('delete', old.id, {_fts_old}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE ON contacts BEGIN "
+    f"INSERT INTO contacts_fts(contacts_fts, rowid, {_fts_columns}) "
+    f"VALUES ('delete', old.id, {_fts_old}); "
+    f"INSERT INTO contacts_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new}); "
+    "END",
+]
+
+POSTGRES_CONTACT_SEARCH_DDL = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+    f"CREATE INDEX IF NOT EXISTS ix_contacts_{field}_trgm "
+    f"ON contacts USING gin ({field} gin_trgm_ops)"
+    for field in CONTACT_SEARCH_FIELDS
+]
+
+for _statement in SQLITE_CONTACT_SEARCH_DDL:
+    event.listen(
+        Contact.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in POSTGRES_CONTACT_SEARCH_DDL:
+    event.listen(
+        Contact.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    Contact.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS contacts_fts").execute_if(dialect="sqlite"),
+)
+
+
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has a resolution of one second, too coarse for ETags and
+    # If-Match checks based on updated_at. This keeps the microsecond format
+    # SQLAlchemy uses for bound datetime values, so equality comparisons match.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
@@ -0,0 +1,136 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """
+    Live statistics of an engine's connection pool.
+
+    Connection counters are collected through SQLAlchemy pool events; acquire
+    time and timeouts are recorded by :class:`InstrumentedAsyncQueuePool`, as there
+    is no pool event that fires before a checkout starts waiting.
+
+    Args:
+        engine: The engine whose pool is observed.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self._engine = engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+        if isinstance(sync_engine.pool, InstrumentedAsyncQueuePool):
+            sync_engine.pool.stats = self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_acquire(self, seconds: float, timed_out: bool) -> None:
+        """
+        Record how long a checkout waited for a connection.
+
+        Args:
+            seconds: Time spent in the pool, including connecting and pre-ping.
+            timed_out: Whether the checkout failed with a pool timeout.
+        """
+        with self._lock:
+            self.acquire_seconds_total += seconds
+            self.acquire_seconds_max = max(self.acquire_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    @property
+    def checked_out(self) -> int:
+        """
+        The number of connections currently in use.
+        """
+        pool = self._engine.sync_engine.pool
+        if isinstance(pool, QueuePool):
+            return pool.checkedout()
+        return self.checkouts - self.checkins
+
+    def snapshot(self) -> dict:
+        """
+        Return the current pool state and counters.
+
+        Returns:
+            dict: Pool size, checked-out and overflow connections, and counters.
+        """
+        pool = self._engine.sync_engine.pool
+        with self._lock:
+            data = {
+                "pool": type(pool).__name__,
+                "checked_out": self.checked_out,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "avg_acquire_seconds": (
+                    self.acquire_seconds_total / self.checkouts
+                    if self.checkouts
+                    else 0.0
+                ),
+                "max_acquire_seconds": self.acquire_seconds_max,
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                max_overflow=pool._max_overflow,
+            )
+        return data
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    An async queue pool that reports acquire time and timeouts to :class:`PoolStats`.
+    """
+
+    stats: PoolStats | None = None
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.stats is not None:
+                self.stats.record_acquire(time.perf_counter() - started, timed_out)
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
@@ -0,0 +1,270 @@
+"""
+Fill a database with synthetic users and contacts for local load testing.
+
+The same arguments always produce the same rows. Contacts are loaded in batches
+with COPY on Postgres and with executemany on SQLite, where the full-text index is
+rebuilt once after the load instead of row by row.
+
+Run it with::
+
+    python -m src.database.seed --users 1000 --contacts-per-user 1000 --reset
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, List
+
+from sqlalchemy import DDL, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from src.conf.config import settings
+from src.database.models import (
+    SQLITE_CONTACT_SEARCH_DDL,
+    Base,
+    Contact,
+    User,
+    UserRole,
+    birthday_mmdd,
+)
+from src.repository.contacts import copy_contact_rows
+from src.services.auth import Hash
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = (
+    "Olena Andrii Iryna Taras Oksana Dmytro Natalia Serhii Yulia Mykola Kateryna "
+    "Bohdan Sofia Ivan Maria Petro Anna Oleksandr Viktoria Yurii Halyna Roman "
+    "Larysa Vasyl Tetiana Maksym Daryna Artem Liudmyla Volodymyr"
+).split()
+LAST_NAMES = (
+    "Shevchenko Kovalenko Bondarenko Tkachenko Kravchenko Melnyk Boyko Oliynyk "
+    "Lysenko Moroz Rudenko Savchenko Marchenko Petrenko Koval Polishchuk "
+    "Kovalchuk Shevchuk Ponomarenko Tkachuk Pavlenko Levchenko Kharchenko Karpenko"
+).split()
+EMAIL_DOMAINS = ("example.com", "example.org", "example.net", "mail.example")
+FIRST_BIRTHDAY = date(1950, 1, 1)
+BIRTHDAY_DAYS = 365 * 56
+
+# The trigger keeping the SQLite full-text index in sync on insert.
+_SQLITE_FTS_INSERT_TRIGGER = "contacts_fts_ai"
+
+
+def synthetic_users(
+    count: int, hashed_password: str, prefix: str = "user"
+) -> List[dict]:
+    """
+    Generate confirmed users ``<prefix>0`` .. ``<prefix>N``.
+
+    Args:
+        count: The number of users.
+        hashed_password: The password hash shared by every user.
+        prefix: Prefix of the usernames and emails.
+
+    Returns:
+        List[dict]: Column values of the ``users`` table.
+    """
+    return [
+        {
+            "username": f"{prefix}{u}",
+            "email": f"{prefix}{u}@example.com",
+            "hashed_password": hashed_password,
+            "confirmed": True,
+            "role": UserRole.USER,
+        }
+        for u in range(count)
+    ]
+
+
+def synthetic_contacts(rng: random.Random, user_id: int, count: int) -> List[dict]:
+    """
+    Generate contacts of a user with varied names, emails, phones and birthdays.
+
+    Birthdays cover every day of the year, so birthday queries find matches in
+    any week.
+
+    Args:
+        rng: The random generator; the same seed gives the same rows.
+        user_id: ID of the owner, also used to keep emails unique.
+        count: The number of contacts.
+
+    Returns:
+        List[dict]: Column values of the ``contacts`` table.
+    """
+    rows = []
+    for i in range(count):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        birthday = FIRST_BIRTHDAY + timedelta(days=rng.randrange(BIRTHDAY_DAYS))
+        domain = rng.choice(EMAIL_DOMAINS)
+        rows.append(
+            {
+                "user_id": user_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": f"{first_name}.{last_name}.{user_id}.{i}@{domain}".lower(),
+                "phone": f"+380{rng.randrange(10**9):09d}",
+                "birthday": birthday,
+                "birthday_mmdd": birthday_mmdd(birthday),
+                "additional_info": "",
+            }
+        )
+    return rows
+
+
+async def insert_contacts(connection: AsyncConnection, rows: List[dict]) -> None:
+    """
+    Insert a batch of contacts with the fastest method of the driver.
+
+    Args:
+        connection: The connection of the load transaction.
+        rows: Rows as produced by :func:`synthetic_contacts`.
+    """
+    driver = connection.dialect.driver
+    if driver == "asyncpg":
+        await copy_contact_rows(connection, rows)
+    elif driver == "aiosqlite":
+        # Skip SQLAlchemy's per-row parameter processing; SQLite stores dates and
+        # timestamps as the strings SQLAlchemy would have written.
+        now = str(datetime.now())
+        columns = list(rows[0]) + ["created_at", "updated_at"]
+        statement = (
+            f"INSERT INTO {Contact.__tablename__} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        birthday = columns.index("birthday")
+        records = []
+        for row in rows:
+            values = list(row.values())
+            values[birthday] = values[birthday].isoformat()
+            records.append((*values, now, now))
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.executemany(statement, records)
+    else:
+        await connection.execute(insert(Contact), rows)
+
+
+@contextlib.asynccontextmanager
+async def deferred_search_index(connection: AsyncConnection) -> AsyncIterator[None]:
+    """
+    Suspend the SQLite full-text index during a load and rebuild it afterwards.
+
+    Rebuilding once is several times faster than indexing every inserted row.
+    Other dialects are left as they are.
+
+    Args:
+        connection: The connection of the load transaction.
+    """
+    if connection.dialect.name != "sqlite":
+        yield
+        return
+    await connection.execute(
+        DDL(f"DROP TRIGGER IF EXISTS {_SQLITE_FTS_INSERT_TRIGGER}")
+    )
+    yield
+    (trigger,) = [
+        statement
+        for statement in SQLITE_CONTACT_SEARCH_DDL
+        if _SQLITE_FTS_INSERT_TRIGGER in statement
+    ]
+    await connection.execute(DDL(trigger))
+    await connection.execute(
+        DDL("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+    )
+
+
+async def seed_database(
+    engine: AsyncEngine,
+    users: int,
+    contacts_per_user: int,
+    seed: int = 0,
+    hashed_password: str = "x",
+    prefix: str = "user",
+    batch_size: int = 10_000,
+) -> int:
+    """
+    Insert synthetic users with synthetic contacts in one transaction.
+
+    Args:
+        engine: The engine of the database; the schema must exist.
+        users: The number of users.
+        contacts_per_user: The number of contacts of every user.
+        seed: Seed of the random generator.
+        hashed_password: The password hash shared by every user.
+        prefix: Prefix of the usernames and emails; must not be taken yet.
+        batch_size: The number of contacts sent per statement.
+
+    Returns:
+        int: The number of inserted contacts.
+    """
+    rng = random.Random(seed)
+    inserted = 0
+    async with engine.begin() as connection:
+        result = await connection.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            synthetic_users(users, hashed_password, prefix),
+        )
+        user_ids = result.scalars().all()
+
+        async with deferred_search_index(connection):
+            batch = []
+            for user_id in user_ids:
+                batch.extend(synthetic_contacts(rng, user_id, contacts_per_user))
+                if len(batch) >= batch_size:
+                    await insert_contacts(connection, batch)
+                    inserted += len(batch)
+                    batch = []
+            if batch:
+                await insert_contacts(connection, batch)
+                inserted += len(batch)
+    return inserted
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_url)
+    try:
+        if args.reset:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+        started = time.perf_counter()
+        inserted = await seed_database(
+            engine,
+            args.users,
+            args.contacts_per_user,
+            seed=args.seed,
+            hashed_password=Hash().get_password_hash(args.password),
+            prefix=args.prefix,
+            batch_size=args.batch_size,
+        )
+        logger.info(
+            "Inserted %d users and %d contacts in %.1fs",
+            args.users,
+            inserted,
+            time.perf_counter() - started,
+        )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fill a database with synthetic users and contacts."
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--contacts-per-user", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--prefix", default="user", help="Username prefix")
+    parser.add_argument("--password", default="password", help="Password of all users")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--db-url", default=settings.DB_URL)
+    parser.add_argument(
+        "--reset", action="store_true", help="Drop and recreate all tables first"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main(args))
@@ -1,14 +1,54 @@
-from typing import List, Optional
-
-from datetime import date, timedelta
-
-from sqlalchemy import select, and_, func
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.database.models import Contact, User
-from src.schemas import ContactBase, ContactUpdate
-
-
+from typing import AsyncIterator, List, Optional, Tuple
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    and_,
+    or_,
+    case,
+    func,
+    column,
+    literal_column,
+    table,
+)
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.database.instrumentation import label_queries
+from src.database.models import CONTACT_SEARCH_FIELDS, Contact, User, birthday_mmdd
+from src.schemas import ContactBase, ContactResponse, ContactUpdate
+
+CONTACT_EXPORT_FIELDS = tuple(ContactResponse.model_fields)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def copy_contact_rows(connection: AsyncConnection, rows: List[dict]) -> None:
+    """
+    Send contact rows to Postgres with COPY through the asyncpg connection.
+
+    Args:
+        connection: A connection using the asyncpg driver.
+        rows: Column values of every contact, all with the same keys and
+            including ``user_id`` and ``birthday_mmdd``.
+    """
+    now = datetime.now()
+    columns = list(rows[0]) + ["created_at", "updated_at"]
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        Contact.__tablename__,
+        columns=columns,
+        records=[(*row.values(), now, now) for row in rows],
+    )
+
+
+@label_queries
 class ContactRepository:
     def __init__(self, session: AsyncSession):
         """
@@ -20,32 +60,197 @@ class ContactRepository:
         self.db = session
 
     async def get_contacts(
-        self, skip: int, limit: int, filters: dict, user: User
+        self,
+        skip: int,
+        limit: int,
+        filters: dict,
+        user: User,
+        after_id: Optional[int] = None,
     ) -> List[Contact]:
         """
         Retrieve a list of contacts with optional filters, pagination, and user ownership.
 
+        Contacts are ordered by ID. When ``after_id`` is given, the page starts right
+        after that contact (keyset pagination) and ``skip`` is ignored; otherwise the
+        legacy offset pagination is used.
+
         Args:
             skip: The number of contacts to skip.
             limit: The maximum number of contacts to retrieve.
             filters: A dictionary of field-value pairs to filter contacts.
             user: The User who owns the contacts.
+            after_id: Optional ID of the last contact of the previous page.
 
         Returns:
             A list of Contact instances matching the criteria.
         """
-        filter_cond = [
-            getattr(Contact, field).ilike(f"%{value}%")
+        query = self._contacts_query(
+            select(Contact), skip, limit, filters, user, after_id
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_contact_rows(
+        self,
+        skip: int,
+        limit: int,
+        filters: dict,
+        user: User,
+        after_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Retrieve the same page as :meth:`get_contacts` as plain dictionaries.
+
+        Only the response fields are selected and no ORM objects are built, for
+        responses that are serialized straight from the rows.
+
+        Args:
+            skip: The number of contacts to skip.
+            limit: The maximum number of contacts to retrieve.
+            filters: A dictionary of field-value pairs to filter contacts.
+            user: The User who owns the contacts.
+            after_id: Optional ID of the last contact of the previous page.
+
+        Returns:
+            A list of dictionaries keyed by ``CONTACT_EXPORT_FIELDS``.
+        """
+        query = self._contacts_query(
+            select(*(getattr(Contact, field) for field in CONTACT_EXPORT_FIELDS)),
+            skip,
+            limit,
+            filters,
+            user,
+            after_id,
+        )
+        result = await self.db.execute(query)
+        return [dict(zip(CONTACT_EXPORT_FIELDS, row)) for row in result.tuples()]
+
+    def _contacts_query(
+        self,
+        query,
+        skip: int,
+        limit: int,
+        filters: dict,
+        user: User,
+        after_id: Optional[int],
+    ):
+        filter_cond = self._filter_conditions(filters)
+        filter_cond.append(Contact.user_id == user.id)
+
+        query = query.order_by(Contact.id).limit(limit)
+        if after_id is not None:
+            filter_cond.append(Contact.id > after_id)
+        else:
+            query = query.offset(skip)
+        return query.filter(and_(*filter_cond))
+
+    @staticmethod
+    def _filter_conditions(filters: dict) -> list:
+        """
+        Build case-insensitive substring conditions from field-value filters.
+
+        ``%``, ``_`` and ``\\`` in the values match literally.
+
+        Args:
+            filters: A dictionary of field-value pairs; empty values are skipped.
+
+        Returns:
+            A list of SQL conditions.
+        """
+        return [
+            getattr(Contact, field).ilike(f"%{_escape_like(value)}%", escape="\\")
             for field, value in filters.items()
             if hasattr(Contact, field) and value
         ]
 
-        filter_cond.append(Contact.user_id == user.id)
+    async def search_contacts(
+        self, query: str, user: User, limit: int
+    ) -> List[Contact]:
+        """
+        Search the user's contacts by a substring of the name, email or phone.
 
-        query = select(Contact).filter(and_(*filter_cond)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
+        Every whitespace-separated term must occur in at least one of the searchable
+        fields. On SQLite the FTS5 trigram table is queried and results are ranked by
+        BM25; on Postgres the pg_trgm GIN indexes serve the ILIKE conditions and
+        results are ranked by trigram similarity. Terms shorter than three
+        characters cannot use a trigram index and fall back to a plain LIKE scan
+        over the user's contacts.
+
+        Args:
+            query: The search string.
+            user: The User who owns the contacts.
+            limit: The maximum number of contacts to retrieve.
+
+        Returns:
+            A list of matching Contact instances, best matches first.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        dialect = self.db.get_bind().dialect.name
+
+        stmt = select(Contact).where(Contact.user_id == user.id).limit(limit)
+        if dialect == "sqlite" and all(len(term) >= 3 for term in terms):
+            contacts_fts = table("contacts_fts", column("rowid"), column("rank"))
+            match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+            stmt = (
+                stmt.join(contacts_fts, contacts_fts.c.rowid == Contact.id)
+                .where(literal_column("contacts_fts").op("MATCH")(match))
+                .order_by(contacts_fts.c.rank, Contact.id)
+            )
+        else:
+            stmt = stmt.where(*(self._search_term_condition(term) for term in terms))
+            if dialect == "postgresql":
+                similarity = func.greatest(
+                    *(
+                        func.similarity(getattr(Contact, field), query)
+                        for field in CONTACT_SEARCH_FIELDS
+                    )
+                )
+                stmt = stmt.order_by(similarity.desc(), Contact.id)
+            else:
+                stmt = stmt.order_by(Contact.id)
+
+        result = await self.db.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    def _search_term_condition(term: str):
+        escaped = _escape_like(term)
+        return or_(
+            *(
+                getattr(Contact, field).ilike(f"%{escaped}%", escape="\\")
+                for field in CONTACT_SEARCH_FIELDS
+            )
+        )
+
+    async def stream_contacts(
+        self, user: User, batch_size: int
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Stream all contacts of the specified user with a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time as plain mappings, without
+        building ORM objects, so memory use does not grow with the number of
+        contacts.
+
+        Args:
+            user: The User who owns the contacts.
+            batch_size: The number of rows fetched per round trip.
+
+        Yields:
+            A mapping of the contact fields for each contact, ordered by ID.
+        """
+        query = (
+            select(*(getattr(Contact, field) for field in CONTACT_EXPORT_FIELDS))
+            .where(Contact.user_id == user.id)
+            .order_by(Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(query)
+        async for row in result.mappings():
+            yield row
+
     async def get_contact_by_id(self, contact_id: int, user: User) -> Optional[Contact]:
         """
         Retrieve a contact by its ID and ensure it belongs to the specified user.
@@ -63,10 +268,33 @@ class ContactRepository:
         result = await self.db.execute(query)
         return result.scalars().first()
 
+    async def get_contacts_version(self, user: User) -> Tuple[int, Optional[datetime]]:
+        """
+        Return the number of contacts of a user and their latest ``updated_at``.
+
+        Every create, update and delete changes at least one of the two values, so
+        together they identify the state of the user's contacts.
+
+        Args:
+            user: The User who owns the contacts.
+
+        Returns:
+            The contact count and the latest update time (None without contacts).
+        """
+        query = select(func.count(), func.max(Contact.updated_at)).where(
+            Contact.user_id == user.id
+        )
+        result = await self.db.execute(query)
+        count, last_updated_at = result.one()
+        return count, last_updated_at
+
     async def create_contact(self, body: ContactBase, user: User) -> Contact:
         """
         Create a new contact for the specified user.
 
+        The generated ID and timestamps come back with the INSERT through
+        RETURNING, so the contact is not reloaded after the commit.
+
         Args:
             body: A ContactBase instance with the contact details.
             user: The User who will own the new contact.
@@ -74,16 +302,45 @@ class ContactRepository:
         Returns:
             The created Contact instance.
         """
-        new_contact = Contact(**body.dict(), user=user)
+        new_contact = Contact(**body.model_dump(), user_id=user.id)
         self.db.add(new_contact)
         await self.db.commit()
-        await self.db.refresh(new_contact)
         return new_contact
 
+    async def bulk_create_contacts(self, rows: List[dict], user: User) -> int:
+        """
+        Insert many contacts for the specified user in a single statement.
+
+        On asyncpg the rows are sent with COPY; other drivers get one multi-row
+        INSERT. The batch is committed before returning.
+
+        Args:
+            rows: Validated contact fields, as produced by ``ContactImportRow.model_dump``.
+            user: The User who will own the new contacts.
+
+        Returns:
+            The number of inserted contacts.
+        """
+        if not rows:
+            return 0
+        for row in rows:
+            row["user_id"] = user.id
+            row["birthday_mmdd"] = birthday_mmdd(row["birthday"])
+
+        connection = await self.db.connection()
+        if connection.dialect.driver == "asyncpg":
+            await copy_contact_rows(connection, rows)
+        else:
+            await self.db.execute(insert(Contact).values(rows))
+        await self.db.commit()
+        return len(rows)
+
     async def remove_contact(self, contact_id: int, user: User) -> Optional[Contact]:
         """
         Remove a contact by its ID if it belongs to the specified user.
 
+        Runs a single ``DELETE ... RETURNING`` statement.
+
         Args:
             contact_id: The ID of the contact to remove.
             user: The User who owns the contact.
@@ -91,18 +348,161 @@ class ContactRepository:
         Returns:
             The removed Contact instance if found, or None otherwise.
         """
-        query = select(Contact).where(
-            Contact.id == contact_id, Contact.user_id == user.id
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .returning(Contact)
         )
-        result = await self.db.execute(query)
+        result = await self.db.execute(stmt)
         contact = result.scalars().first()
-        if contact:
-            await self.db.delete(contact)
-            await self.db.commit()
+        await self.db.commit()
+        return contact
+
+    def _bulk_conditions(
+        self,
+        user: User,
+        limit: int,
+        ids: Optional[List[int]],
+        filters: Optional[dict],
+    ) -> list:
+        """
+        Select up to ``limit`` contacts of a user by IDs or by filters.
+
+        Args:
+            user: The User who owns the contacts.
+            limit: The maximum number of contacts to select.
+            ids: IDs of the contacts, or None to select by filters.
+            filters: Field-value filters used when no IDs are given.
+
+        Returns:
+            A list of SQL conditions for a set-based statement.
+        """
+        conditions = [Contact.user_id == user.id]
+        if ids is not None:
+            conditions.append(Contact.id.in_(ids[:limit]))
+        else:
+            selected = (
+                select(Contact.id)
+                .where(Contact.user_id == user.id, *self._filter_conditions(filters))
+                .order_by(Contact.id)
+                .limit(limit)
+            )
+            conditions.append(Contact.id.in_(selected))
+        return conditions
+
+    async def bulk_delete_contacts(
+        self,
+        user: User,
+        limit: int,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+    ) -> List[int]:
+        """
+        Delete up to ``limit`` contacts of a user with one ``DELETE ... RETURNING``.
+
+        Args:
+            user: The User who owns the contacts.
+            limit: The maximum number of contacts to delete.
+            ids: IDs of the contacts to delete; IDs of other users are ignored.
+            filters: Field-value filters used when no IDs are given.
+
+        Returns:
+            The IDs of the deleted contacts, in ascending order.
+        """
+        stmt = (
+            delete(Contact)
+            .where(*self._bulk_conditions(user, limit, ids, filters))
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        deleted = sorted(result.scalars().all())
+        await self.db.commit()
+        return deleted
+
+    async def bulk_update_contacts(
+        self,
+        user: User,
+        values: dict,
+        limit: int,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+    ) -> List[int]:
+        """
+        Update up to ``limit`` contacts of a user with one ``UPDATE ... RETURNING``.
+
+        Args:
+            user: The User who owns the contacts.
+            values: Column values to set on every selected contact.
+            limit: The maximum number of contacts to update.
+            ids: IDs of the contacts to update; IDs of other users are ignored.
+            filters: Field-value filters used when no IDs are given.
+
+        Returns:
+            The IDs of the updated contacts, in ascending order.
+        """
+        if "birthday" in values:
+            values["birthday_mmdd"] = birthday_mmdd(values["birthday"])
+        stmt = (
+            update(Contact)
+            .where(*self._bulk_conditions(user, limit, ids, filters))
+            .values(**values)
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        updated = sorted(result.scalars().all())
+        await self.db.commit()
+        return updated
+
+    async def _update_contact(
+        self,
+        contact_id: int,
+        user: User,
+        values: dict,
+        if_updated_at: Optional[List[datetime]] = None,
+    ) -> Optional[Contact]:
+        """
+        Update a contact with a single ``UPDATE ... RETURNING`` statement.
+
+        Args:
+            contact_id: The ID of the contact to update.
+            user: The User who owns the contact.
+            values: Column values to set.
+            if_updated_at: Optional ``updated_at`` values the contact must still
+                have; otherwise nothing is updated.
+
+        Returns:
+            The updated Contact instance if found, or None otherwise.
+        """
+        conditions = [Contact.id == contact_id, Contact.user_id == user.id]
+        if if_updated_at is not None:
+            conditions.append(Contact.updated_at.in_(if_updated_at))
+        if not values:
+            query = select(Contact).where(*conditions)
+            result = await self.db.execute(query)
+            return result.scalars().first()
+        if "birthday" in values:
+            values["birthday_mmdd"] = birthday_mmdd(values["birthday"])
+
+        stmt = (
+            update(Contact)
+            .where(*conditions)
+            .values(**values)
+            .returning(Contact)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalars().first()
+        await self.db.commit()
         return contact
 
     async def update_contact(
-        self, contact_id: int, body: ContactUpdate, user: User
+        self,
+        contact_id: int,
+        body: ContactUpdate,
+        user: User,
+        if_updated_at: Optional[List[datetime]] = None,
     ) -> Optional[Contact]:
         """
         Update a contact's details by its ID if it belongs to the specified user.
@@ -111,47 +511,57 @@ class ContactRepository:
             contact_id: The ID of the contact to update.
             body: A ContactUpdate instance with the updated contact details.
             user: The User who owns the contact.
+            if_updated_at: Optional ``updated_at`` values the contact must still have.
 
         Returns:
             The updated Contact instance if found, or None otherwise.
         """
-        query = select(Contact).where(
-            Contact.id == contact_id, Contact.user_id == user.id
+        return await self._update_contact(
+            contact_id, user, body.model_dump(exclude_unset=True), if_updated_at
         )
-        result = await self.db.execute(query)
-        contact = result.scalars().first()
-        if contact:
-            for field, value in body.dict(exclude_unset=True).items():
-                setattr(contact, field, value)
-            self.db.add(contact)
-            await self.db.commit()
-            await self.db.refresh(contact)
-        return contact
 
-    async def get_upcoming_birthdays(self, user: User) -> List[Contact]:
+    async def get_upcoming_birthdays(self, user: User, days: int = 7) -> List[Contact]:
         """
-        Retrieve a list of contacts with birthdays within the next 7 days for the specified user.
+        Retrieve a list of contacts with birthdays within the next ``days`` days for the specified user.
+
+        The query compares the indexed ``birthday_mmdd`` column, so it works on every
+        database and handles windows that wrap from December into January.
 
         Args:
             user: The User who owns the contacts.
+            days: The size of the window in days, today included.
 
         Returns:
-            A list of Contact instances with upcoming birthdays.
+            A list of Contact instances with upcoming birthdays, nearest first.
         """
         today = date.today()
-        end_date = today + timedelta(days=7)
-
-        query = select(Contact).where(
-            Contact.user_id == user.id,
-            func.to_char(Contact.birthday, "MM-DD").between(
-                today.strftime("%m-%d"), end_date.strftime("%m-%d")
-            ),
+        start = birthday_mmdd(today)
+        end = birthday_mmdd(today + timedelta(days=days))
+
+        if days >= 365:
+            window = Contact.birthday_mmdd.is_not(None)
+        elif start <= end:
+            window = Contact.birthday_mmdd.between(start, end)
+        else:
+            window = or_(Contact.birthday_mmdd >= start, Contact.birthday_mmdd <= end)
+
+        query = (
+            select(Contact)
+            .where(Contact.user_id == user.id, window)
+            .order_by(
+                case((Contact.birthday_mmdd >= start, 0), else_=1),
+                Contact.birthday_mmdd,
+            )
         )
         result = await self.db.execute(query)
         return result.scalars().all()
 
     async def update_phone(
-        self, contact_id: int, phone: str, user: User
+        self,
+        contact_id: int,
+        phone: str,
+        user: User,
+        if_updated_at: Optional[List[datetime]] = None,
     ) -> Optional[Contact]:
         """
         Update a contact's phone number by its ID if it belongs to the specified user.
@@ -160,26 +570,21 @@ class ContactRepository:
             contact_id: The ID of the contact to update.
             phone: The new phone number.
             user: The User who owns the contact.
+            if_updated_at: Optional ``updated_at`` values the contact must still have.
 
         Returns:
             The updated Contact instance if found, or None otherwise.
         """
-        query = select(Contact).where(
-            Contact.id == contact_id, Contact.user_id == user.id
+        return await self._update_contact(
+            contact_id, user, {"phone": phone}, if_updated_at
         )
-        result = await self.db.execute(query)
-        contact = result.scalars().first()
-
-        if contact:
-            contact.phone = phone
-            self.db.add(contact)
-            await self.db.commit()
-            await self.db.refresh(contact)
-
-        return contact
 
     async def update_email(
-        self, contact_id: int, email: str, user: User
+        self,
+        contact_id: int,
+        email: str,
+        user: User,
+        if_updated_at: Optional[List[datetime]] = None,
     ) -> Optional[Contact]:
         """
         Update a contact's email address by its ID if it belongs to the specified user.
@@ -188,20 +593,11 @@ class ContactRepository:
             contact_id: The ID of the contact to update.
             email: The new email address.
             user: The User who owns the contact.
+            if_updated_at: Optional ``updated_at`` values the contact must still have.
 
         Returns:
             The updated Contact instance if found, or None otherwise.
         """
-        query = select(Contact).where(
-            Contact.id == contact_id, Contact.user_id == user.id
+        return await self._update_contact(
+            contact_id, user, {"email": email}, if_updated_at
         )
-        result = await self.db.execute(query)
-        contact = result.scalars().first()
-
-        if contact:
-            contact.email = email
-            self.db.add(contact)
-            await self.db.commit()
-            await self.db.refresh(contact)
-
-        return contact
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.instrumentation import label_queries
+from src.database.models import EmailOutbox, OutboxStatus
+
+
+def utcnow() -> datetime:
+    """
+    Return the current UTC time as a naive datetime, as stored in the outbox.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@label_queries
+class OutboxRepository:
+    """
+    Repository class for the email outbox.
+
+    Args:
+        session: AsyncSession instance for database interactions.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    def add(self, kind: str, recipient: str, payload: dict) -> EmailOutbox:
+        """
+        Add an email to the outbox without committing.
+
+        The row is written by the next commit of the session, together with the
+        change that triggered the email.
+
+        Args:
+            kind: The kind of email, which selects its template.
+            recipient: The email address of the recipient.
+            payload: Template values of the email.
+
+        Returns:
+            The pending EmailOutbox instance.
+        """
+        message = EmailOutbox(
+            kind=kind,
+            recipient=recipient,
+            payload=payload,
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=utcnow(),
+        )
+        self.db.add(message)
+        return message
+
+    async def claim_batch(self, limit: int, lease_seconds: float) -> List[EmailOutbox]:
+        """
+        Claim up to ``limit`` due emails for sending.
+
+        Due rows are locked with ``FOR UPDATE SKIP LOCKED`` where the database
+        supports it, so concurrent workers claim disjoint batches. Claimed rows are
+        leased: their next attempt moves ``lease_seconds`` ahead, so they become due
+        again if the worker dies before recording the result.
+
+        Args:
+            limit: The maximum number of emails to claim.
+            lease_seconds: How long the claim is held.
+
+        Returns:
+            The claimed EmailOutbox instances with ``attempts`` incremented.
+        """
+        now = utcnow()
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status == OutboxStatus.PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(
+                next_attempt_at=now + timedelta(seconds=lease_seconds),
+                attempts=EmailOutbox.attempts + 1,
+            )
+            .returning(EmailOutbox)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        messages = sorted(result.scalars().all(), key=lambda message: message.id)
+        await self.db.commit()
+        return messages
+
+    async def record_results(
+        self,
+        sent_ids: List[int],
+        failures: List[Tuple[int, str, Optional[datetime]]],
+    ) -> None:
+        """
+        Record the outcome of a batch in one transaction.
+
+        Args:
+            sent_ids: IDs of the emails that were sent.
+            failures: ``(id, error, retry_at)`` of the emails that failed; a
+                ``retry_at`` of None marks the email as permanently failed.
+        """
+        if sent_ids:
+            await self.db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(sent_ids))
+                .values(status=OutboxStatus.SENT, sent_at=utcnow(), last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+        for message_id, error, retry_at in failures:
+            values = {"last_error": error[:1000]}
+            if retry_at is None:
+                values["status"] = OutboxStatus.FAILED
+            else:
+                values["next_attempt_at"] = retry_at
+            await self.db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == message_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.commit()
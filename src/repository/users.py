@@ -1,10 +1,13 @@
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.database.instrumentation import label_queries
 from src.database.models import User
 from src.schemas import UserCreate
+from src.services.cache import user_cache
 
 
+@label_queries
 class UserRepository:
     """
     Repository class for managing user-related database operations.
@@ -46,7 +49,7 @@ class UserRepository:
 
     async def get_user_by_email(self, email: str) -> User | None:
         """
-        Retrieve a user by their email address.
+        Retrieve a user by their email address, ignoring case.
 
         Args:
             email: The email of the user to retrieve.
@@ -54,7 +57,7 @@ class UserRepository:
         Returns:
             The User instance if found, otherwise None.
         """
-        stmt = select(User).filter_by(email=email)
+        stmt = select(User).where(func.lower(User.email) == email.lower())
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
@@ -79,35 +82,75 @@ class UserRepository:
         await self.db.refresh(user)
         return user
 
-    async def confirmed_email(self, email: str) -> None:
+    async def confirmed_email(self, email: str) -> User | None:
         """
         Mark a user's email as confirmed.
 
+        Runs a single conditional ``UPDATE ... WHERE confirmed = false RETURNING``
+        statement, so an already confirmed user is left untouched.
+
         Args:
             email: The email address of the user to confirm.
+
+        Returns:
+            The confirmed User instance, or None if no unconfirmed user has this email.
         """
-        user = await self.get_user_by_email(email)
-        user.confirmed = True
-        await self.db.commit()
+        stmt = (
+            update(User)
+            .where(func.lower(User.email) == email.lower(), User.confirmed.is_(False))
+            .values(confirmed=True)
+            .returning(User)
+        )
+        return await self._update_user(stmt)
 
-    async def update_avatar_url(self, email: str, url: str) -> User:
+    async def update_avatar_url(self, user_id: int, url: str) -> User | None:
         """
         Update the avatar URL of a user.
 
         Args:
-            email: The email address of the user.
+            user_id: The ID of the user.
             url: The new avatar URL.
 
         Returns:
-            The updated User instance.
+            The updated User instance, or None if the user does not exist.
         """
-        user = await self.get_user_by_email(email)
-        user.avatar = url
+        stmt = update(User).where(User.id == user_id).values(avatar=url).returning(User)
+        return await self._update_user(stmt)
+
+    async def update_password(self, email: str, new_password: str) -> User | None:
+        """
+        Replace the password hash of a user.
+
+        Args:
+            email: The email address of the user.
+            new_password: The new password hash.
+
+        Returns:
+            The updated User instance, or None if no user has this email.
+        """
+        stmt = (
+            update(User)
+            .where(func.lower(User.email) == email.lower())
+            .values(hashed_password=new_password)
+            .returning(User)
+        )
+        return await self._update_user(stmt)
+
+    async def _update_user(self, stmt) -> User | None:
+        """
+        Execute an ``UPDATE ... RETURNING`` statement for a single user and commit.
+
+        The cached copy of the changed user is invalidated.
+
+        Args:
+            stmt: The UPDATE statement returning the User entity.
+
+        Returns:
+            The updated User instance, or None if no row matched.
+        """
+        result = await self.db.execute(stmt.execution_options(populate_existing=True))
+        user = result.scalar_one_or_none()
         await self.db.commit()
-        await self.db.refresh(user)
+        if user is not None:
+            await user_cache.invalidate(user.username)
         return user
-
-    async def update_password(self, email: str, new_password) -> None:
-        user = await self.get_user_by_email(email)
-        user.hashed_password = new_password
-        self.db.commit()
@@ -1,6 +1,6 @@
 from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, model_validator
 from src.database.models import UserRole
 
 
@@ -42,6 +42,75 @@ class ContactEmailUpdate(BaseModel):
     email: EmailStr = Field(..., description="New email")
 
 
+class ContactImportRow(ContactBase):
+    birthday: date
+    additional_info: str = Field("", max_length=256)
+
+
+class ContactImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ContactImportReport(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ContactImportError]
+    errors_truncated: bool
+
+
+class ContactFilter(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not any(self.model_dump().values()):
+            raise ValueError("Filter needs at least one field")
+        return self
+
+
+class ContactBulkSelection(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    filter: Optional[ContactFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        return self
+
+
+class ContactBulkValues(BaseModel):
+    first_name: Optional[str] = Field(None, max_length=128)
+    last_name: Optional[str] = Field(None, max_length=128)
+    email: Optional[EmailStr] = Field(None, max_length=128)
+    phone: Optional[str] = Field(None, max_length=128)
+    birthday: Optional[date] = None
+    additional_info: Optional[str] = Field(None, max_length=256)
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_fields_set:
+            raise ValueError("Provide at least one field to update")
+        # Every contact column is NOT NULL, so null can only mean "not set".
+        nulls = sorted(f for f in self.model_fields_set if getattr(self, f) is None)
+        if nulls:
+            raise ValueError(f"Fields cannot be null: {', '.join(nulls)}")
+        return self
+
+
+class ContactBulkUpdate(ContactBulkSelection):
+    values: ContactBulkValues
+
+
+class ContactBulkResult(BaseModel):
+    ids: List[int]
+    count: int
+    has_more: bool
+
+
 class User(BaseModel):
     id: int
     username: str
@@ -1,5 +1,9 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
-from typing import Optional
+from typing import Callable, Optional
 
 from fastapi import Depends, HTTPException, status
 from passlib.context import CryptContext
@@ -7,18 +11,103 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 
-from src.database.db import get_db
+from src.database.db import get_read_db
 from src.database.models import User, UserRole
 from src.conf.config import settings
 from src.services.users import UserService
+from src.services.cache import user_cache
+
+
+class PasswordHashingPool:
+    """
+    A bounded thread pool that runs bcrypt outside of the event loop.
+
+    bcrypt releases the GIL while hashing, so at most ``max_workers`` hashes run in
+    parallel and the event loop keeps serving other requests. Jobs above the limit
+    wait in the executor queue, whose depth is reported by :meth:`stats`.
+
+    Args:
+        max_workers (int): The maximum number of concurrent bcrypt calls.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.max_queued = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+
+    async def run(self, func: Callable, *args):
+        """
+        Run a blocking function in the pool and await its result.
+
+        Args:
+            func (Callable): The blocking function to run.
+            *args: Positional arguments for the function.
+
+        Returns:
+            The value returned by the function.
+        """
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        future = self._executor.submit(self._call, time.perf_counter(), func, *args)
+        # A job cancelled while still queued never reaches _call.
+        future.add_done_callback(self._dequeue_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _dequeue_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def _call(self, submitted_at: float, func: Callable, *args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_seconds += time.perf_counter() - submitted_at
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        """
+        Return the queue depth and throughput counters of the pool.
+
+        Returns:
+            dict: The pool counters.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "running": self.running,
+                "completed": self.completed,
+                "avg_wait_seconds": (
+                    self.wait_seconds / self.completed if self.completed else 0.0
+                ),
+            }
 
 
 class Hash:
     """
     A utility class for handling password hashing and verification using bcrypt.
+
+    The async methods run bcrypt in a shared :class:`PasswordHashingPool` and should
+    be used from request handlers.
     """
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pool = PasswordHashingPool(settings.PASSWORD_HASH_WORKERS)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -45,6 +134,35 @@ class Hash:
         """
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """
+        Verify a plain text password against its hashed version without blocking the event loop.
+
+        Args:
+            plain_password (str): The plain text password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            bool: True if the password matches the hash, False otherwise.
+        """
+        return await self.pool.run(
+            self.pwd_context.verify, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Hash a plain text password using bcrypt without blocking the event loop.
+
+        Args:
+            password (str): The plain text password to hash.
+
+        Returns:
+            str: The hashed password.
+        """
+        return await self.pool.run(self.pwd_context.hash, password)
+
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -73,14 +191,17 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None) -
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_read_db)
 ):
     """
     Retrieve the current user based on the provided JWT token.
 
+    The user is served from the user cache when possible, so most authenticated
+    requests do not query the database for the user.
+
     Args:
         token (str): The JWT token provided by the user.
-        db (Session): The database session.
+        db (Session): The read database session.
 
     Returns:
         User: The authenticated user.
@@ -104,10 +225,13 @@ async def get_current_user(
     except JWTError as e:
         raise credentials_exception
 
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
+    user = await user_cache.get(username)
     if user is None:
-        raise credentials_exception
+        user_service = UserService(db)
+        user = await user_service.get_user_by_username(username)
+        if user is None:
+            raise credentials_exception
+        await user_cache.set(user)
     return user
 
 
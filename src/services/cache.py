@@ -0,0 +1,175 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.conf.config import settings
+from src.database.models import User, UserRole
+
+CACHED_USER_FIELDS = ("id", "username", "email", "created_at", "avatar", "confirmed")
+
+
+class UserCache:
+    """
+    Cache of authenticated users keyed by username.
+
+    The first tier is an in-process LRU with a TTL. When a Redis URL is configured,
+    a second tier is shared between workers, so a user loaded by one worker is not
+    loaded again by another. The local TTL bounds how long a worker can serve a user
+    that was changed through another worker.
+
+    Args:
+        ttl: Lifetime of an entry in seconds. A value of 0 disables the cache.
+        maxsize: Maximum number of entries kept in the in-process tier.
+        redis_url: Optional Redis URL for the shared tier.
+    """
+
+    key_prefix = "user:"
+
+    def __init__(self, ttl: int, maxsize: int, redis_url: str | None = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def _dump(user: User) -> dict:
+        data = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+        data["role"] = UserRole(user.role).value
+        return data
+
+    @staticmethod
+    def _load(data: dict) -> User:
+        """
+        Build a detached User from cached data.
+
+        Every call returns a new instance, so concurrent requests never share an
+        object that may be attached to their sessions. The password hash is never
+        cached and stays unloaded on the returned instance.
+        """
+        user = User(**{**data, "role": UserRole(data["role"])})
+        make_transient_to_detached(user)
+        return user
+
+    def _remember(self, username: str, data: dict) -> None:
+        self._entries[username] = (time.monotonic() + self.ttl, data)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, username: str) -> User | None:
+        """
+        Look up a user in the local tier and then in Redis.
+
+        Args:
+            username: The username of the user.
+
+        Returns:
+            A detached User instance, or None on a cache miss.
+        """
+        if self.ttl <= 0:
+            return None
+
+        entry = self._entries.get(username)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return self._load(data)
+            del self._entries[username]
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self.key_prefix + username)
+            except RedisError:
+                self.redis_errors += 1
+                raw = None
+            if raw is not None:
+                data = json.loads(raw)
+                data["created_at"] = data["created_at"] and datetime.fromisoformat(
+                    data["created_at"]
+                )
+                self._remember(username, data)
+                self.redis_hits += 1
+                return self._load(data)
+
+        self.misses += 1
+        return None
+
+    async def set(self, user: User) -> None:
+        """
+        Store a user in both tiers.
+
+        Args:
+            user: The User loaded from the database.
+        """
+        if self.ttl <= 0:
+            return
+
+        data = self._dump(user)
+        self._remember(user.username, data)
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self.key_prefix + user.username,
+                    json.dumps(data, default=datetime.isoformat),
+                    ex=self.ttl,
+                )
+            except RedisError:
+                self.redis_errors += 1
+
+    async def invalidate(self, username: str) -> None:
+        """
+        Drop a user from both tiers after it was changed.
+
+        Args:
+            username: The username of the changed user.
+        """
+        self._entries.pop(username, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(self.key_prefix + username)
+            except RedisError:
+                self.redis_errors += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry from the in-process tier.
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters of the cache.
+
+        Returns:
+            dict: Counters and the current size of the in-process tier.
+        """
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "redis_errors": self.redis_errors,
+        }
+
+
+user_cache = UserCache(
+    settings.USER_CACHE_TTL, settings.USER_CACHE_MAXSIZE, settings.REDIS_URL
+)
@@ -1,8 +1,15 @@
-from typing import Optional
+from datetime import datetime
+from typing import BinaryIO, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.repository.contacts import ContactRepository
+from src.repository.contacts import CONTACT_EXPORT_FIELDS, ContactRepository
 from src.schemas import ContactBase, ContactUpdate
 from src.database.models import Contact, User
+from src.services.pagination import decode_cursor
+from src.services.contacts_io import (
+    read_import_chunks,
+    serialize_export,
+    validate_import_row,
+)
 
 
 class ContactService:
@@ -29,7 +36,70 @@ class ContactService:
         """
         return await self.contact_repository.create_contact(body, user)
 
-    async def get_contacts(self, skip: int, limit: int, filters: dict, user: User):
+    async def import_contacts(
+        self, fileobj: BinaryIO, fmt: str, user: User, batch_size: int, max_errors: int
+    ) -> dict:
+        """
+        Import contacts from a CSV or NDJSON file in batches.
+
+        Each batch is validated against ContactImportRow and inserted with one statement;
+        invalid rows are skipped and reported.
+
+        Args:
+            fileobj (BinaryIO): The uploaded file.
+            fmt (str): ``"csv"`` or ``"ndjson"``.
+            user: The user to whom the contacts will belong.
+            batch_size (int): Number of rows per insert.
+            max_errors (int): Maximum number of row errors kept in the report.
+
+        Returns:
+            dict: The numbers of inserted and failed rows and the row errors.
+        """
+        report = {"inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+        async for chunk in read_import_chunks(fileobj, fmt, batch_size):
+            valid_rows = []
+            for number, record in chunk:
+                contact, errors = validate_import_row(record)
+                if contact is not None:
+                    valid_rows.append(contact)
+                    continue
+                report["failed"] += 1
+                if len(report["errors"]) < max_errors:
+                    report["errors"].append({"row": number, "errors": errors})
+                else:
+                    report["errors_truncated"] = True
+            report["inserted"] += await self.contact_repository.bulk_create_contacts(
+                valid_rows, user
+            )
+        return report
+
+    async def export_contacts(self, user: User, fmt: str, batch_size: int):
+        """
+        Stream all contacts of the given user as NDJSON or CSV.
+
+        Args:
+            user: The user to whom the contacts belong.
+            fmt (str): ``"ndjson"`` or ``"csv"``.
+            batch_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            str: The next piece of the export.
+        """
+        rows = self.contact_repository.stream_contacts(user, batch_size)
+        async for chunk in serialize_export(
+            rows, fmt, CONTACT_EXPORT_FIELDS, batch_size
+        ):
+            yield chunk
+
+    async def get_contacts(
+        self,
+        skip: int,
+        limit: int,
+        filters: dict,
+        user: User,
+        cursor: Optional[str] = None,
+        as_rows: bool = False,
+    ):
         """
         Retrieve a list of contacts for the given user with filters applied.
 
@@ -38,13 +108,39 @@ class ContactService:
             limit (int): Number of records to fetch.
             filters (dict): Filters to apply to the query.
             user: The user to whom the contacts belong.
+            cursor (Optional[str]): Opaque cursor of the previous page; when given,
+                keyset pagination is used instead of ``skip``.
+            as_rows (bool): Return plain dictionaries instead of Contact objects.
 
         Returns:
-            List[Contact]: List of retrieved contacts.
+            List[Contact] | List[dict]: List of retrieved contacts.
+
+        Raises:
+            ValueError: If the cursor is malformed.
         """
-        return await self.contact_repository.get_contacts(
-            skip=skip, limit=limit, filters=filters, user=user
+        after_id = decode_cursor(cursor) if cursor else None
+        get_page = (
+            self.contact_repository.get_contact_rows
+            if as_rows
+            else self.contact_repository.get_contacts
         )
+        return await get_page(
+            skip=skip, limit=limit, filters=filters, user=user, after_id=after_id
+        )
+
+    async def search_contacts(self, query: str, user: User, limit: int):
+        """
+        Search the user's contacts across name, email and phone fields.
+
+        Args:
+            query (str): The search string.
+            user: The user to whom the contacts belong.
+            limit (int): Number of records to fetch.
+
+        Returns:
+            List[Contact]: Matching contacts, best matches first.
+        """
+        return await self.contact_repository.search_contacts(query, user, limit)
 
     async def get_contact(self, contact_id: int, user: User):
         """
@@ -59,7 +155,25 @@ class ContactService:
         """
         return await self.contact_repository.get_contact_by_id(contact_id, user)
 
-    async def update_contact(self, contact_id: int, body: ContactUpdate, user: User):
+    async def get_contacts_version(self, user: User):
+        """
+        Return the contact count and latest update time for the given user.
+
+        Args:
+            user: The user to whom the contacts belong.
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The count and the latest ``updated_at``.
+        """
+        return await self.contact_repository.get_contacts_version(user)
+
+    async def update_contact(
+        self,
+        contact_id: int,
+        body: ContactUpdate,
+        user: User,
+        if_updated_at: Optional[List[datetime]] = None,
+    ):
         """
         Update a contact by its ID for the given user.
 
@@ -67,11 +181,15 @@ class ContactService:
             contact_id (int): ID of the contact to update.
             body (ContactUpdate): Data to update the contact.
             user: The user to whom the contact belongs.
+            if_updated_at (Optional[List[datetime]]): ``updated_at`` values the
+                contact must still have for the update to apply.
 
         Returns:
             Optional[Contact]: The updated contact object if found, else None.
         """
-        return await self.contact_repository.update_contact(contact_id, body, user)
+        return await self.contact_repository.update_contact(
+            contact_id, body, user, if_updated_at
+        )
 
     async def remove_contact(self, contact_id: int, user: User):
         """
@@ -86,20 +204,73 @@ class ContactService:
         """
         return await self.contact_repository.remove_contact(contact_id, user)
 
-    async def get_upcoming_birthdays(self, user: User):
+    async def bulk_delete_contacts(
+        self,
+        user: User,
+        limit: int,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+    ) -> List[int]:
         """
-        Retrieve contacts with upcoming birthdays within the next 7 days for the given user.
+        Delete contacts of the given user selected by IDs or filters.
 
         Args:
             user: The user to whom the contacts belong.
+            limit (int): Maximum number of contacts deleted by one call.
+            ids (Optional[List[int]]): IDs of the contacts to delete.
+            filters (Optional[dict]): Filters used when no IDs are given.
+
+        Returns:
+            List[int]: IDs of the deleted contacts.
+        """
+        return await self.contact_repository.bulk_delete_contacts(
+            user, limit, ids, filters
+        )
+
+    async def bulk_update_contacts(
+        self,
+        user: User,
+        values: dict,
+        limit: int,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+    ) -> List[int]:
+        """
+        Set the same field values on contacts of the given user.
+
+        Args:
+            user: The user to whom the contacts belong.
+            values (dict): Field values to set.
+            limit (int): Maximum number of contacts updated by one call.
+            ids (Optional[List[int]]): IDs of the contacts to update.
+            filters (Optional[dict]): Filters used when no IDs are given.
+
+        Returns:
+            List[int]: IDs of the updated contacts.
+        """
+        return await self.contact_repository.bulk_update_contacts(
+            user, values, limit, ids, filters
+        )
+
+    async def get_upcoming_birthdays(self, user: User, days: int = 7):
+        """
+        Retrieve contacts with upcoming birthdays within the next ``days`` days for the given user.
+
+        Args:
+            user: The user to whom the contacts belong.
+            days (int): The size of the window in days.
 
         Returns:
             List[Contact]: List of contacts with upcoming birthdays.
         """
-        return await self.contact_repository.get_upcoming_birthdays(user)
+        return await self.contact_repository.get_upcoming_birthdays(user, days)
 
     async def update_phone(
-        self, contact_id: int, phone: str, user: User
+        self,
+        contact_id: int,
+        phone: str,
+        user: User,
+        if_updated_at: Optional[List[datetime]] = None,
     ) -> Optional[Contact]:
         """
         Update the phone number of a contact for the given user.
@@ -108,14 +279,22 @@ class ContactService:
             contact_id (int): ID of the contact to update.
             phone (str): New phone number.
             user: The user to whom the contact belongs.
+            if_updated_at (Optional[List[datetime]]): ``updated_at`` values the
+                contact must still have for the update to apply.
 
         Returns:
             Optional[Contact]: The updated contact object if found, else None.
         """
-        return await self.contact_repository.update_phone(contact_id, phone, user)
+        return await self.contact_repository.update_phone(
+            contact_id, phone, user, if_updated_at
+        )
 
     async def update_email(
-        self, contact_id: int, email: str, user: User
+        self,
+        contact_id: int,
+        email: str,
+        user: User,
+        if_updated_at: Optional[List[datetime]] = None,
     ) -> Optional[Contact]:
         """
         Update the email of a contact for the given user.
@@ -124,8 +303,12 @@ class ContactService:
             contact_id (int): ID of the contact to update.
             email (str): New email address.
             user: The user to whom the contact belongs.
+            if_updated_at (Optional[List[datetime]]): ``updated_at`` values the
+                contact must still have for the update to apply.
 
         Returns:
             Optional[Contact]: The updated contact object if found, else None.
         """
-        return await self.contact_repository.update_email(contact_id, email, user)
+        return await self.contact_repository.update_email(
+            contact_id, email, user, if_updated_at
+        )
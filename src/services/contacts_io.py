@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+from datetime import date
+from itertools import islice
+from typing import AsyncIterator, BinaryIO, Iterator, List, Mapping, Optional
+
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from src.schemas import ContactImportRow, ContactResponse
+
+IMPORT_FORMATS = ("csv", "ndjson")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Built once: creating a TypeAdapter compiles its validator and serializer.
+CONTACT_LIST_ADAPTER = TypeAdapter(List[ContactResponse])
+
+
+def detect_import_format(
+    filename: Optional[str], content_type: Optional[str]
+) -> Optional[str]:
+    """
+    Guess the format of an uploaded contacts file.
+
+    Args:
+        filename (Optional[str]): Name of the uploaded file.
+        content_type (Optional[str]): Content type of the uploaded file.
+
+    Returns:
+        Optional[str]: ``"csv"``, ``"ndjson"`` or None if the format is unknown.
+    """
+    filename = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if filename.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if filename.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return "ndjson"
+    return None
+
+
+def iter_import_rows(fileobj: BinaryIO, fmt: str) -> Iterator[tuple[int, object]]:
+    """
+    Read records from a CSV or NDJSON file one at a time.
+
+    Args:
+        fileobj (BinaryIO): The uploaded file.
+        fmt (str): ``"csv"`` or ``"ndjson"``.
+
+    Yields:
+        tuple[int, object]: The 1-based record number and the decoded record. Records
+        that cannot be decoded are yielded as a ``ValueError``.
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, {key: value for key, value in row.items() if value}
+        return
+
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, ValueError("Invalid JSON")
+
+
+def validate_import_row(record: object) -> tuple[Optional[dict], list[str]]:
+    """
+    Validate a decoded record against :class:`ContactImportRow`.
+
+    Args:
+        record (object): A record produced by :func:`iter_import_rows`.
+
+    Returns:
+        tuple[Optional[dict], list[str]]: The contact fields, or None and the list of
+        validation errors.
+    """
+    if isinstance(record, ValueError):
+        return None, [str(record)]
+    if not isinstance(record, dict):
+        return None, ["Row must be an object"]
+    try:
+        return ContactImportRow.model_validate(record).model_dump(), []
+    except ValidationError as e:
+        return None, [
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        ]
+
+
+async def read_import_chunks(fileobj: BinaryIO, fmt: str, chunk_size: int):
+    """
+    Read an uploaded file in chunks of records without blocking the event loop.
+
+    Only one chunk is held in memory at a time.
+
+    Args:
+        fileobj (BinaryIO): The uploaded file.
+        fmt (str): ``"csv"`` or ``"ndjson"``.
+        chunk_size (int): The number of records per chunk.
+
+    Yields:
+        list[tuple[int, object]]: The next chunk of records.
+    """
+    rows = iter_import_rows(fileobj, fmt)
+    while True:
+        chunk = await run_in_threadpool(lambda: list(islice(rows, chunk_size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def serialize_export(
+    rows: AsyncIterator[Mapping], fmt: str, fields: tuple[str, ...], chunk_rows: int
+) -> AsyncIterator[str]:
+    """
+    Serialize streamed contact rows into NDJSON or CSV text chunks.
+
+    Rows are buffered ``chunk_rows`` at a time so the response is written in
+    reasonably sized pieces instead of one write per contact.
+
+    Args:
+        rows (AsyncIterator[Mapping]): Contact rows from the repository.
+        fmt (str): ``"ndjson"`` or ``"csv"``.
+        fields (tuple[str, ...]): Field names, used as the CSV header.
+        chunk_rows (int): The number of rows per yielded chunk.
+
+    Yields:
+        str: The next piece of the export.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(fields)
+
+    buffered = 0
+    async for row in rows:
+        if writer is not None:
+            writer.writerow(row[field] for field in fields)
+        else:
+            buffer.write(json.dumps(dict(row), default=_json_default))
+            buffer.write("\n")
+        buffered += 1
+        if buffered >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            buffered = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def dump_contact_list(rows: List[dict]) -> bytes:
+    """
+    Validate contact rows against :class:`ContactResponse` and encode them as a
+    JSON array.
+
+    Each row is validated once and serialized by pydantic-core, instead of the
+    response model validation, ``jsonable_encoder`` and ``json.dumps`` passes of
+    a regular FastAPI response.
+
+    Args:
+        rows (List[dict]): Contacts from ``ContactRepository.get_contact_rows``.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    return CONTACT_LIST_ADAPTER.dump_json(CONTACT_LIST_ADAPTER.validate_python(rows))
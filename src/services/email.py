@@ -1,12 +1,13 @@
 from pathlib import Path
 
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
-from pydantic import EmailStr
 
-from src.services.auth import create_email_token
+from src.services.auth import create_access_token, create_email_token
 from src.conf.config import settings
 
+VERIFY_EMAIL = "verify_email"
+PASSWORD_RESET = "password_reset"
+
 conf = ConnectionConfig(
     MAIL_USERNAME=settings.MAIL_USERNAME,
     MAIL_PASSWORD=settings.MAIL_PASSWORD,
@@ -22,30 +23,62 @@ conf = ConnectionConfig(
 )
 
 
-async def send_email(email: EmailStr, username: str, host: str):
+async def build_message(
+    kind: str, recipient: str, payload: dict
+) -> tuple[MessageSchema, str]:
     """
-    Send an email.
+    Build an email from an outbox entry.
+
+    Tokens are created here, when the email is sent, so they are never stored in
+    the outbox.
 
     Args:
-        email (EmailSchema): Email details to be sent.
+        kind: ``VERIFY_EMAIL`` or ``PASSWORD_RESET``.
+        recipient: The email address of the recipient.
+        payload: The ``username`` and ``host`` of the request that queued the email.
 
     Returns:
-        None
+        The message and the name of its template.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if kind == VERIFY_EMAIL:
+        subject = "Confirm your email"
+        template_name = "verify_email.html"
+        token = create_email_token({"sub": recipient})
+    elif kind == PASSWORD_RESET:
+        subject = "Запит на скидання пароля"
+        template_name = "reset_password.html"
+        token = await create_access_token(data={"sub": recipient})
+    else:
+        raise ValueError(f"Unknown email kind: {kind}")
+
+    message = MessageSchema(
+        subject=subject,
+        recipients=[recipient],
+        template_body={
+            "host": payload["host"],
+            "username": payload["username"],
+            "token": token,
+        },
+        subtype=MessageType.html,
+    )
+    return message, template_name
+
+
+async def send_email(mailer: FastMail, kind: str, recipient: str, payload: dict):
+    """
+    Send an email from an outbox entry.
+
+    Args:
+        mailer: The FastMail instance used to send.
+        kind: ``VERIFY_EMAIL`` or ``PASSWORD_RESET``.
+        recipient: The email address of the recipient.
+        payload: Template values of the email.
+
+    Raises:
+        fastapi_mail.errors.ConnectionErrors: If the SMTP server cannot be reached.
     """
-    try:
-        token_verification = create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
-        )
-
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        print(err)
+    message, template_name = await build_message(kind, recipient, payload)
+    await mailer.send_message(message, template_name=template_name)
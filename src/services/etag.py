@@ -0,0 +1,121 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from src.database.models import Contact
+
+VERSION_FORMAT = "%Y%m%d%H%M%S%f"
+
+
+def contact_etag(contact: Contact) -> str:
+    """
+    Build the weak ETag of a contact from its ID and ``updated_at``.
+
+    Args:
+        contact: The contact.
+
+    Returns:
+        str: The ETag, e.g. ``W/"42.20240101120000123000"``.
+    """
+    return f'W/"{contact.id}.{contact.updated_at.strftime(VERSION_FORMAT)}"'
+
+
+def contacts_list_etag(
+    user_id: int,
+    count: int,
+    last_updated_at: Optional[datetime],
+    params: Iterable[tuple[str, str]],
+) -> str:
+    """
+    Build the weak ETag of a contact list.
+
+    The ETag covers the number of contacts of the user and their latest update
+    time, which change on every write, and the query parameters of the request.
+
+    Args:
+        user_id: ID of the user who owns the contacts.
+        count: Number of contacts of the user.
+        last_updated_at: Latest ``updated_at`` of the contacts.
+        params: Query parameters of the request.
+
+    Returns:
+        str: The ETag.
+    """
+    version = last_updated_at.strftime(VERSION_FORMAT) if last_updated_at else "-"
+    digest = hashlib.sha1(
+        repr((user_id, count, version, sorted(params))).encode()
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def parse_etags(header: str) -> List[str]:
+    """
+    Split an ``If-Match`` or ``If-None-Match`` header into opaque tags.
+
+    The weak indicator is dropped, as both headers are compared weakly here.
+
+    Args:
+        header: The header value.
+
+    Returns:
+        List[str]: The opaque tags, or ``["*"]`` for a wildcard.
+    """
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag.strip('"'))
+    return tags
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Check whether an ``If-None-Match`` header matches an ETag.
+
+    Args:
+        header: The header value, or None if it was not sent.
+        etag: The current ETag of the resource.
+
+    Returns:
+        bool: True if the client already has the current representation.
+    """
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return "*" in tags or parse_etags(etag)[0] in tags
+
+
+def if_match_versions(
+    header: Optional[str], contact_id: int
+) -> Optional[List[datetime]]:
+    """
+    Extract the ``updated_at`` values of a contact from an ``If-Match`` header.
+
+    ``If-Match`` requires a strong comparison, but contacts only have weak ETags;
+    they are matched by value so that clients can send back the ETag they got.
+
+    Args:
+        header: The header value, or None if it was not sent.
+        contact_id: The ID of the contact being updated.
+
+    Returns:
+        The ``updated_at`` values the contact may have for the update to apply
+        (empty if no tag can match), or None if there is no precondition.
+    """
+    if not header:
+        return None
+    tags = parse_etags(header)
+    if "*" in tags:
+        return None
+    versions = []
+    for tag in tags:
+        tag_id, _, version = tag.partition(".")
+        if tag_id != str(contact_id):
+            continue
+        try:
+            versions.append(datetime.strptime(version, VERSION_FORMAT))
+        except ValueError:
+            continue
+    return versions
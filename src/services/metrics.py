@@ -0,0 +1,65 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests by route.",
+    ["method", "route"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed.",
+    ["method"],
+)
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "HTTP responses by route and status code.",
+    ["method", "route", "status"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware that records request latency, in-flight requests and status
+    codes.
+
+    Requests are labelled with the route template (``/api/contacts/{contact_id}``)
+    rather than the raw path, so the number of label values stays bounded. Requests
+    that match no route share a single label.
+
+    Args:
+        app: The ASGI application to wrap.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            route = scope.get("route")
+            route = route.path if route is not None else UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS_TOTAL.labels(method, route, str(status_code)).inc()
@@ -0,0 +1,229 @@
+"""
+Email outbox: queue emails with the database change that triggers them and send
+them from a separate worker process.
+
+Run the worker with::
+
+    python -m src.services.outbox
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.database.models import EmailOutbox
+from src.repository.outbox import OutboxRepository, utcnow
+from src.services.email import PASSWORD_RESET, VERIFY_EMAIL, conf, send_email
+from src.services.smtp_pool import PooledFastMail
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+class OutboxService:
+    """
+    Service class to queue emails in the outbox.
+
+    Args:
+        db (AsyncSession): The database session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.outbox_repository = OutboxRepository(db)
+
+    def queue_verification_email(self, email: str, username: str, host: str):
+        """
+        Queue an email verification message; it is written by the next commit.
+
+        Args:
+            email (str): Email address of the user.
+            username (str): Username of the user.
+            host (str): Base URL of the API for the verification link.
+        """
+        self.outbox_repository.add(
+            VERIFY_EMAIL, email, {"username": username, "host": str(host)}
+        )
+
+    def queue_password_reset_email(self, email: str, username: str, host: str):
+        """
+        Queue a password reset message; it is written by the next commit.
+
+        Args:
+            email (str): Email address of the user.
+            username (str): Username of the user.
+            host (str): Base URL of the API for the reset link.
+        """
+        self.outbox_repository.add(
+            PASSWORD_RESET, email, {"username": username, "host": str(host)}
+        )
+
+    async def commit(self):
+        """
+        Write the queued emails.
+        """
+        await self.db.commit()
+
+
+class OutboxWorker:
+    """
+    Send emails from the outbox in batches.
+
+    Each batch is claimed in one statement, sent concurrently and recorded in one
+    transaction. A failed email is retried with exponential backoff until it has
+    been attempted ``max_attempts`` times.
+
+    Args:
+        session_factory: Callable returning an async session context manager.
+        send: Coroutine function sending one EmailOutbox entry.
+        batch_size: Maximum number of emails claimed at once.
+        concurrency: Maximum number of emails sent at the same time.
+        max_attempts: Attempts before an email is marked as failed.
+        backoff_seconds: Delay before the first retry; doubled for every retry.
+        lease_seconds: How long a claimed batch is reserved for this worker.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        send: Callable[[EmailOutbox], Awaitable[None]],
+        batch_size: int = settings.EMAIL_OUTBOX_BATCH_SIZE,
+        concurrency: int = settings.EMAIL_OUTBOX_CONCURRENCY,
+        max_attempts: int = settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        backoff_seconds: float = settings.EMAIL_OUTBOX_BACKOFF_SECONDS,
+        lease_seconds: float = settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.send = send
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.lease_seconds = lease_seconds
+        self.sent = 0
+        self.failed = 0
+
+    def retry_at(self, attempts: int) -> Optional[datetime]:
+        """
+        Return when an email that failed ``attempts`` times is retried.
+
+        Args:
+            attempts: The number of attempts made so far.
+
+        Returns:
+            The time of the next attempt, or None if the email gives up.
+        """
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.backoff_seconds * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+        return utcnow() + timedelta(seconds=delay)
+
+    async def _attempt(self, semaphore: asyncio.Semaphore, message: EmailOutbox):
+        async with semaphore:
+            try:
+                await self.send(message)
+            except Exception as e:
+                logger.warning("Sending email %d failed: %r", message.id, e)
+                return e
+        return None
+
+    async def run_once(self) -> tuple[int, int]:
+        """
+        Claim and send one batch.
+
+        Returns:
+            tuple[int, int]: The number of sent and failed emails.
+        """
+        async with self.session_factory() as session:
+            repository = OutboxRepository(session)
+            messages = await repository.claim_batch(self.batch_size, self.lease_seconds)
+            if not messages:
+                return 0, 0
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            errors = await asyncio.gather(
+                *(self._attempt(semaphore, message) for message in messages)
+            )
+            sent_ids = [m.id for m, error in zip(messages, errors) if error is None]
+            failures = [
+                (m.id, repr(error), self.retry_at(m.attempts))
+                for m, error in zip(messages, errors)
+                if error is not None
+            ]
+            await repository.record_results(sent_ids, failures)
+
+        self.sent += len(sent_ids)
+        self.failed += len(failures)
+        return len(sent_ids), len(failures)
+
+    async def run(
+        self,
+        poll_seconds: float = settings.EMAIL_OUTBOX_POLL_SECONDS,
+        stop: Optional[asyncio.Event] = None,
+    ) -> None:
+        """
+        Send batches until ``stop`` is set, logging the throughput of each batch.
+
+        A full batch is followed by the next one right away; otherwise the worker
+        waits ``poll_seconds`` for new emails.
+
+        Args:
+            poll_seconds: Delay between polls of an empty outbox.
+            stop: Optional event that ends the loop.
+        """
+        stop = stop or asyncio.Event()
+        started = time.perf_counter()
+        while not stop.is_set():
+            batch_started = time.perf_counter()
+            sent, failed = await self.run_once()
+            if sent or failed:
+                elapsed = time.perf_counter() - batch_started
+                logger.info(
+                    "Batch: %d sent, %d failed in %.2fs (%.1f emails/s); "
+                    "total %d sent, %d failed (%.1f emails/s)",
+                    sent,
+                    failed,
+                    elapsed,
+                    (sent + failed) / elapsed,
+                    self.sent,
+                    self.failed,
+                    (self.sent + self.failed) / (time.perf_counter() - started),
+                )
+            if sent + failed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def main(once: bool) -> None:
+    mailer = PooledFastMail(conf)
+
+    async def send(message: EmailOutbox) -> None:
+        await send_email(mailer, message.kind, message.recipient, message.payload)
+
+    worker = OutboxWorker(sessionmanager.session, send)
+    try:
+        if once:
+            sent, failed = await worker.run_once()
+            logger.info("%d sent, %d failed", sent, failed)
+        else:
+            await worker.run()
+    finally:
+        await mailer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send emails from the outbox.")
+    parser.add_argument("--once", action="store_true", help="Send one batch and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main(args.once))
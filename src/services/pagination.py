@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+
+MAX_ID = 2**63 - 1
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the position after the last row of a page into an opaque cursor.
+
+    Args:
+        last_id (int): ID of the last contact on the page.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): The cursor received from the client.
+
+    Returns:
+        int: ID of the last contact of the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    # bool is an int subclass, and IDs beyond BIGINT cannot be bound.
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    if not 0 <= last_id <= MAX_ID:
+        raise ValueError("Invalid cursor")
+    return last_id
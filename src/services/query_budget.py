@@ -0,0 +1,151 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+from src.conf.config import settings
+from src.database.instrumentation import RequestQueries, request_queries
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryBudgetViolation:
+    """
+    A request that ran more statements than its route allows, or repeated one
+    statement often enough to look like an N+1 query.
+    """
+
+    method: str
+    route: str
+    kind: str
+    count: int
+    limit: int
+    statement: str | None = None
+
+
+violations: deque[QueryBudgetViolation] = deque(maxlen=100)
+
+
+def query_budget(max_queries: int | None, check_repeats: bool = True):
+    """
+    Declare how many SQL statements a route may run per request.
+
+    Apply it below the router decorator::
+
+        @router.get("/me")
+        @query_budget(1)
+        async def me(...): ...
+
+    Args:
+        max_queries: The maximum number of statements, or None for no limit.
+        check_repeats: Whether repeated statements are reported as possible N+1
+            queries. Disable it for routes that write in batches.
+    """
+
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        endpoint.check_query_repeats = check_repeats
+        return endpoint
+
+    return decorator
+
+
+def format_server_timing(queries: RequestQueries) -> str:
+    """
+    Format the statements of a request as a ``Server-Timing`` header value.
+
+    Args:
+        queries: The statements of the request.
+
+    Returns:
+        str: The header value, with the database time in milliseconds.
+    """
+    return f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} queries"'
+
+
+def check_budget(method: str, route, queries: RequestQueries) -> None:
+    """
+    Log and record a request that exceeded its query budget or repeated a
+    statement more than ``QUERY_REPEAT_THRESHOLD`` times.
+
+    Args:
+        method: The HTTP method.
+        route: The matched route, or None.
+        queries: The statements of the request.
+    """
+    path = route.path if route is not None else "unmatched"
+    endpoint = getattr(route, "endpoint", None)
+    budget = getattr(endpoint, "query_budget", settings.QUERY_BUDGET_DEFAULT)
+    if budget is not None and queries.count > budget:
+        logger.warning(
+            "%s %s ran %d queries, budget is %d",
+            method,
+            path,
+            queries.count,
+            budget,
+        )
+        violations.append(
+            QueryBudgetViolation(method, path, "budget", queries.count, budget)
+        )
+
+    if not queries.statements or not getattr(endpoint, "check_query_repeats", True):
+        return
+    statement, repeats = queries.statements.most_common(1)[0]
+    if repeats > settings.QUERY_REPEAT_THRESHOLD:
+        logger.warning(
+            "%s %s ran the same statement %d times (possible N+1): %s",
+            method,
+            path,
+            repeats,
+            statement,
+        )
+        violations.append(
+            QueryBudgetViolation(
+                method,
+                path,
+                "n+1",
+                repeats,
+                settings.QUERY_REPEAT_THRESHOLD,
+                statement,
+            )
+        )
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI middleware that counts the SQL statements and database time of each
+    request.
+
+    The totals so far are sent in a ``Server-Timing`` header when the response
+    starts. Statements run after that (streamed bodies, dependency teardown) only
+    count towards the budget check, which runs once the response is complete.
+
+    Args:
+        app: The ASGI application to wrap.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", format_server_timing(queries).encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_queries.set(queries)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_queries.reset(token)
+            check_budget(scope["method"], scope.get("route"), queries)
@@ -0,0 +1,253 @@
+"""
+Sliding-window rate limiting shared between workers through Redis.
+
+Every allowed request is a member of a sorted set scored by its timestamp, so the
+limit applies to any window of the configured length, not to fixed buckets.
+Without Redis, or while Redis fails, limits are kept in process memory.
+"""
+
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request, Response
+from jose import JWTError, jwt
+from prometheus_client import Histogram
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_CHECK_DURATION = Histogram(
+    "rate_limit_check_duration_seconds",
+    "Time spent checking rate limits.",
+    ["limit", "outcome"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1),
+)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    Parse a rate such as ``"5/minute"`` or ``"100/hour"``.
+
+    Args:
+        rate: The number of requests and the period, separated by a slash.
+
+    Returns:
+        tuple[int, int]: The limit and the window in seconds.
+
+    Raises:
+        ValueError: If the rate cannot be parsed.
+    """
+    count, _, period = rate.partition("/")
+    period = period.strip().rstrip("s")
+    if not count.strip().isdigit() or period not in PERIODS:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    return int(count), PERIODS[period]
+
+
+@dataclass
+class RateLimitResult:
+    """
+    The outcome of a rate limit check.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised by a rate limit dependency when a client is over its limit.
+    """
+
+    def __init__(self, result: RateLimitResult):
+        super().__init__(f"Rate limit of {result.limit} requests exceeded")
+        self.result = result
+
+
+class SlidingWindowLimiter:
+    """
+    A sliding-window log limiter.
+
+    A check removes timestamps older than the window, adds the current request
+    and counts the set in one pipelined round trip. A rejected request is removed
+    again, so clients that keep retrying are let through as soon as their oldest
+    allowed request leaves the window.
+
+    Args:
+        redis_url: Optional Redis URL. Without it limits are per process.
+        prefix: Prefix of the Redis keys.
+        max_keys: Size above which expired in-memory windows are swept.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        prefix: str = "ratelimit:",
+        max_keys: int = 10_000,
+    ):
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
+        self.prefix = prefix
+        self.max_keys = max_keys
+        self._windows: dict[str, tuple[int, deque[float]]] = {}
+        self.allowed = 0
+        self.rejected = 0
+        self.redis_errors = 0
+
+    async def _hit_redis(
+        self, key: str, limit: int, window: int, now: float
+    ) -> RateLimitResult:
+        key = self.prefix + key
+        member = f"{now:.6f}:{uuid.uuid4().hex}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(key, 0, now - window)
+            pipe.zadd(key, {member: now})
+            pipe.zcard(key)
+            pipe.zrange(key, 0, 0, withscores=True)
+            pipe.expire(key, window)
+            _, _, count, oldest, _ = await pipe.execute()
+
+        if count <= limit:
+            return RateLimitResult(True, limit, limit - count, 0.0)
+        await self._redis.zrem(key, member)
+        return RateLimitResult(False, limit, 0, oldest[0][1] + window - now)
+
+    def _hit_memory(
+        self, key: str, limit: int, window: int, now: float
+    ) -> RateLimitResult:
+        if len(self._windows) > self.max_keys:
+            self._sweep(now)
+        _, hits = self._windows.setdefault(key, (window, deque()))
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return RateLimitResult(False, limit, 0, hits[0] + window - now)
+        hits.append(now)
+        return RateLimitResult(True, limit, limit - len(hits), 0.0)
+
+    def _sweep(self, now: float) -> None:
+        for key, (window, hits) in list(self._windows.items()):
+            if not hits or hits[-1] <= now - window:
+                del self._windows[key]
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """
+        Count a request of a client and check it against the limit.
+
+        Args:
+            key: Identifies the limit and the client, e.g. ``login:ip:1.2.3.4``.
+            limit: The number of requests allowed per window.
+            window: The window in seconds.
+
+        Returns:
+            RateLimitResult: Whether the request is allowed.
+        """
+        now = time.time()
+        result = None
+        if self._redis is not None:
+            try:
+                result = await self._hit_redis(key, limit, window, now)
+            except RedisError as e:
+                self.redis_errors += 1
+                logger.warning("Rate limiting falls back to memory: %r", e)
+        if result is None:
+            result = self._hit_memory(key, limit, window, now)
+
+        if result.allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return result
+
+    def reset(self) -> None:
+        """
+        Drop every in-memory window.
+        """
+        self._windows.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the counters of the limiter.
+        """
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "redis_errors": self.redis_errors,
+            "memory_keys": len(self._windows),
+        }
+
+
+rate_limiter = SlidingWindowLimiter(settings.REDIS_URL)
+
+
+def client_identity(request: Request) -> str:
+    """
+    Identify the client a limit applies to.
+
+    Requests with a valid bearer token are limited per user, so users behind one
+    address do not share a limit; other requests are limited per address.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        str: ``user:<username>`` or ``ip:<address>``.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(
+                token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+            )
+        except JWTError:
+            payload = {}
+        if payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit(name: str, rate: str):
+    """
+    Build a dependency that limits a route.
+
+    Successful responses carry ``X-RateLimit-Limit`` and ``X-RateLimit-Remaining``
+    headers, and the time spent in the check is added to ``Server-Timing``.
+
+    Args:
+        name: Name of the limit; routes with the same name share it.
+        rate: The rate, e.g. ``"5/minute"``.
+
+    Raises:
+        RateLimitExceeded: From the dependency when the client is over the limit.
+    """
+    limit, window = parse_rate(rate)
+
+    async def dependency(request: Request, response: Response):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        started = time.perf_counter()
+        result = await rate_limiter.hit(
+            f"{name}:{client_identity(request)}", limit, window
+        )
+        elapsed = time.perf_counter() - started
+        RATE_LIMIT_CHECK_DURATION.labels(
+            name, "allowed" if result.allowed else "rejected"
+        ).observe(elapsed)
+        if not result.allowed:
+            raise RateLimitExceeded(result)
+        response.headers["X-RateLimit-Limit"] = str(result.limit)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["Server-Timing"] = f"ratelimit;dur={elapsed * 1000:.2f}"
+
+    return dependency
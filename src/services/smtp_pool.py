@@ -0,0 +1,302 @@
+"""
+Long-lived SMTP connections shared between outgoing emails.
+
+``FastMail.send_message`` opens a connection (with its TLS handshake and login)
+for every email and closes it afterwards. ``PooledFastMail`` keeps up to
+``size`` logged-in connections open and sends each email over an idle one.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, make_msgid
+from typing import Optional
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+from fastapi_mail.errors import ConnectionErrors, PydanticClassRequired
+from fastapi_mail.fastmail import email_dispatched
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def build_message(message: MessageSchema, sender: str) -> EmailMessage:
+    """
+    Build the email for a message with the standard library.
+
+    It carries the same headers and parts as the messages FastMail builds, without
+    relying on fastapi-mail internals.
+
+    Args:
+        message: The message, with ``template_body`` already rendered if a
+            template is used.
+        sender: The ``From`` address.
+
+    Returns:
+        EmailMessage: The email to send.
+    """
+    msg = EmailMessage()
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid()
+    msg["To"] = ", ".join(message.recipients)
+    msg["From"] = sender
+    if message.subject:
+        msg["Subject"] = message.subject
+    if message.cc:
+        msg["Cc"] = ", ".join(message.cc)
+    # aiosmtplib sends to Bcc recipients and strips the header.
+    if message.bcc:
+        msg["Bcc"] = ", ".join(message.bcc)
+    if message.reply_to:
+        msg["Reply-To"] = ", ".join(message.reply_to)
+    for name, value in (message.headers or {}).items():
+        msg[name] = value
+
+    subtype = message.subtype.value
+    text = message.template_body if message.template_body else message.body
+    msg.set_content(text or "", subtype=subtype, charset=message.charset)
+    if message.alternative_body is not None:
+        msg.add_alternative(
+            message.alternative_body,
+            subtype="html" if subtype == "plain" else "plain",
+            charset=message.charset,
+        )
+
+    for upload, meta in message.attachments:
+        meta = meta or {}
+        if "mime_type" in meta and "mime_subtype" in meta:
+            maintype, subtype = meta["mime_type"], meta["mime_subtype"]
+        else:
+            maintype, subtype = "application", "octet-stream"
+        content = await upload.read()
+        await upload.close()
+        msg.add_attachment(
+            content, maintype=maintype, subtype=subtype, filename=upload.filename
+        )
+        part = msg.get_payload()[-1]
+        for name, value in meta.get("headers", {}).items():
+            if name.lower() in part:
+                part.replace_header(name, value)
+            else:
+                part[name] = value
+    return msg
+
+
+class SMTPConnectionPool:
+    """
+    A pool of SMTP connections.
+
+    Connections idle for longer than ``idle_timeout`` are closed instead of
+    reused, as servers drop idle clients. A connection idle for longer than
+    ``health_check_seconds`` is checked with ``NOOP`` before it is reused and
+    replaced if the server no longer answers.
+
+    Args:
+        config: The connection settings.
+        size: Maximum number of open connections.
+        idle_timeout: Seconds after which an idle connection is closed.
+        health_check_seconds: Idle seconds after which a connection is checked.
+    """
+
+    def __init__(
+        self,
+        config: ConnectionConfig,
+        size: int = settings.MAIL_POOL_SIZE,
+        idle_timeout: float = settings.MAIL_POOL_IDLE_TIMEOUT,
+        health_check_seconds: float = settings.MAIL_POOL_HEALTH_CHECK_SECONDS,
+    ):
+        self.config = config
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_seconds = health_check_seconds
+        self._idle: deque[tuple[aiosmtplib.SMTP, float]] = deque()
+        self._semaphore = asyncio.Semaphore(size)
+        self.connects = 0
+        self.reuses = 0
+        self.discarded = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(
+                    self.config.MAIL_USERNAME,
+                    self.config.MAIL_PASSWORD.get_secret_value(),
+                )
+        except Exception as error:
+            smtp.close()
+            raise ConnectionErrors(
+                f"Exception raised {error}, check your credentials or email "
+                "service configuration"
+            )
+        self.connects += 1
+        return smtp
+
+    async def _discard(self, smtp: aiosmtplib.SMTP, quit: bool = False) -> None:
+        self.discarded += 1
+        if quit and smtp.is_connected:
+            try:
+                await smtp.quit()
+                return
+            except aiosmtplib.SMTPException:
+                pass
+        smtp.close()
+
+    async def _reuse(self) -> Optional[aiosmtplib.SMTP]:
+        now = time.monotonic()
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            idle = now - last_used
+            if not smtp.is_connected or idle > self.idle_timeout:
+                await self._discard(smtp, quit=True)
+                continue
+            if idle > self.health_check_seconds:
+                try:
+                    await smtp.noop()
+                except aiosmtplib.SMTPException as e:
+                    logger.info("Dropping stale SMTP connection: %r", e)
+                    await self._discard(smtp)
+                    continue
+            self.reuses += 1
+            return smtp
+        return None
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        """
+        Borrow a connection; it is returned to the pool unless the block fails.
+
+        Yields:
+            aiosmtplib.SMTP: A connected, logged-in client.
+
+        Raises:
+            ConnectionErrors: If a new connection cannot be opened.
+        """
+        async with self._semaphore:
+            smtp = await self._reuse() or await self._connect()
+            try:
+                yield smtp
+            except BaseException:
+                await self._discard(smtp)
+                raise
+            self._idle.append((smtp, time.monotonic()))
+
+    async def send(self, message) -> None:
+        """
+        Send a prepared message, reconnecting once if the server has closed the
+        connection since it was last used.
+
+        Args:
+            message: An ``email.message.EmailMessage``.
+        """
+        try:
+            async with self.connection() as smtp:
+                await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected as e:
+            logger.info("SMTP connection lost, reconnecting: %r", e)
+            async with self.connection() as smtp:
+                await smtp.send_message(message)
+
+    async def close(self) -> None:
+        """
+        Close all idle connections.
+        """
+        while self._idle:
+            smtp, _ = self._idle.pop()
+            await self._discard(smtp, quit=True)
+
+    def stats(self) -> dict:
+        """
+        Return connection counters of the pool.
+        """
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "discarded": self.discarded,
+        }
+
+
+class PooledFastMail(FastMail):
+    """
+    FastMail that sends over an ``SMTPConnectionPool`` instead of a new
+    connection per email.
+
+    Args:
+        config: The connection settings.
+        **pool_options: Keyword arguments for ``SMTPConnectionPool``.
+    """
+
+    def __init__(self, config: ConnectionConfig, **pool_options):
+        super().__init__(config)
+        self.pool = SMTPConnectionPool(config, **pool_options)
+
+    async def _render(self, message: MessageSchema, template_name: str) -> None:
+        template = await self.get_mail_template(
+            self.config.template_engine(), template_name
+        )
+        if isinstance(message.template_body, list):
+            message.template_body = template.render({"body": message.template_body})
+        else:
+            message.template_body = template.render(
+                **self.check_data(message.template_body)
+            )
+
+    def _sender(self) -> str:
+        if self.config.MAIL_FROM_NAME is not None:
+            return formataddr((self.config.MAIL_FROM_NAME, self.config.MAIL_FROM))
+        return self.config.MAIL_FROM
+
+    async def send_message(
+        self, message: MessageSchema, template_name: Optional[str] = None
+    ) -> None:
+        """
+        Render and send a message over a pooled connection.
+
+        Templates are rendered the way ``FastMail.send_message`` renders them.
+
+        Args:
+            message: The message to send.
+            template_name: Optional Jinja2 template rendered with
+                ``message.template_body``.
+
+        Raises:
+            PydanticClassRequired: If ``message`` is not a ``MessageSchema``.
+            ConnectionErrors: If a connection to the server cannot be opened.
+        """
+        if not isinstance(message, MessageSchema):
+            raise PydanticClassRequired(
+                "Message schema should be provided from MessageSchema class"
+            )
+
+        if (
+            self.config.TEMPLATE_FOLDER
+            and template_name
+            and message.template_body is not None
+        ):
+            await self._render(message, template_name)
+        msg = await build_message(message, self._sender())
+
+        if not self.config.SUPPRESS_SEND:
+            await self.pool.send(msg)
+        email_dispatched.send(msg)
+
+    async def close(self) -> None:
+        """
+        Close the idle connections of the pool.
+        """
+        await self.pool.close()
@@ -0,0 +1,242 @@
+"""
+File storage backends and streaming uploads.
+
+Uploads are parsed from the request stream with a size limit, so an oversized
+body is rejected before it is read completely; file parts larger than 1 MiB are
+spooled to disk by the multipart parser. Backends store files off the event loop.
+"""
+
+import shutil
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import cloudinary
+import cloudinary.uploader
+import requests
+from fastapi import HTTPException, Request, status
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from src.conf.config import settings
+
+# Room for multipart boundaries and part headers on top of the file itself.
+MULTIPART_OVERHEAD = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+LOOKUP_TIMEOUT = 5
+
+
+class StorageBackend(ABC):
+    """
+    Where uploaded files are kept.
+    """
+
+    @abstractmethod
+    async def save(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        """
+        Store a file, replacing any file with the same key.
+
+        Args:
+            fileobj: The file, positioned at its start.
+            key: The name of the file in the storage, e.g. ``avatars/alice``.
+            content_type: The media type of the file.
+
+        Returns:
+            str: The public URL of the stored file.
+        """
+
+    @abstractmethod
+    async def lookup(self, key: str) -> Optional[str]:
+        """
+        Find a stored file.
+
+        Args:
+            key: The name of the file in the storage.
+
+        Returns:
+            The public URL of the file, or None if it is not stored.
+        """
+
+
+class CloudinaryStorage(StorageBackend):
+    """
+    Store files on Cloudinary as raw files, served as uploaded.
+
+    The client is configured once; calls run in the thread pool because the
+    Cloudinary SDK is synchronous. Lookups request the delivery URL with HEAD
+    instead of using the Admin API, which is rate-limited per hour.
+
+    Args:
+        cloud_name: The Cloudinary cloud name.
+        api_key: The API key.
+        api_secret: The API secret.
+    """
+
+    def __init__(self, cloud_name: str, api_key, api_secret: str):
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret,
+            secure=True,
+        )
+
+    @staticmethod
+    def _url(key: str, version) -> str:
+        return cloudinary.CloudinaryResource(key, resource_type="raw").build_url(
+            version=version
+        )
+
+    def _upload(self, fileobj: BinaryIO, key: str) -> str:
+        result = cloudinary.uploader.upload(
+            fileobj, public_id=key, resource_type="raw", overwrite=True
+        )
+        return self._url(key, result.get("version"))
+
+    def _lookup(self, key: str) -> Optional[str]:
+        # Without a version the URL serves the latest upload of the key.
+        url = self._url(key, None)
+        try:
+            response = requests.head(url, timeout=LOOKUP_TIMEOUT)
+        except requests.RequestException:
+            # Unknown is treated as missing; the file is uploaded again.
+            return None
+        return url if response.status_code == 200 else None
+
+    async def save(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        return await run_in_threadpool(self._upload, fileobj, key)
+
+    async def lookup(self, key: str) -> Optional[str]:
+        return await run_in_threadpool(self._lookup, key)
+
+
+class LocalStorage(StorageBackend):
+    """
+    Store files in a local directory served by the application.
+
+    Args:
+        root: The directory files are written to.
+        base_url: The URL the directory is served at.
+    """
+
+    def __init__(self, root, base_url: str):
+        self.root = Path(root).resolve()
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+
+    def path(self, key: str) -> Path:
+        """
+        Return the path of a stored file.
+
+        Raises:
+            ValueError: If the key points outside of the storage directory.
+        """
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def _write(self, fileobj: BinaryIO, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the target and rename, so readers never see a partial file.
+        partial = path.with_name(f".{path.name}.partial")
+        with partial.open("wb") as target:
+            shutil.copyfileobj(fileobj, target, CHUNK_SIZE)
+        partial.replace(path)
+
+    async def save(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        await run_in_threadpool(self._write, fileobj, self.path(key))
+        return f"{self.base_url}{key}"
+
+    async def lookup(self, key: str) -> Optional[str]:
+        if not self.path(key).is_file():
+            return None
+        return f"{self.base_url}{key}"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    Static files that never change once written, cached by clients for a year.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """
+    Return the storage backend selected by ``STORAGE_BACKEND``.
+    """
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.STORAGE_LOCAL_DIR, settings.STORAGE_LOCAL_URL)
+    return CloudinaryStorage(
+        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
+    )
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is larger than {max_bytes} bytes",
+    )
+
+
+async def receive_upload(request: Request, field: str, max_bytes: int) -> UploadFile:
+    """
+    Parse one uploaded file from a multipart request without reading more than
+    the size limit allows.
+
+    The caller owns the returned file and must close it.
+
+    Args:
+        request: The incoming request.
+        field: The name of the form field holding the file.
+        max_bytes: The maximum size of the file.
+
+    Returns:
+        UploadFile: The uploaded file, positioned at its start.
+
+    Raises:
+        HTTPException: 413 if the file is too large, 400 if the body is not a
+            valid multipart form and 422 if the field is missing.
+    """
+    body_limit = max_bytes + MULTIPART_OVERHEAD
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > body_limit:
+        raise _too_large(max_bytes)
+
+    async def limited_stream():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise _too_large(max_bytes)
+            yield chunk
+
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a multipart/form-data body",
+        )
+    try:
+        form = await MultiPartParser(
+            request.headers, limited_stream(), max_files=1, max_fields=0
+        ).parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    upload = form.get(field)
+    if not isinstance(upload, UploadFile):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Form field '{field}' must be a file",
+        )
+    if upload.size is not None and upload.size > max_bytes:
+        await upload.close()
+        raise _too_large(max_bytes)
+    return upload
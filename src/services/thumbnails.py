@@ -0,0 +1,166 @@
+"""
+Avatar thumbnails rendered with Pillow in a process pool.
+
+Thumbnails are stored under the SHA-256 of the uploaded image, so uploading the
+same image twice reuses the stored files, and a stored file never changes.
+"""
+
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from src.conf.config import settings
+
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+QUALITY = 85
+
+
+def identify_image(fileobj: BinaryIO) -> str:
+    """
+    Check that a file is an image Pillow can read, reading only its header.
+
+    Args:
+        fileobj: The file; it is rewound afterwards.
+
+    Returns:
+        str: The Pillow format name, e.g. ``"PNG"``.
+
+    Raises:
+        ValueError: If the file is not a supported image.
+    """
+    try:
+        with Image.open(fileobj) as image:
+            return image.format
+    except (UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise ValueError(str(e)) from e
+    finally:
+        fileobj.seek(0)
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Return the SHA-256 hex digest of an image.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def thumbnail_key(digest: str, size: int, fmt: str) -> str:
+    """
+    Return the storage key of a thumbnail.
+
+    Args:
+        digest: SHA-256 of the original image.
+        size: Width and height in pixels.
+        fmt: ``"webp"`` or ``"jpeg"``.
+    """
+    return f"avatars/{digest}/{size}.{fmt}"
+
+
+def render_thumbnails(
+    data: bytes, sizes: Iterable[int], formats: Iterable[str]
+) -> dict[tuple[int, str], bytes]:
+    """
+    Crop an image to a square and encode it at every size and format.
+
+    Runs in a worker process.
+
+    Args:
+        data: The original image.
+        sizes: Widths and heights in pixels.
+        formats: Names from ``FORMATS``.
+
+    Returns:
+        The encoded thumbnails keyed by ``(size, format)``.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+    thumbnails = {}
+    for size in sorted(sizes, reverse=True):
+        # Resize the previous (larger) thumbnail instead of the original.
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            image.save(buffer, FORMATS[fmt][0], quality=QUALITY)
+            thumbnails[size, fmt] = buffer.getvalue()
+    return thumbnails
+
+
+class ThumbnailPool:
+    """
+    A process pool rendering thumbnails, started on first use.
+
+    Decoding and resizing hold the GIL, so they run in separate processes to keep
+    the event loop and the other request threads responsive.
+
+    Args:
+        max_workers (int): The number of worker processes.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a process with a running event loop and threads is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def render(
+        self, data: bytes, sizes: Iterable[int], formats: Iterable[str]
+    ) -> dict[tuple[int, str], bytes]:
+        """
+        Render thumbnails in the pool; see :func:`render_thumbnails`.
+        """
+        loop = asyncio.get_running_loop()
+        self.running += 1
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(),
+                render_thumbnails,
+                data,
+                list(sizes),
+                list(formats),
+            )
+        finally:
+            self.running -= 1
+            self.completed += 1
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def stats(self) -> dict:
+        """
+        Return the counters of the pool.
+        """
+        return {
+            "max_workers": self.max_workers,
+            "started": self._executor is not None,
+            "running": self.running,
+            "completed": self.completed,
+        }
+
+
+thumbnail_pool = ThumbnailPool(settings.THUMBNAIL_WORKERS)
@@ -73,10 +73,39 @@ class UserService:
         return await self.repository.get_user_by_email(email)
 
     async def confirmed_email(self, email: str):
+        """
+        Confirm the email of a user that is not confirmed yet.
+
+        Args:
+            email (str): Email of the user to confirm.
+
+        Returns:
+            Optional[User]: The confirmed user, or None if there is no unconfirmed user with this email.
+        """
         return await self.repository.confirmed_email(email)
 
-    async def update_avatar_url(self, email: str, url: str):
-        return await self.repository.update_avatar_url(email, url)
+    async def update_avatar_url(self, user_id: int, url: str):
+        """
+        Update the avatar URL of a user.
+
+        Args:
+            user_id (int): ID of the user.
+            url (str): The new avatar URL.
+
+        Returns:
+            Optional[User]: The updated user object if found, else None.
+        """
+        return await self.repository.update_avatar_url(user_id, url)
 
     async def update_password(self, email: str, new_password: str):
+        """
+        Replace the password hash of a user.
+
+        Args:
+            email (str): Email of the user.
+            new_password (str): The new password hash.
+
+        Returns:
+            Optional[User]: The updated user object if found, else None.
+        """
         return await self.repository.update_password(email, new_password)
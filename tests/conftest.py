@@ -1,15 +1,25 @@
 import asyncio
+import email
+import socket
 
 import pytest
 import pytest_asyncio
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from main import app
 from src.database.models import Base, User
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db, get_session_factory
+from src.database.instrumentation import instrument_engine
 from src.services.auth import create_access_token, Hash
+from src.services.cache import user_cache
+from src.services.email import conf
+from src.services.query_budget import violations
+from src.services.rate_limit import rate_limiter
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -19,6 +29,7 @@ engine = create_async_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+instrument_engine(engine)
 
 TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
@@ -34,6 +45,8 @@ test_user = {
 
 @pytest.fixture(scope="module", autouse=True)
 def init_models_wrap():
+    user_cache.clear()
+
     async def init_models():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
@@ -67,6 +80,8 @@ def client():
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
     yield TestClient(app)
 
@@ -81,3 +96,74 @@ async def get_token():
 async def async_session():
     async with TestingSessionLocal() as session:
         yield session
+
+
+@pytest.fixture
+def query_counter():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    rate_limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def query_budget_guard():
+    violations.clear()
+    yield
+    assert not violations, f"Query budget exceeded: {list(violations)}"
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def html_body(envelope) -> str:
+    message = email.message_from_bytes(envelope.content)
+    for part in message.walk():
+        if part.get_content_type() == "text/html":
+            return part.get_payload(decode=True).decode()
+    return ""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def mail_config(port: int) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="test@example.com",
+        MAIL_PASSWORD="secret",
+        MAIL_FROM="test@example.com",
+        MAIL_PORT=port,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False,
+        TEMPLATE_FOLDER=conf.TEMPLATE_FOLDER,
+    )
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
@@ -0,0 +1,137 @@
+import logging
+import time
+
+import fakeredis
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from src.database.db import DatabaseSessionManager
+
+
+async def create_marker(url: str, name: str) -> None:
+    manager = DatabaseSessionManager(url)
+    async with manager.session() as session:
+        await session.execute(text("CREATE TABLE node (name TEXT)"))
+        await session.execute(text("INSERT INTO node VALUES (:name)"), {"name": name})
+        await session.commit()
+
+
+async def read_node(manager: DatabaseSessionManager, key: str | None = None) -> str:
+    async with manager.read_session(key) as session:
+        return (await session.execute(text("SELECT name FROM node"))).scalar_one()
+
+
+@pytest_asyncio.fixture
+async def urls(tmp_path):
+    urls = {}
+    for name in ("primary", "replica1", "replica2"):
+        urls[name] = f"sqlite+aiosqlite:///{tmp_path / name}.db"
+        await create_marker(urls[name], name)
+    return urls
+
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_without_replicas(urls):
+    manager = DatabaseSessionManager(urls["primary"])
+    assert await read_node(manager) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_round_robin(urls):
+    manager = DatabaseSessionManager(
+        urls["primary"], read_urls=[urls["replica1"], urls["replica2"]]
+    )
+    nodes = [await read_node(manager) for _ in range(4)]
+    assert nodes == ["replica1", "replica2", "replica1", "replica2"]
+
+
+@pytest.mark.asyncio
+async def test_least_connections(urls):
+    manager = DatabaseSessionManager(
+        urls["primary"],
+        read_urls=[urls["replica1"], urls["replica2"]],
+        read_strategy="least_connections",
+    )
+    async with manager.read_session() as busy:
+        await busy.execute(text("SELECT 1"))
+        busy_node = (await busy.execute(text("SELECT name FROM node"))).scalar_one()
+        nodes = {await read_node(manager) for _ in range(3)}
+    assert nodes == {"replica1", "replica2"} - {busy_node}
+
+
+def test_unknown_strategy(urls):
+    with pytest.raises(ValueError):
+        DatabaseSessionManager(urls["primary"], read_strategy="random")
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes(urls, monkeypatch):
+    manager = DatabaseSessionManager(
+        urls["primary"],
+        read_urls=[urls["replica1"]],
+        read_your_writes_seconds=5,
+    )
+    async with manager.session("writer") as session:
+        await session.execute(text("SELECT name FROM node"))
+    assert await read_node(manager, "writer") == "replica1"
+
+    async with manager.session("writer") as session:
+        await session.execute(text("UPDATE node SET name = 'primary'"))
+        await session.commit()
+    assert await read_node(manager, "writer") == "primary"
+    assert await read_node(manager, "other") == "replica1"
+
+    clock = time.monotonic() + 6
+    monkeypatch.setattr("src.database.db.time.monotonic", lambda: clock)
+    assert await read_node(manager, "writer") == "replica1"
+
+
+def redis_manager(urls, server: fakeredis.FakeServer) -> DatabaseSessionManager:
+    manager = DatabaseSessionManager(
+        urls["primary"], read_urls=[urls["replica1"]], read_your_writes_seconds=5
+    )
+    manager._redis = fakeredis.FakeAsyncRedis(server=server)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_is_shared_through_redis(urls):
+    server = fakeredis.FakeServer()
+    writer, reader = redis_manager(urls, server), redis_manager(urls, server)
+
+    async with writer.session("writer") as session:
+        await session.execute(text("UPDATE node SET name = 'primary'"))
+        await session.commit()
+
+    # Another worker routes the client to the primary as well.
+    assert await read_node(reader, "writer") == "primary"
+    assert await read_node(reader, "other") == "replica1"
+    keys = await fakeredis.FakeAsyncRedis(server=server).keys()
+    assert len(keys) == 1 and b"writer" not in keys[0]
+    assert 0 < await fakeredis.FakeAsyncRedis(server=server).pttl(keys[0]) <= 5000
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_falls_back_to_memory(urls):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    manager = redis_manager(urls, server)
+
+    await manager.pin("writer")
+
+    assert await manager.is_pinned("writer")
+    assert not await manager.is_pinned("other")
+    assert manager.redis_errors == 2
+
+
+def test_replicas_without_redis_warn(urls, caplog):
+    with caplog.at_level(logging.WARNING, logger="src.database.db"):
+        DatabaseSessionManager(urls["primary"], read_urls=[urls["replica1"]])
+    assert not caplog.records
+
+    with caplog.at_level(logging.WARNING, logger="src.database.db"):
+        DatabaseSessionManager(
+            urls["primary"], read_urls=[urls["replica1"]], read_your_writes_seconds=5
+        )
+    assert "without REDIS_URL" in caplog.text
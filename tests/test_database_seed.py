@@ -0,0 +1,62 @@
+import random
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database.models import Base, Contact, User
+from src.database.seed import seed_database, synthetic_contacts
+from src.repository.contacts import ContactRepository
+
+
+def test_synthetic_contacts_are_deterministic():
+    first = synthetic_contacts(random.Random(7), 1, 50)
+    second = synthetic_contacts(random.Random(7), 1, 50)
+    other = synthetic_contacts(random.Random(8), 1, 50)
+
+    assert first == second
+    assert first != other
+    assert len({row["email"] for row in first}) == 50
+    assert all(row["birthday_mmdd"] for row in first)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'seed.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_seed_database_loads_searchable_contacts(engine):
+    inserted = await seed_database(engine, 3, 40, seed=1, batch_size=25)
+    assert inserted == 120
+
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        user = await session.scalar(select(User).filter_by(username="user1"))
+        assert user.email == "user1@example.com"
+        assert user.confirmed
+
+        contacts = (
+            await session.scalars(select(Contact).filter_by(user_id=user.id))
+        ).all()
+        assert len(contacts) == 40
+        assert all(contact.created_at is not None for contact in contacts)
+
+        # The full-text index is rebuilt after the load and kept in sync again.
+        repository = ContactRepository(session)
+        found = await repository.search_contacts(contacts[0].email, user, 10)
+        assert [contact.id for contact in found] == [contacts[0].id]
+
+        await repository.remove_contact(contacts[0].id, user)
+        assert await repository.search_contacts(contacts[0].email, user, 10) == []
+
+    async with engine.connect() as conn:
+        triggers = await conn.scalars(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        )
+        assert "contacts_fts_ai" in set(triggers)
@@ -1,9 +1,8 @@
-from unittest.mock import Mock
-
 import pytest
 from sqlalchemy import select
 
-from src.database.models import User
+from src.database.models import EmailOutbox, User
+from src.services.auth import create_access_token, create_email_token
 from tests.conftest import TestingSessionLocal
 
 user_data = {
@@ -14,9 +13,18 @@ user_data = {
 }
 
 
-def test_signup(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+async def outbox_kinds(email: str) -> list[str]:
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(EmailOutbox.kind)
+            .where(EmailOutbox.recipient == email)
+            .order_by(EmailOutbox.id)
+        )
+        return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_signup(client):
     response = client.post("api/auth/register", json=user_data)
     assert response.status_code == 201, response.text
     data = response.json()
@@ -24,15 +32,16 @@ def test_signup(client, monkeypatch):
     assert data["email"] == user_data["email"]
     assert "hashed_password" not in data
     assert "avatar" in data
+    assert await outbox_kinds(user_data["email"]) == ["verify_email"]
 
 
-def test_repeat_signup(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+@pytest.mark.asyncio
+async def test_repeat_signup(client):
     response = client.post("api/auth/register", json=user_data)
     assert response.status_code == 409, response.text
     data = response.json()
     assert data["detail"] == "Користувач з таким email вже існує"
+    assert await outbox_kinds(user_data["email"]) == ["verify_email"]
 
 
 def test_not_confirmed_login(client):
@@ -93,6 +102,18 @@ def test_wrong_username_login(client):
     assert data["detail"] == "Неправильний логін або пароль"
 
 
+def test_login_rate_limit(client):
+    credentials = {"username": user_data.get("username"), "password": "password"}
+    for _ in range(5):
+        response = client.post("api/auth/login", data=credentials)
+        assert response.status_code == 401, response.text
+
+    response = client.post("api/auth/login", data=credentials)
+    assert response.status_code == 429, response.text
+    assert response.json() == {"error": "Перевищено ліміт запитів. Спробуйте пізніше."}
+    assert 0 < int(response.headers["Retry-After"]) <= 60
+
+
 def test_validation_error_login(client):
     response = client.post(
         "api/auth/login", data={"password": user_data.get("password")}
@@ -103,10 +124,7 @@ def test_validation_error_login(client):
 
 
 @pytest.mark.asyncio
-async def test_request_password_reset_success(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
-
+async def test_request_password_reset_success(client):
     body = {"email": user_data.get("email")}
     response = client.post("api/auth/request_password_reset", json=body)
 
@@ -114,17 +132,44 @@ async def test_request_password_reset_success(client, monkeypatch):
     assert response.json() == {
         "message": "Лист для скидання пароля надіслано на вашу електронну адресу"
     }
-    mock_send_email.assert_called_once()
+    assert (await outbox_kinds(user_data["email"]))[-1] == "password_reset"
 
 
 @pytest.mark.asyncio
-async def test_request_password_reset_user_not_found(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
-
+async def test_request_password_reset_user_not_found(client):
     body = {"email": "nonexistent@example.com"}
     response = client.post("api/auth/request_password_reset", json=body)
 
     assert response.status_code == 404
     assert response.json() == {"detail": "Користувач не знайдений"}
-    mock_send_email.assert_not_called()
+    assert await outbox_kinds("nonexistent@example.com") == []
+
+
+@pytest.mark.asyncio
+async def test_confirmed_email_already_confirmed(client, query_counter):
+    token = create_email_token({"sub": user_data.get("email")})
+
+    response = client.get(f"api/auth/confirmed_email/{token}")
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"message": "Ваша електронна пошта вже підтверджена"}
+    assert len(query_counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_reset_password_confirm(client, query_counter):
+    token = await create_access_token(data={"sub": user_data.get("email")})
+
+    response = client.post(
+        "api/auth/reset-password-confirm",
+        params={"token": token, "new_password": "87654321"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert len(query_counter) == 1
+
+    response = client.post(
+        "api/auth/login",
+        data={"username": user_data.get("username"), "password": "87654321"},
+    )
+    assert response.status_code == 200, response.text
@@ -1,3 +1,9 @@
+import base64
+import csv
+import io
+import json
+
+
 def test_create_contact(client, get_token):
 
     new_contact = {
@@ -152,3 +158,384 @@ def test_remove_contact(client, get_token):
 
     data = response.json()
     assert data["id"] == contact_id, "Невірний ID видаленого контакту"
+
+
+def test_get_contacts_cursor_pagination(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for i in range(3):
+        client.post(
+            "/api/contacts/",
+            json={
+                "first_name": f"Page{i}",
+                "last_name": "Cursor",
+                "email": f"page{i}@example.com",
+                "phone": "+123456789",
+                "birthday": "1990-01-01",
+                "additional_info": "",
+            },
+            headers=headers,
+        )
+
+    first_page = client.get(
+        "/api/contacts/", params={"last_name": "Cursor", "limit": 2}, headers=headers
+    )
+    assert first_page.status_code == 200, first_page.text
+    assert [c["first_name"] for c in first_page.json()] == ["Page0", "Page1"]
+    assert 'rel="next"' in first_page.headers["Link"]
+
+    next_cursor = first_page.headers["X-Next-Cursor"]
+    second_page = client.get(
+        "/api/contacts/",
+        params={"last_name": "Cursor", "limit": 2, "cursor": next_cursor},
+        headers=headers,
+    )
+    assert second_page.status_code == 200, second_page.text
+    assert [c["first_name"] for c in second_page.json()] == ["Page2"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_contacts_fast_json(client, get_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    params = {"last_name": "Cursor", "limit": 2}
+    regular = client.get("/api/contacts/", params=params, headers=headers)
+
+    monkeypatch.setattr("src.api.contacts.settings.CONTACT_FAST_JSON", True)
+    fast = client.get("/api/contacts/", params=params, headers=headers)
+
+    assert fast.status_code == 200, fast.text
+    assert fast.json() == regular.json()
+    assert len(fast.json()) == 2
+    for header in ("Content-Type", "ETag", "X-Next-Cursor", "Link"):
+        assert fast.headers[header] == regular.headers[header]
+
+    not_modified = client.get(
+        "/api/contacts/",
+        params=params,
+        headers={**headers, "If-None-Match": fast.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
+
+
+def test_get_contacts_limit_is_not_capped(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/contacts/", params={"limit": 5000}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    response = client.get("/api/contacts/", params={"limit": 0}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_contacts_invalid_cursor(client, get_token):
+    def encoded(payload: str) -> str:
+        return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+    for cursor in (
+        "not-a-cursor",
+        encoded('{"id": true}'),
+        encoded('{"id": -1}'),
+        encoded(f'{{"id": {10**30}}}'),
+    ):
+        response = client.get(
+            "/api/contacts/",
+            params={"cursor": cursor},
+            headers={"Authorization": f"Bearer {get_token}"},
+        )
+
+        assert response.status_code == 400, (cursor, response.text)
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_search_contacts(client, get_token):
+    response = client.get(
+        "/api/contacts/search",
+        params={"q": "page1"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [c["email"] for c in data] == ["page1@example.com"]
+
+
+def test_get_upcoming_birthdays(client, get_token):
+    response = client.get(
+        "/api/contacts/birthdays",
+        params={"days": 366},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert {c["last_name"] for c in response.json()} == {"Cursor"}
+
+
+def test_import_contacts_csv(client, get_token):
+    csv_content = (
+        "first_name,last_name,email,phone,birthday,additional_info\n"
+        "Ada,Import,ada@example.com,+111,1990-03-01,\n"
+        ",Import,broken@example.com,+222,1990-03-02,\n"
+        'Alan,Import,alan@example.com,+333,1990-03-03,"multi\nline"\n'
+    )
+
+    response = client.post(
+        "/api/contacts/import",
+        params={"batch_size": 2},
+        files={"file": ("contacts.csv", csv_content.encode(), "text/csv")},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["inserted"] == 2
+    assert data["failed"] == 1
+    assert data["errors"][0]["row"] == 2
+    assert data["errors"][0]["errors"][0].startswith("first_name")
+
+    imported = client.get(
+        "/api/contacts/",
+        params={"last_name": "Import"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    ).json()
+    assert [c["first_name"] for c in imported] == ["Ada", "Alan"]
+    assert imported[0]["additional_info"] == ""
+    assert imported[1]["additional_info"] == "multi\nline"
+
+
+def test_import_contacts_ndjson(client, get_token):
+    ndjson_content = (
+        '{"first_name": "Grace", "last_name": "Ndjson", "email": "grace@example.com",'
+        ' "phone": "+444", "birthday": "1990-03-03"}\n'
+        "\n"
+        "{not json}\n"
+    )
+
+    response = client.post(
+        "/api/contacts/import",
+        files={
+            "file": (
+                "contacts.ndjson",
+                ndjson_content.encode(),
+                "application/x-ndjson",
+            )
+        },
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "inserted": 1,
+        "failed": 1,
+        "errors": [{"row": 2, "errors": ["Invalid JSON"]}],
+        "errors_truncated": False,
+    }
+
+
+def test_import_contacts_unknown_format(client, get_token):
+    response = client.post(
+        "/api/contacts/import",
+        files={"file": ("contacts.txt", b"hello", "text/plain")},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 415, response.text
+
+
+def test_export_contacts_ndjson(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    listed = client.get("/api/contacts/", headers=headers).json()
+
+    response = client.get("/api/contacts/export", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == listed
+
+
+def test_export_contacts_csv(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    listed = client.get("/api/contacts/", headers=headers).json()
+
+    response = client.get(
+        "/api/contacts/export", params={"format": "csv"}, headers=headers
+    )
+
+    assert response.status_code == 200, response.text
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [c["id"] for c in listed]
+    assert rows[0]["email"] == listed[0]["email"]
+
+
+def test_contact_etag(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact = client.post(
+        "/api/contacts/",
+        json={
+            "first_name": "Etag",
+            "last_name": "Contact",
+            "email": "etag@example.com",
+            "phone": "+380501112233",
+            "birthday": "1992-03-04",
+            "additional_info": "",
+        },
+        headers=headers,
+    ).json()
+
+    response = client.get(f"/api/contacts/{contact['id']}", headers=headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = client.get(
+        f"/api/contacts/{contact['id']}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.patch(
+        f"/api/contacts/{contact['id']}/phone",
+        json={"phone": "+380509998877"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    response = client.patch(
+        f"/api/contacts/{contact['id']}/email",
+        json={"email": "stale@example.com"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 412
+
+    response = client.get(
+        f"/api/contacts/{contact['id']}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["email"] == "etag@example.com"
+    assert response.headers["ETag"] == new_etag
+
+
+def test_contacts_list_etag(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/contacts/", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/contacts/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get(
+        "/api/contacts/?limit=5", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    contact_id = client.get("/api/contacts/", headers=headers).json()[0]["id"]
+    client.patch(
+        f"/api/contacts/{contact_id}/phone",
+        json={"phone": "+380500000001"},
+        headers=headers,
+    )
+    response = client.get("/api/contacts/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_update_contact_if_match_not_found(client, get_token):
+    response = client.patch(
+        "/api/contacts/999999/phone",
+        json={"phone": "+380500000002"},
+        headers={"Authorization": f"Bearer {get_token}", "If-Match": 'W/"1.x"'},
+    )
+    assert response.status_code == 404
+
+
+def create_bulk_contacts(client, headers, count, last_name):
+    ids = []
+    for i in range(count):
+        response = client.post(
+            "/api/contacts/",
+            json={
+                "first_name": f"Bulk{i}",
+                "last_name": last_name,
+                "email": f"bulk{i}.{last_name.lower()}@example.com",
+                "phone": f"+38050000{i:04d}",
+                "birthday": "1990-06-15",
+                "additional_info": "",
+            },
+            headers=headers,
+        )
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_bulk_update_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = create_bulk_contacts(client, headers, 3, "Bulkupdate")
+
+    response = client.patch(
+        "/api/contacts/bulk",
+        json={"ids": ids[:2] + [999999], "values": {"birthday": "1991-12-30"}},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"ids": ids[:2], "count": 2, "has_more": False}
+
+    response = client.get("/api/contacts/birthdays?days=366", headers=headers)
+    birthdays = {c["id"]: c["birthday"] for c in response.json()}
+    assert birthdays[ids[0]] == "1991-12-30"
+    assert birthdays[ids[2]] == "1990-06-15"
+
+    response = client.patch(
+        "/api/contacts/bulk",
+        json={
+            "filter": {"last_name": "bulkupdate"},
+            "values": {"additional_info": "tagged"},
+        },
+        headers=headers,
+    )
+    assert response.json()["ids"] == ids
+
+
+def test_bulk_delete_contacts(client, get_token, query_counter):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = create_bulk_contacts(client, headers, 3, "Bulkdelete")
+
+    query_counter.clear()
+    response = client.post(
+        "/api/contacts/bulk-delete", json={"ids": ids[:2]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {"ids": ids[:2], "count": 2, "has_more": False}
+    assert sum(s.lstrip().startswith("DELETE") for s in query_counter) == 1
+
+    response = client.post(
+        "/api/contacts/bulk-delete",
+        json={"filter": {"last_name": "Bulkdelete"}},
+        headers=headers,
+    )
+    assert response.json()["ids"] == ids[2:]
+    assert client.get(f"/api/contacts/{ids[2]}", headers=headers).status_code == 404
+
+
+def test_bulk_selection_validation(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for body in ({}, {"ids": [1], "filter": {"email": "a"}}, {"filter": {}}):
+        response = client.post("/api/contacts/bulk-delete", json=body, headers=headers)
+        assert response.status_code == 422, body
+
+    for values in ({}, {"email": None}, {"phone": "+1", "birthday": None}):
+        response = client.patch(
+            "/api/contacts/bulk", json={"ids": [1], "values": values}, headers=headers
+        )
+        assert response.status_code == 422, values
+
+
+def test_bulk_delete_too_many_ids(client, get_token, monkeypatch):
+    monkeypatch.setattr("src.api.contacts.settings.CONTACT_BULK_MAX", 2)
+    response = client.post(
+        "/api/contacts/bulk-delete",
+        json={"ids": [1, 2, 3]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 400
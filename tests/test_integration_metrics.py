@@ -0,0 +1,61 @@
+from prometheus_client import REGISTRY
+
+from src.database.instrumentation import current_operation, label_queries
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_record_routes_and_queries(client, get_token):
+    route = {"method": "GET", "route": "/api/contacts/{contact_id}"}
+    requests_before = sample("http_requests_total", status="404", **route)
+    latency_before = sample("http_request_duration_seconds_count", **route)
+    queries_before = sample(
+        "db_query_duration_seconds_count",
+        operation="ContactRepository.get_contact_by_id",
+        statement="SELECT",
+    )
+
+    response = client.get(
+        "/api/contacts/999999", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 404
+
+    assert sample("http_requests_total", status="404", **route) == requests_before + 1
+    assert sample("http_request_duration_seconds_count", **route) == latency_before + 1
+    assert (
+        sample(
+            "db_query_duration_seconds_count",
+            operation="ContactRepository.get_contact_by_id",
+            statement="SELECT",
+        )
+        == queries_before + 1
+    )
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_metrics_endpoint(client):
+    client.get("/api/unknown")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="unmatched"' in response.text
+    assert "db_query_duration_seconds_bucket" in response.text
+
+
+async def test_label_queries_async_generator():
+    @label_queries
+    class Repository:
+        async def rows(self):
+            for i in range(2):
+                yield current_operation.get()
+
+    seen = []
+    async for label in Repository().rows():
+        seen.append(label)
+        assert current_operation.get() == "other"
+
+    assert seen == ["Repository.rows", "Repository.rows"]
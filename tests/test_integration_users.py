@@ -1,6 +1,39 @@
-from unittest.mock import patch
+import io
+from unittest.mock import AsyncMock
+
+import pytest
+from PIL import Image
 
 from conftest import test_user
+from main import app
+from src.services.storage import LocalStorage, get_storage
+
+
+def test_get_me_rate_limit(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("api/users/me", headers=headers)
+    assert response.headers["X-RateLimit-Remaining"] == "9"
+    assert "ratelimit;dur=" in response.headers["Server-Timing"]
+
+    for _ in range(9):
+        assert client.get("api/users/me", headers=headers).status_code == 200
+    assert client.get("api/users/me", headers=headers).status_code == 429
+    # Limits are per user: anonymous clients from the same address are not limited.
+    assert client.get("api/users/me").status_code == 401
+
+
+def png(color: str, size=(300, 200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    storage = LocalStorage(tmp_path, "/media/")
+    app.dependency_overrides[get_storage] = lambda: storage
+    yield storage
+    del app.dependency_overrides[get_storage]
 
 
 def test_get_me(client, get_token):
@@ -14,22 +47,94 @@ def test_get_me(client, get_token):
     assert "avatar" in data
 
 
-@patch("src.services.upload_file.UploadFileService.upload_file")
-def test_update_avatar_user(mock_upload_file, client, get_token):
-    fake_url = "http://example.com/avatar.jpg"
-    mock_upload_file.return_value = fake_url
+def test_update_avatar_user(local_storage, client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    file_data = {"file": ("avatar.png", png("red"), "image/png")}
+
+    response = client.patch("/api/users/avatar", headers=headers, files=file_data)
+
+    assert response.status_code == 202, response.text
+    data = response.json()
+    assert data["username"] == test_user["username"]
+    assert data["email"] == test_user["email"]
+
+    # The background task has run by the time the test client returns.
+    avatar = client.get("api/users/me", headers=headers).json()["avatar"]
+    assert avatar.startswith("/media/avatars/") and avatar.endswith("/250.webp")
+    digest_dir = local_storage.path(avatar.removeprefix("/media/")).parent
+    assert sorted(p.name for p in digest_dir.iterdir()) == [
+        "128.jpeg",
+        "128.webp",
+        "250.jpeg",
+        "250.webp",
+        "64.jpeg",
+        "64.webp",
+    ]
+    with Image.open(digest_dir / "64.jpeg") as thumbnail:
+        assert thumbnail.size == (64, 64)
 
+
+def test_update_avatar_deduplicates(local_storage, client, get_token, monkeypatch):
     headers = {"Authorization": f"Bearer {get_token}"}
+    image = png("blue")
+    client.patch("/api/users/avatar", headers=headers, files={"file": image})
+    first = client.get("api/users/me", headers=headers).json()["avatar"]
+    render = AsyncMock()
+    monkeypatch.setattr("src.api.users.thumbnail_pool.render", render)
+
+    response = client.patch("/api/users/avatar", headers=headers, files={"file": image})
 
+    assert response.status_code == 202, response.text
+    render.assert_not_awaited()
+    assert client.get("api/users/me", headers=headers).json()["avatar"] == first
+
+
+def test_update_avatar_not_an_image(local_storage, client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
     file_data = {"file": ("avatar.jpg", b"fake image content", "image/jpeg")}
 
     response = client.patch("/api/users/avatar", headers=headers, files=file_data)
 
-    assert response.status_code == 200, response.text
+    assert response.status_code == 415, response.text
 
-    data = response.json()
-    assert data["username"] == test_user["username"]
-    assert data["email"] == test_user["email"]
-    assert data["avatar"] == fake_url
 
-    mock_upload_file.assert_called_once()
+def test_update_avatar_too_large(local_storage, client, get_token, monkeypatch):
+    monkeypatch.setattr("src.api.users.settings.AVATAR_MAX_BYTES", 10)
+    headers = {"Authorization": f"Bearer {get_token}"}
+    file_data = {"file": ("avatar.jpg", b"x" * 11, "image/jpeg")}
+
+    response = client.patch("/api/users/avatar", headers=headers, files=file_data)
+
+    assert response.status_code == 413, response.text
+    assert not local_storage.path("avatars").exists()
+
+
+def test_update_avatar_missing_file(local_storage, client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.patch(
+        "/api/users/avatar", headers=headers, files={"other": ("a.txt", b"a")}
+    )
+
+    assert response.status_code == 422, response.text
+
+
+def test_update_avatar_storage_failure(client, get_token):
+    storage = AsyncMock()
+    storage.lookup.return_value = None
+    storage.save.side_effect = ConnectionError("storage is down")
+    app.dependency_overrides[get_storage] = lambda: storage
+    headers = {"Authorization": f"Bearer {get_token}"}
+    before = client.get("api/users/me", headers=headers).json()["avatar"]
+    try:
+        response = client.patch(
+            "/api/users/avatar",
+            headers=headers,
+            files={"file": ("avatar.png", png("green"), "image/png")},
+        )
+    finally:
+        del app.dependency_overrides[get_storage]
+
+    assert response.status_code == 202, response.text
+    storage.save.assert_awaited()
+    assert client.get("api/users/me", headers=headers).json()["avatar"] == before
@@ -0,0 +1,191 @@
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.schemas import ContactBase, ContactUpdate, UserCreate
+
+FULL_SCAN = re.compile(r"^SCAN (contacts|users)\b")
+
+
+async def consume(rows) -> list:
+    return [row async for row in rows]
+
+
+async def explain(engine, statement: str, parameters) -> list[str]:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        return [row[-1] for row in result]
+
+
+@pytest.mark.asyncio
+async def test_repository_queries_use_indexes(async_session):
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create_user(
+        UserCreate(
+            username="planner", email="planner@example.com", password="x", role="user"
+        )
+    )
+    contact_repo = ContactRepository(async_session)
+    contact = await contact_repo.create_contact(
+        ContactBase(
+            first_name="Query",
+            last_name="Plan",
+            email="query.plan@example.com",
+            phone="+123456789",
+            birthday=date(1990, 12, 31),
+            additional_info="",
+        ),
+        user,
+    )
+    filters = {"first_name": "Que", "last_name": None, "email": None}
+    engine = async_session.bind
+
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if not statement.lstrip().upper().startswith("INSERT"):
+            captured.append((statement, parameters))
+
+    calls = [
+        ("UserRepository.get_user_by_id", lambda: user_repo.get_user_by_id(user.id)),
+        (
+            "UserRepository.get_user_by_username",
+            lambda: user_repo.get_user_by_username("planner"),
+        ),
+        (
+            "UserRepository.get_user_by_email",
+            lambda: user_repo.get_user_by_email("Planner@example.com"),
+        ),
+        (
+            "UserRepository.confirmed_email",
+            lambda: user_repo.confirmed_email("planner@example.com"),
+        ),
+        (
+            "UserRepository.update_avatar_url",
+            lambda: user_repo.update_avatar_url(user.id, "http://a.com/a.png"),
+        ),
+        (
+            "UserRepository.update_password",
+            lambda: user_repo.update_password("planner@example.com", "y"),
+        ),
+        (
+            "ContactRepository.get_contacts",
+            lambda: contact_repo.get_contacts(0, 10, filters, user),
+        ),
+        (
+            "ContactRepository.get_contacts(after_id)",
+            lambda: contact_repo.get_contacts(0, 10, filters, user, after_id=0),
+        ),
+        (
+            "ContactRepository.get_contact_rows",
+            lambda: contact_repo.get_contact_rows(0, 10, filters, user),
+        ),
+        (
+            "ContactRepository.get_contact_rows(after_id)",
+            lambda: contact_repo.get_contact_rows(0, 10, filters, user, after_id=0),
+        ),
+        (
+            "ContactRepository.search_contacts",
+            lambda: contact_repo.search_contacts("query", user, 10),
+        ),
+        (
+            "ContactRepository.search_contacts(short)",
+            lambda: contact_repo.search_contacts("qu", user, 10),
+        ),
+        (
+            "ContactRepository.stream_contacts",
+            lambda: consume(contact_repo.stream_contacts(user, 10)),
+        ),
+        (
+            "ContactRepository.get_contact_by_id",
+            lambda: contact_repo.get_contact_by_id(contact.id, user),
+        ),
+        (
+            "ContactRepository.get_contacts_version",
+            lambda: contact_repo.get_contacts_version(user),
+        ),
+        (
+            "ContactRepository.update_phone(if_updated_at)",
+            lambda: contact_repo.update_phone(
+                contact.id, "+2", user, [contact.updated_at]
+            ),
+        ),
+        (
+            "ContactRepository.get_upcoming_birthdays",
+            lambda: contact_repo.get_upcoming_birthdays(user, 30),
+        ),
+        (
+            "ContactRepository.update_contact",
+            lambda: contact_repo.update_contact(
+                contact.id,
+                ContactUpdate(
+                    first_name="Query",
+                    last_name="Plan",
+                    email="query.plan@example.com",
+                    phone="+123456789",
+                    birthday=date(1990, 12, 31),
+                    additional_info="updated",
+                ),
+                user,
+            ),
+        ),
+        (
+            "ContactRepository.update_phone",
+            lambda: contact_repo.update_phone(contact.id, "+1", user),
+        ),
+        (
+            "ContactRepository.update_email",
+            lambda: contact_repo.update_email(contact.id, "a@b.com", user),
+        ),
+        (
+            "ContactRepository.bulk_update_contacts",
+            lambda: contact_repo.bulk_update_contacts(
+                user, {"additional_info": "bulk"}, 10, ids=[contact.id]
+            ),
+        ),
+        (
+            "ContactRepository.bulk_update_contacts(filters)",
+            lambda: contact_repo.bulk_update_contacts(
+                user, {"additional_info": "bulk"}, 10, filters=filters
+            ),
+        ),
+        (
+            "ContactRepository.bulk_delete_contacts(filters)",
+            lambda: contact_repo.bulk_delete_contacts(
+                user, 10, filters={"first_name": "nobody"}
+            ),
+        ),
+        (
+            "ContactRepository.remove_contact",
+            lambda: contact_repo.remove_contact(contact.id, user),
+        ),
+    ]
+
+    plans = {}
+    for name, call in calls:
+        captured.clear()
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            await call()
+        finally:
+            event.remove(
+                engine.sync_engine, "before_cursor_execute", before_cursor_execute
+            )
+        assert captured, f"{name} did not run a query"
+        for statement, parameters in captured:
+            plans.setdefault(name, []).extend(
+                await explain(engine, statement, parameters)
+            )
+
+    full_scans = {
+        name: lines
+        for name, lines in plans.items()
+        if any(FULL_SCAN.match(line) for line in lines)
+    }
+    assert not full_scans, f"Queries falling back to a full table scan: {full_scans}"
@@ -1,15 +1,13 @@
 from datetime import date, timedelta
 import pytest
-from unittest.mock import patch
 from src.database.models import Contact
 from src.repository.contacts import ContactRepository
-from src.schemas import UserCreate
+from src.schemas import ContactBase, ContactUpdate, UserCreate
 from src.repository.users import UserRepository
-from sqlalchemy import select, func
 
 
 @pytest.mark.asyncio
-async def test_get_upcoming_birthdays(async_session, monkeypatch):
+async def test_get_upcoming_birthdays(async_session):
     user_data = UserCreate(
         username="testuser",
         email="testuser@testuser.com",
@@ -44,25 +42,201 @@ async def test_get_upcoming_birthdays(async_session, monkeypatch):
     async_session.add_all([contact_1, contact_2])
     await async_session.commit()
 
-    async def mock_get_upcoming_birthdays(self, user):
-        today = date.today()
-        end_date = today + timedelta(days=7)
+    repository = ContactRepository(async_session)
+    results = await repository.get_upcoming_birthdays(user)
 
-        query = select(Contact).where(
-            Contact.user_id == user.id,
-            func.strftime("%m-%d", Contact.birthday).between(
-                today.strftime("%m-%d"), end_date.strftime("%m-%d")
-            ),
+    assert len(results) == 1
+    assert results[0].first_name == "John"
+
+
+@pytest.mark.asyncio
+async def test_get_upcoming_birthdays_wraps_year(async_session, monkeypatch):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2026, 12, 29)
+
+    monkeypatch.setattr("src.repository.contacts.date", FixedDate)
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create_user(
+        UserCreate(
+            username="newyear",
+            email="newyear@example.com",
+            password="hashed_password",
+            role="user",
         )
-        result = await self.db.execute(query)
-        return result.scalars().all()
+    )
+    for first_name, birthday in [
+        ("January", date(1990, 1, 2)),
+        ("December", date(1985, 12, 30)),
+        ("Later", date(1990, 1, 20)),
+        ("Past", date(1990, 12, 1)),
+    ]:
+        async_session.add(
+            Contact(
+                first_name=first_name,
+                last_name="Wrap",
+                email=f"{first_name.lower()}@example.com",
+                phone="+123456789",
+                birthday=birthday,
+                user_id=user.id,
+                additional_info="",
+            )
+        )
+    await async_session.commit()
 
-    monkeypatch.setattr(
-        ContactRepository, "get_upcoming_birthdays", mock_get_upcoming_birthdays
+    repository = ContactRepository(async_session)
+    week = await repository.get_upcoming_birthdays(user)
+    month = await repository.get_upcoming_birthdays(user, days=30)
+
+    assert [c.first_name for c in week] == ["December", "January"]
+    assert [c.first_name for c in month] == ["December", "January", "Later"]
+
+
+@pytest.mark.asyncio
+async def test_search_contacts(async_session):
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create_user(
+        UserCreate(
+            username="searcher",
+            email="searcher@example.com",
+            password="hashed_password",
+            role="user",
+        )
+    )
+    other = await user_repo.create_user(
+        UserCreate(
+            username="other_searcher",
+            email="other_searcher@example.com",
+            password="hashed_password",
+            role="user",
+        )
+    )
+    async_session.add_all(
+        [
+            Contact(
+                first_name="Johnny",
+                last_name="Walker",
+                email="walker@example.com",
+                phone="+380501112233",
+                birthday=date(1990, 1, 1),
+                user_id=user.id,
+                additional_info="",
+            ),
+            Contact(
+                first_name="Anna",
+                last_name="Johnson",
+                email="anna@example.com",
+                phone="+380671234567",
+                birthday=date(1990, 1, 1),
+                user_id=user.id,
+                additional_info="",
+            ),
+            Contact(
+                first_name="John",
+                last_name="Foreign",
+                email="john@example.com",
+                phone="+380501112233",
+                birthday=date(1990, 1, 1),
+                user_id=other.id,
+                additional_info="",
+            ),
+        ]
     )
+    await async_session.commit()
+    repository = ContactRepository(async_session)
+
+    by_name = await repository.search_contacts("john", user, limit=10)
+    by_phone = await repository.search_contacts("111", user, limit=10)
+    by_terms = await repository.search_contacts("anna johnson", user, limit=10)
+    short = await repository.search_contacts("wa", user, limit=10)
+
+    assert {c.last_name for c in by_name} == {"Walker", "Johnson"}
+    assert [c.first_name for c in by_phone] == ["Johnny"]
+    assert [c.first_name for c in by_terms] == ["Anna"]
+    assert [c.first_name for c in short] == ["Johnny"]
 
+
+@pytest.mark.asyncio
+async def test_filters_match_wildcards_literally(async_session):
+    user = await UserRepository(async_session).create_user(
+        UserCreate(
+            username="filterer",
+            email="filterer@example.com",
+            password="hashed_password",
+            role="user",
+        )
+    )
+    async_session.add_all(
+        [
+            Contact(
+                first_name=first_name,
+                last_name="Filter",
+                email=f"{first_name.lower()}@example.com",
+                phone="+380501112233",
+                birthday=date(1990, 1, 1),
+                user_id=user.id,
+                additional_info="",
+            )
+            for first_name in ("Under_score", "UnderXscore")
+        ]
+    )
+    await async_session.commit()
     repository = ContactRepository(async_session)
-    results = await repository.get_upcoming_birthdays(user)
 
-    assert len(results) == 1
-    assert results[0].first_name == "John"
+    async def first_names(**filters) -> list[str]:
+        contacts = await repository.get_contacts(0, 10, filters, user)
+        return [c.first_name for c in contacts]
+
+    assert await first_names(first_name="under_") == ["Under_score"]
+    assert await first_names(first_name="%") == []
+    assert await first_names(email="\\") == []
+    assert await first_names(last_name="filter") == ["Under_score", "UnderXscore"]
+
+
+@pytest.mark.asyncio
+async def test_contact_writes_are_single_statements(async_session, query_counter):
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create_user(
+        UserCreate(
+            username="writer",
+            email="writer@example.com",
+            password="hashed_password",
+            role="user",
+        )
+    )
+    repository = ContactRepository(async_session)
+    contact = await repository.create_contact(
+        ContactBase(
+            first_name="Single",
+            last_name="Statement",
+            email="single@example.com",
+            phone="+123456789",
+            birthday=date(1990, 5, 17),
+            additional_info="",
+        ),
+        user,
+    )
+    query_counter.clear()
+
+    updated = await repository.update_contact(
+        contact.id,
+        ContactUpdate(
+            first_name="Single",
+            last_name="Statement",
+            email="single@example.com",
+            phone="+123456789",
+            birthday=date(1990, 12, 24),
+            additional_info="updated",
+        ),
+        user,
+    )
+    patched = await repository.update_phone(contact.id, "+987654321", user)
+    removed = await repository.remove_contact(contact.id, user)
+    missing = await repository.update_email(contact.id, "gone@example.com", user)
+
+    assert len(query_counter) == 4
+    assert updated.birthday_mmdd == 1224
+    assert patched.phone == "+987654321"
+    assert removed.id == contact.id
+    assert missing is None
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas import UserCreate
 from src.repository.users import UserRepository
@@ -29,3 +30,51 @@ async def test_get_user_by_email(async_session: AsyncSession):
     assert (
         fetched_user.username == created_user.username
     ), "Ім'я користувача не збігається"
+
+
+@pytest.mark.asyncio
+async def test_user_mutations_are_single_statements(
+    async_session: AsyncSession, query_counter
+):
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create_user(
+        UserCreate(
+            username="mutable",
+            email="mutable@example.com",
+            password="hashed_password",
+            role="user",
+        )
+    )
+    query_counter.clear()
+
+    confirmed = await user_repo.confirmed_email("mutable@example.com")
+    confirmed_again = await user_repo.confirmed_email("mutable@example.com")
+    with_avatar = await user_repo.update_avatar_url(user.id, "http://a.com/a.png")
+    with_password = await user_repo.update_password("mutable@example.com", "new_hash")
+
+    assert len(query_counter) == 4
+    assert confirmed.confirmed is True
+    assert confirmed_again is None
+    assert with_avatar.avatar == "http://a.com/a.png"
+    assert with_password.hashed_password == "new_hash"
+
+
+@pytest.mark.asyncio
+async def test_email_is_unique_ignoring_case(async_session: AsyncSession):
+    user_repo = UserRepository(async_session)
+    await user_repo.create_user(
+        UserCreate(
+            username="cased", email="Cased@example.com", password="x", role="user"
+        )
+    )
+
+    with pytest.raises(IntegrityError):
+        await user_repo.create_user(
+            UserCreate(
+                username="cased2", email="cased@EXAMPLE.com", password="x", role="user"
+            )
+        )
+    await async_session.rollback()
+
+    fetched = await user_repo.get_user_by_email("CASED@example.com")
+    assert fetched.username == "cased"
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.services.auth import Hash, PasswordHashingPool
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    hashed = await Hash().get_password_hash_async("12345678")
+
+    assert await Hash().verify_password_async("12345678", hashed)
+    assert not await Hash().verify_password_async("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_queue_depth():
+    pool = PasswordHashingPool(max_workers=1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def blocking():
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        return True
+
+    jobs = [asyncio.create_task(pool.run(blocking)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    stats = pool.stats()
+    release.set()
+    results = await asyncio.gather(*jobs)
+
+    assert stats["running"] == 1
+    assert stats["queued"] == 2
+    assert results == [True, True, True]
+    assert pool.stats()["completed"] == 3
+    assert pool.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_cancelled_jobs_leave_the_queue():
+    pool = PasswordHashingPool(max_workers=1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def blocking():
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        return True
+
+    running = asyncio.create_task(pool.run(blocking))
+    waiting = asyncio.create_task(pool.run(blocking))
+    await asyncio.sleep(0.05)
+    waiting.cancel()
+    await asyncio.sleep(0)
+    queued = pool.stats()["queued"]
+    release.set()
+
+    assert await running
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert queued == 0
+    assert pool.stats()["completed"] == 1
@@ -0,0 +1,78 @@
+import pytest
+
+from src.database.models import User, UserRole
+from src.repository.users import UserRepository
+from src.schemas import UserCreate
+from src.services.cache import UserCache, user_cache
+
+
+def make_user(user_id: int, username: str) -> User:
+    return User(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.com",
+        avatar="https://example.com/avatar.png",
+        confirmed=True,
+        role=UserRole.USER,
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_and_miss():
+    cache = UserCache(ttl=60, maxsize=10)
+
+    assert await cache.get("neo") is None
+    await cache.set(make_user(1, "neo"))
+    cached = await cache.get("neo")
+
+    assert cached is not None
+    assert cached.id == 1
+    assert cached.role == UserRole.USER
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_returns_new_instance_per_lookup():
+    cache = UserCache(ttl=60, maxsize=10)
+    await cache.set(make_user(1, "neo"))
+
+    assert await cache.get("neo") is not await cache.get("neo")
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    cache = UserCache(ttl=60, maxsize=2)
+    await cache.set(make_user(1, "neo"))
+    await cache.set(make_user(2, "trinity"))
+    await cache.get("neo")
+    await cache.set(make_user(3, "morpheus"))
+
+    assert await cache.get("trinity") is None
+    assert await cache.get("neo") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_entry_expires(monkeypatch):
+    cache = UserCache(ttl=60, maxsize=10)
+    await cache.set(make_user(1, "neo"))
+
+    monkeypatch.setattr("src.services.cache.time.monotonic", lambda: 10**9)
+
+    assert await cache.get("neo") is None
+
+
+@pytest.mark.asyncio
+async def test_repository_invalidates_cached_user(async_session):
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create_user(
+        UserCreate(
+            username="cached", email="cached@example.com", password="x", role="user"
+        )
+    )
+    await user_cache.set(user)
+
+    await user_repo.update_avatar_url(user.id, "https://example.com/new.png")
+
+    assert await user_cache.get("cached") is None
@@ -1,24 +1,51 @@
 from unittest.mock import AsyncMock, patch
 import pytest
-from src.services.email import send_email
+from src.services.email import PASSWORD_RESET, VERIFY_EMAIL, build_message, send_email
 from fastapi_mail.errors import ConnectionErrors
 
+PAYLOAD = {"username": "TestUser", "host": "http://localhost/"}
+
 
 @pytest.mark.asyncio
 async def test_send_email_success():
     # Мокаємо залежності
     with patch(
         "src.services.email.create_email_token", return_value="mocked_token"
-    ) as mock_token, patch("src.services.email.FastMail") as MockFastMail:
-        mock_send_message = AsyncMock()
-        MockFastMail.return_value.send_message = mock_send_message
+    ) as mock_token:
+        mailer = AsyncMock()
 
         # Викликаємо функцію
-        await send_email("test@example.com", "TestUser", "http://localhost")
+        await send_email(mailer, VERIFY_EMAIL, "test@example.com", PAYLOAD)
 
         # Перевіряємо виклики
         mock_token.assert_called_once_with({"sub": "test@example.com"})
-        mock_send_message.assert_awaited_once()
+        mailer.send_message.assert_awaited_once()
+        message = mailer.send_message.call_args.args[0]
+        assert message.template_body["token"] == "mocked_token"
+        assert mailer.send_message.call_args.kwargs == {
+            "template_name": "verify_email.html"
+        }
+
+
+@pytest.mark.asyncio
+async def test_build_password_reset_message():
+    with patch(
+        "src.services.email.create_access_token",
+        AsyncMock(return_value="reset_token"),
+    ) as mock_token:
+        message, template_name = await build_message(
+            PASSWORD_RESET, "test@example.com", PAYLOAD
+        )
+
+    mock_token.assert_awaited_once_with(data={"sub": "test@example.com"})
+    assert template_name == "reset_password.html"
+    assert message.template_body["token"] == "reset_token"
+
+
+@pytest.mark.asyncio
+async def test_build_message_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown email kind"):
+        await build_message("newsletter", "test@example.com", PAYLOAD)
 
 
 @pytest.mark.asyncio
@@ -27,23 +54,14 @@ async def test_send_email_token_generation_error():
         "src.services.email.create_email_token", side_effect=Exception("Token error")
     ):
         with pytest.raises(Exception, match="Token error"):
-            await send_email("test@example.com", "TestUser", "http://localhost")
+            await send_email(AsyncMock(), VERIFY_EMAIL, "test@example.com", PAYLOAD)
 
 
 @pytest.mark.asyncio
 async def test_send_email_connection_error():
-    with patch("src.services.email.FastMail") as MockFastMail, patch(
-        "builtins.print"
-    ) as mock_print:
-
-        mock_send_message = AsyncMock(
-            side_effect=ConnectionErrors("Simulated connection error")
-        )
-        MockFastMail.return_value.send_message = mock_send_message
-
-        await send_email("test@example.com", "TestUser", "http://localhost")
-
-        mock_print.assert_called_once()
-        printed_message = mock_print.call_args[0][0]
+    # Помилка з'єднання передається воркеру, який повторить спробу пізніше
+    mailer = AsyncMock()
+    mailer.send_message.side_effect = ConnectionErrors("Simulated connection error")
 
-        assert "Simulated connection error" in str(printed_message)
+    with pytest.raises(ConnectionErrors, match="Simulated connection error"):
+        await send_email(mailer, VERIFY_EMAIL, "test@example.com", PAYLOAD)
@@ -0,0 +1,42 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from src.services.etag import (
+    contact_etag,
+    contacts_list_etag,
+    etag_matches,
+    if_match_versions,
+)
+
+UPDATED_AT = datetime(2024, 5, 6, 7, 8, 9, 123456)
+
+
+def test_contact_etag_round_trip():
+    etag = contact_etag(SimpleNamespace(id=7, updated_at=UPDATED_AT))
+
+    assert etag == 'W/"7.20240506070809123456"'
+    assert if_match_versions(etag, 7) == [UPDATED_AT]
+    assert if_match_versions(etag, 8) == []
+    assert if_match_versions('"7.garbage"', 7) == []
+    assert if_match_versions("*", 7) is None
+    assert if_match_versions(None, 7) is None
+
+
+def test_etag_matches():
+    etag = 'W/"abc"'
+
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"xyz", "abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"xyz"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_contacts_list_etag_changes():
+    base = contacts_list_etag(1, 3, UPDATED_AT, [("limit", "10")])
+
+    assert base == contacts_list_etag(1, 3, UPDATED_AT, [("limit", "10")])
+    assert base != contacts_list_etag(1, 2, UPDATED_AT, [("limit", "10")])
+    assert base != contacts_list_etag(1, 3, datetime.now(), [("limit", "10")])
+    assert base != contacts_list_etag(1, 3, UPDATED_AT, [("limit", "20")])
+    assert base != contacts_list_etag(2, 3, UPDATED_AT, [("limit", "10")])
@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi_mail import FastMail
+from sqlalchemy import delete, select
+
+from src.database.models import EmailOutbox, OutboxStatus
+from src.repository.outbox import OutboxRepository, utcnow
+from src.services.email import PASSWORD_RESET, VERIFY_EMAIL, send_email
+from src.services.outbox import OutboxService, OutboxWorker
+from tests.conftest import TestingSessionLocal, html_body, mail_config
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def empty_outbox():
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(EmailOutbox))
+        await session.commit()
+
+
+async def queue(*recipients: str) -> None:
+    async with TestingSessionLocal() as session:
+        outbox_service = OutboxService(session)
+        for recipient in recipients:
+            outbox_service.queue_verification_email(
+                recipient, "user", "http://testserver/"
+            )
+        await outbox_service.commit()
+
+
+async def outbox_rows() -> list[EmailOutbox]:
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_worker_sends_batch(smtp_server):
+    controller, handler = smtp_server
+    mailer = FastMail(mail_config(controller.port))
+
+    async def send(message):
+        await send_email(mailer, message.kind, message.recipient, message.payload)
+
+    await queue("a@example.com", "b@example.com", "c@example.com")
+    worker = OutboxWorker(TestingSessionLocal, send, batch_size=2, concurrency=2)
+
+    assert await worker.run_once() == (2, 0)
+    assert await worker.run_once() == (1, 0)
+    assert await worker.run_once() == (0, 0)
+
+    assert sorted(e.rcpt_tos[0] for e in handler.messages) == [
+        "a@example.com",
+        "b@example.com",
+        "c@example.com",
+    ]
+    assert "api/auth/confirmed_email/" in html_body(handler.messages[0])
+    rows = await outbox_rows()
+    assert {row.status for row in rows} == {OutboxStatus.SENT}
+    assert all(row.attempts == 1 and row.sent_at for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_password_reset_email(smtp_server):
+    controller, handler = smtp_server
+
+    await send_email(
+        FastMail(mail_config(controller.port)),
+        PASSWORD_RESET,
+        "reset@example.com",
+        {"username": "reset", "host": "http://testserver/"},
+    )
+
+    assert "api/auth/reset-password-confirm?token=" in html_body(handler.messages[0])
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff():
+    async def send(message):
+        raise ConnectionError("SMTP is down")
+
+    await queue("retry@example.com")
+    worker = OutboxWorker(TestingSessionLocal, send, max_attempts=2, backoff_seconds=60)
+
+    assert await worker.run_once() == (0, 1)
+    [row] = await outbox_rows()
+    assert row.status == OutboxStatus.PENDING
+    assert row.attempts == 1
+    assert "SMTP is down" in row.last_error
+    assert row.next_attempt_at > utcnow() + timedelta(seconds=50)
+
+    # Not due yet.
+    assert await worker.run_once() == (0, 0)
+
+    async with TestingSessionLocal() as session:
+        row = await session.get(EmailOutbox, row.id)
+        row.next_attempt_at = utcnow()
+        await session.commit()
+    assert await worker.run_once() == (0, 1)
+    [row] = await outbox_rows()
+    assert row.status == OutboxStatus.FAILED
+    assert row.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_claimed_rows_are_leased():
+    await queue("lease@example.com")
+
+    async with TestingSessionLocal() as session:
+        repository = OutboxRepository(session)
+        [claimed] = await repository.claim_batch(10, lease_seconds=300)
+        assert claimed.kind == VERIFY_EMAIL
+        assert await repository.claim_batch(10, lease_seconds=300) == []
+
+        claimed.next_attempt_at = utcnow() - timedelta(seconds=1)
+        await session.commit()
+        [reclaimed] = await repository.claim_batch(10, lease_seconds=300)
+        assert reclaimed.id == claimed.id
+        assert reclaimed.attempts == 2
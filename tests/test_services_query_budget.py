@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from src.conf.config import settings
+from src.database.instrumentation import RequestQueries
+from src.services.query_budget import check_budget, query_budget, violations
+
+
+def make_route(endpoint):
+    return SimpleNamespace(path="/api/test", endpoint=endpoint)
+
+
+def make_queries(*statements):
+    queries = RequestQueries()
+    for statement in statements:
+        queries.record(statement, 0.001)
+    return queries
+
+
+def test_server_timing_header(client):
+    response = client.get("/api/healthchecker")
+
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["Server-Timing"].endswith('desc="1 queries"')
+
+
+def test_declared_budget():
+    @query_budget(2)
+    async def endpoint():
+        pass
+
+    check_budget("GET", make_route(endpoint), make_queries("SELECT 1", "SELECT 2"))
+    assert not violations
+
+    check_budget(
+        "GET", make_route(endpoint), make_queries("SELECT 1", "SELECT 2", "SELECT 3")
+    )
+    assert [(v.kind, v.count, v.limit) for v in violations] == [("budget", 3, 2)]
+    violations.clear()
+
+
+def test_default_budget():
+    async def endpoint():
+        pass
+
+    statements = [f"SELECT {i}" for i in range(settings.QUERY_BUDGET_DEFAULT + 1)]
+    check_budget("GET", make_route(endpoint), make_queries(*statements))
+    assert [v.kind for v in violations] == ["budget"]
+    violations.clear()
+
+
+def test_repeated_statement_is_reported():
+    @query_budget(None)
+    async def endpoint():
+        pass
+
+    statement = "SELECT * FROM contacts WHERE id = ?"
+    queries = make_queries(*[statement] * (settings.QUERY_REPEAT_THRESHOLD + 1))
+    check_budget("GET", make_route(endpoint), queries)
+    assert [(v.kind, v.statement) for v in violations] == [("n+1", statement)]
+    violations.clear()
+
+
+def test_repeat_check_can_be_disabled():
+    @query_budget(None, check_repeats=False)
+    async def endpoint():
+        pass
+
+    queries = make_queries(*["INSERT"] * (settings.QUERY_REPEAT_THRESHOLD + 1))
+    check_budget("POST", make_route(endpoint), queries)
+    assert not violations
@@ -0,0 +1,97 @@
+import fakeredis
+import pytest
+from fastapi import Request
+from jose import jwt
+
+from src.conf.config import settings
+from src.services.rate_limit import SlidingWindowLimiter, client_identity, parse_rate
+
+
+def redis_limiter(server: fakeredis.FakeServer) -> SlidingWindowLimiter:
+    limiter = SlidingWindowLimiter()
+    limiter._redis = fakeredis.FakeAsyncRedis(server=server)
+    return limiter
+
+
+def request_with(headers: dict) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+def test_parse_rate():
+    assert parse_rate("5/minute") == (5, 60)
+    assert parse_rate("100/hours") == (100, 3600)
+    with pytest.raises(ValueError):
+        parse_rate("5 per minute")
+
+
+@pytest.mark.asyncio
+async def test_memory_sliding_window(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("src.services.rate_limit.time.time", lambda: now)
+    limiter = SlidingWindowLimiter()
+
+    results = [await limiter.hit("login:ip:1", 3, 60) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after == 60
+
+    now += 30
+    assert not (await limiter.hit("login:ip:1", 3, 60)).allowed
+    assert (await limiter.hit("login:ip:2", 3, 60)).allowed
+    now += 30
+    assert (await limiter.hit("login:ip:1", 3, 60)).allowed
+    assert limiter.stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_limit_is_shared_between_workers(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("src.services.rate_limit.time.time", lambda: now)
+    server = fakeredis.FakeServer()
+    workers = [redis_limiter(server), redis_limiter(server)]
+
+    results = [await workers[i % 2].hit("login:ip:1", 3, 60) for i in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[-1].retry_after == pytest.approx(60)
+
+    # Rejected requests are not counted, so the window frees up on time.
+    now += 30
+    assert not (await workers[0].hit("login:ip:1", 3, 60)).allowed
+    now += 30.5
+    assert (await workers[1].hit("login:ip:1", 3, 60)).allowed
+    redis = workers[0]._redis
+    assert await redis.zcard("ratelimit:login:ip:1") == 1
+    assert 0 < await redis.ttl("ratelimit:login:ip:1") <= 60
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_memory():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    limiter = redis_limiter(server)
+
+    results = [await limiter.hit("login:ip:1", 1, 60) for _ in range(2)]
+
+    assert [r.allowed for r in results] == [True, False]
+    assert limiter.stats()["redis_errors"] == 2
+
+
+def test_client_identity():
+    token = jwt.encode(
+        {"sub": "neo"}, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
+    )
+    forged = jwt.encode({"sub": "neo"}, "other", algorithm=settings.JWT_ALGORITHM)
+
+    assert client_identity(request_with({"Authorization": f"Bearer {token}"})) == (
+        "user:neo"
+    )
+    assert client_identity(request_with({"Authorization": f"Bearer {forged}"})) == (
+        "ip:10.0.0.1"
+    )
+    assert client_identity(request_with({})) == "ip:10.0.0.1"
@@ -0,0 +1,159 @@
+import asyncio
+import email
+
+import pytest
+from aiosmtpd.controller import Controller
+from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
+from fastapi_mail.errors import ConnectionErrors
+
+from src.services.smtp_pool import PooledFastMail, build_message
+from tests.conftest import RecordingHandler, free_port, html_body, mail_config
+
+TEMPLATE = "verify_email.html"
+
+
+def message(recipient: str) -> MessageSchema:
+    return MessageSchema(
+        subject="Confirm your email",
+        recipients=[recipient],
+        template_body={"host": "http://testserver/", "username": "u", "token": "t"},
+        subtype=MessageType.html,
+    )
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(smtp_server):
+    controller, handler = smtp_server
+    mailer = PooledFastMail(mail_config(controller.port), size=2)
+
+    await asyncio.gather(
+        *(
+            mailer.send_message(message(f"user{i}@example.com"), TEMPLATE)
+            for i in range(10)
+        )
+    )
+    await mailer.close()
+
+    assert len(handler.messages) == 10
+    assert "confirmed_email/t" in html_body(handler.messages[0])
+    stats = mailer.pool.stats()
+    assert stats["connects"] <= 2
+    assert stats["reuses"] == 10 - stats["connects"]
+    assert stats["idle"] == 0
+
+
+@pytest.mark.asyncio
+async def test_message_headers_and_plain_body(smtp_server):
+    controller, handler = smtp_server
+    config = mail_config(controller.port).model_copy(
+        update={"MAIL_FROM_NAME": "Contacts"}
+    )
+    mailer = PooledFastMail(config)
+
+    await mailer.send_message(
+        MessageSchema(
+            subject="Hello",
+            recipients=["user@example.com"],
+            body="Plain text",
+            subtype=MessageType.plain,
+        )
+    )
+    await mailer.close()
+
+    sent = email.message_from_bytes(handler.messages[0].content)
+    assert sent["From"] == "Contacts <test@example.com>"
+    assert sent["To"] == "user@example.com"
+    assert sent["Subject"] == "Hello"
+    assert list(sent.walk())[-1].get_payload(decode=True).rstrip() == b"Plain text"
+
+
+@pytest.mark.asyncio
+async def test_build_message(tmp_path):
+    attachment = tmp_path / "contacts.csv"
+    attachment.write_text("a,b\n")
+
+    msg = await build_message(
+        MessageSchema(
+            subject="Export",
+            recipients=["user@example.com", "other@example.com"],
+            cc=["cc@example.com"],
+            bcc=["bcc@example.com"],
+            reply_to=["reply@example.com"],
+            body="<p>Attached</p>",
+            alternative_body="Attached",
+            subtype=MessageType.html,
+            multipart_subtype=MultipartSubtypeEnum.alternative,
+            headers={"X-Export": "1"},
+            attachments=[
+                {
+                    "file": str(attachment),
+                    "mime_type": "text",
+                    "mime_subtype": "csv",
+                    "headers": {"Content-ID": "<export>"},
+                }
+            ],
+        ),
+        "Contacts <test@example.com>",
+    )
+
+    assert msg["From"] == "Contacts <test@example.com>"
+    assert msg["To"] == "user@example.com, other@example.com"
+    assert msg["Cc"] == "cc@example.com"
+    assert msg["Bcc"] == "bcc@example.com"
+    assert msg["Reply-To"] == "reply@example.com"
+    assert msg["X-Export"] == "1"
+    assert msg["Message-ID"] and msg["Date"]
+    assert msg.get_body(("html",)).get_content() == "<p>Attached</p>\n"
+    assert msg.get_body(("plain",)).get_content() == "Attached\n"
+    [part] = msg.iter_attachments()
+    assert part.get_content_type() == "text/csv"
+    assert part.get_filename() == "contacts.csv"
+    assert part["Content-ID"] == "<export>"
+    assert part.get_content() == "a,b\n"
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_expire(smtp_server):
+    controller, handler = smtp_server
+    mailer = PooledFastMail(mail_config(controller.port), idle_timeout=0)
+
+    await mailer.send_message(message("a@example.com"), TEMPLATE)
+    await mailer.send_message(message("b@example.com"), TEMPLATE)
+    await mailer.close()
+
+    assert len(handler.messages) == 2
+    assert mailer.pool.stats()["connects"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_server_restart():
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    mailer = PooledFastMail(mail_config(port), health_check_seconds=0)
+    await mailer.send_message(message("a@example.com"), TEMPLATE)
+    controller.stop()
+
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        await mailer.send_message(message("b@example.com"), TEMPLATE)
+        await mailer.close()
+    finally:
+        controller.stop()
+
+    assert [e.rcpt_tos for e in handler.messages] == [
+        ["a@example.com"],
+        ["b@example.com"],
+    ]
+    assert mailer.pool.stats()["connects"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server():
+    mailer = PooledFastMail(mail_config(free_port()), size=1)
+
+    with pytest.raises(ConnectionErrors):
+        await mailer.send_message(message("a@example.com"), TEMPLATE)
+    assert mailer.pool.stats()["connects"] == 0
@@ -0,0 +1,133 @@
+import io
+
+import pytest
+import requests
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from src.services.storage import (
+    CloudinaryStorage,
+    ImmutableStaticFiles,
+    LocalStorage,
+    receive_upload,
+)
+
+BOUNDARY = "boundary"
+
+
+def multipart_body(content: bytes) -> bytes:
+    return (
+        (
+            f"--{BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="a.jpg"\r\n'
+            "Content-Type: image/jpeg\r\n\r\n"
+        ).encode()
+        + content
+        + f"\r\n--{BOUNDARY}--\r\n".encode()
+    )
+
+
+def chunked_request(body: bytes, chunk_size: int = 1024) -> tuple[Request, list]:
+    """
+    Build a request whose body arrives in chunks without a Content-Length.
+    """
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    received = []
+
+    async def receive():
+        chunk = chunks.pop(0)
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "PATCH",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())
+        ],
+    }
+    return Request(scope, receive), received
+
+
+@pytest.mark.asyncio
+async def test_receive_upload():
+    request, _ = chunked_request(multipart_body(b"x" * 5000))
+
+    upload = await receive_upload(request, "file", max_bytes=5000)
+
+    assert upload.filename == "a.jpg"
+    assert upload.content_type == "image/jpeg"
+    assert await upload.read() == b"x" * 5000
+    await upload.close()
+
+
+@pytest.mark.asyncio
+async def test_receive_upload_over_limit():
+    request, _ = chunked_request(multipart_body(b"x" * 5001))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await receive_upload(request, "file", max_bytes=5000)
+    assert exc_info.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_receive_upload_stops_reading_oversized_body(monkeypatch):
+    monkeypatch.setattr("src.services.storage.MULTIPART_OVERHEAD", 0)
+    body = multipart_body(b"x" * 100_000)
+    request, received = chunked_request(body)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await receive_upload(request, "file", max_bytes=10_000)
+    assert exc_info.value.status_code == 413
+    assert sum(map(len, received)) < 12_000
+
+
+@pytest.mark.asyncio
+async def test_local_storage(tmp_path):
+    storage = LocalStorage(tmp_path, "/media")
+
+    url = await storage.save(io.BytesIO(b"image"), "avatars/alice", "image/png")
+
+    assert url == "/media/avatars/alice"
+    assert await storage.lookup("avatars/alice") == url
+    assert await storage.lookup("avatars/bob") is None
+    assert (tmp_path / "avatars" / "alice").read_bytes() == b"image"
+    assert not list((tmp_path / "avatars").glob(".*"))
+
+
+def test_local_storage_rejects_keys_outside_root(tmp_path):
+    storage = LocalStorage(tmp_path / "media", "/media/")
+
+    with pytest.raises(ValueError):
+        storage.path("../secret")
+
+
+def test_immutable_static_files(tmp_path):
+    (tmp_path / "a.webp").write_bytes(b"image")
+    app = FastAPI()
+    app.mount("/media", ImmutableStaticFiles(directory=tmp_path))
+
+    response = TestClient(app).get("/media/a.webp")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+
+@pytest.mark.asyncio
+async def test_cloudinary_lookup_uses_delivery_url(monkeypatch):
+    storage = CloudinaryStorage("demo", "key", "secret")
+    requested = []
+
+    def head(url, timeout):
+        requested.append(url)
+        if "offline" in url:
+            raise requests.ConnectionError("offline")
+        return type("Response", (), {"status_code": 404 if "bob" in url else 200})
+
+    monkeypatch.setattr("src.services.storage.requests.head", head)
+
+    url = "https://res.cloudinary.com/demo/raw/upload/v1/avatars/alice"
+    assert await storage.lookup("avatars/alice") == url
+    assert await storage.lookup("avatars/bob") is None
+    assert await storage.lookup("avatars/offline") is None
+    assert requested[0] == url
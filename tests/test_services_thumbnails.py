@@ -0,0 +1,55 @@
+import io
+
+import pytest
+from PIL import Image
+
+from src.services.thumbnails import (
+    ThumbnailPool,
+    identify_image,
+    render_thumbnails,
+)
+
+
+def image_bytes(size=(400, 300), fmt="PNG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "purple").save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_identify_image():
+    fileobj = io.BytesIO(image_bytes(fmt="JPEG"))
+
+    assert identify_image(fileobj) == "JPEG"
+    assert fileobj.tell() == 0
+
+
+def test_identify_image_rejects_other_files():
+    with pytest.raises(ValueError):
+        identify_image(io.BytesIO(b"not an image"))
+
+
+def test_render_thumbnails():
+    thumbnails = render_thumbnails(image_bytes(), [64, 250], ["webp", "jpeg"])
+
+    assert set(thumbnails) == {(64, "webp"), (64, "jpeg"), (250, "webp"), (250, "jpeg")}
+    for (size, fmt), content in thumbnails.items():
+        with Image.open(io.BytesIO(content)) as thumbnail:
+            assert thumbnail.size == (size, size)
+            assert thumbnail.format == fmt.upper()
+
+
+@pytest.mark.asyncio
+async def test_pool_renders_in_worker_process():
+    pool = ThumbnailPool(max_workers=1)
+    try:
+        thumbnails = await pool.render(image_bytes(), [32], ["jpeg"])
+    finally:
+        pool.shutdown()
+
+    assert list(thumbnails) == [(32, "jpeg")]
+    assert pool.stats() == {
+        "max_workers": 1,
+        "started": False,
+        "running": 0,
+        "completed": 1,
+    }